@@ -9,9 +9,11 @@ from alembic import context
 # 1. Import your project's config and models
 # ---------------------------------------------------------
 from app.db.base import Base
-from app.db.session import SQLALCHEMY_DATABASE_URL
+from app.db.session import database_url
 from app.models.project import Project
 from app.models.task import Task
+from app.models.idempotency_key import IdempotencyKey
+from app.models.change_log import ChangeLogEntry
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -21,7 +23,7 @@ config = context.config
 # 2. Overwrite the sqlalchemy.url in the config object
 #    This ensures Alembic uses the URL from your .env file
 # ---------------------------------------------------------
-config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
+config.set_main_option("sqlalchemy.url", database_url())
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -34,6 +36,14 @@ if config.config_file_name is not None:
 # ---------------------------------------------------------
 target_metadata = Base.metadata
 
+# ستون و ایندکس جست‌وجوی متنی فقط در مایگریشن تعریف شده‌اند (نوع tsvector مخصوص PostgreSQL است)
+SEARCH_OBJECTS = {"search_vector", "ix_tasks_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """autogenerate ستون/ایندکس جست‌وجو را که در مدل نیستند حذف پیشنهاد نکند."""
+    return name not in SEARCH_OBJECTS
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -56,6 +66,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -79,7 +90,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,37 @@
+"""Add updated_at to projects and tasks for ETags
+
+Revision ID: 3374dff8a5a9
+Revises: f4a8cc2f0b36
+Create Date: 2026-10-17 11:26:05.730412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3374dff8a5a9'
+down_revision: Union[str, Sequence[str], None] = 'f4a8cc2f0b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for table in ('projects', 'tasks'):
+        columns = {column['name'] for column in inspector.get_columns(table)}
+        # مهاجرت اولیه ستون created_at مدل‌ها را نساخته بود
+        if 'created_at' not in columns:
+            op.add_column(table, sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False))
+        op.create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('tasks', 'projects'):
+        op.drop_index(op.f(f'ix_{table}_updated_at'), table_name=table)
+        op.drop_column(table, 'updated_at')
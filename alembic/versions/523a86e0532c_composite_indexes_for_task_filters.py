@@ -0,0 +1,32 @@
+"""Composite indexes for task list filters
+
+Revision ID: 523a86e0532c
+Revises: 3374dff8a5a9
+Create Date: 2026-10-17 12:40:19.553207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '523a86e0532c'
+down_revision: Union[str, Sequence[str], None] = '3374dff8a5a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_project_id_status', 'tasks', ['project_id', 'status'], unique=False)
+    op.create_index('ix_tasks_status_deadline', 'tasks', ['status', 'deadline'], unique=False)
+    op.create_index('ix_tasks_created_at', 'tasks', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_status_deadline', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status', table_name='tasks')
@@ -0,0 +1,33 @@
+"""Add task_count counter to projects
+
+Revision ID: 8ac55bcb09f8
+Revises: e80e30f6ca4c
+Create Date: 2026-10-17 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8ac55bcb09f8'
+down_revision: Union[str, Sequence[str], None] = 'e80e30f6ca4c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('task_count', sa.Integer(), server_default='0', nullable=False))
+    # مقداردهی اولیه شمارنده از روی تسک‌های موجود
+    op.execute(
+        "UPDATE projects SET task_count = "
+        "(SELECT count(*) FROM tasks WHERE tasks.project_id = projects.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('projects', 'task_count')
@@ -0,0 +1,39 @@
+"""Change log for the incremental change feed
+
+Revision ID: d8e2a4c6b0f3
+Revises: c3d5e7f9a1b2
+Create Date: 2026-10-17 21:02:51.730264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e2a4c6b0f3'
+down_revision: Union[str, Sequence[str], None] = 'c3d5e7f9a1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_log',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('entity', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=16), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_change_log_entity', 'change_log', ['entity', 'entity_id', 'id'], unique=False)
+    op.create_index(op.f('ix_change_log_changed_at'), 'change_log', ['changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_change_log_changed_at'), table_name='change_log')
+    op.drop_index('ix_change_log_entity', table_name='change_log')
+    op.drop_table('change_log')
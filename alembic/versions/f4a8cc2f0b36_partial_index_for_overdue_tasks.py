@@ -0,0 +1,32 @@
+"""Partial index on tasks.deadline for open tasks
+
+Revision ID: f4a8cc2f0b36
+Revises: 8ac55bcb09f8
+Create Date: 2026-10-17 10:03:47.118520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8cc2f0b36'
+down_revision: Union[str, Sequence[str], None] = '8ac55bcb09f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_tasks_overdue_candidates', 'tasks', ['deadline'], unique=False,
+        postgresql_where=sa.text("status <> 'DONE'"),
+        sqlite_where=sa.text("status <> 'DONE'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_overdue_candidates', table_name='tasks')
@@ -0,0 +1,35 @@
+"""
+کارهای دیتابیسی بیرون از چرخه درخواست (میان‌افزارها و وظایف پس‌زمینه API).
+
+run_db تابع سرویس را روی یک سشن کوتاه و جدا از سشن درخواست (مطابق DB_MODE) اجرا می‌کند
+و run_periodically یک کار نگهداری (مثل حذف کلیدهای منقضی) را در فاصله‌های ثابت تکرار می‌کند.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Callable
+
+from app.db.runner import get_runner
+
+logger = logging.getLogger(__name__)
+
+_runner = asynccontextmanager(get_runner)
+
+
+async def run_db(fn: Callable, *args):
+    """fn(db, *args) روی یک سشن جدید."""
+    async with _runner() as runner:
+        return await runner.run(fn, *args)
+
+
+async def run_periodically(interval_seconds: int, fn: Callable[..., int], description: str) -> None:
+    """هر interval_seconds تابع fn(db) را اجرا می‌کند؛ خطا فقط لاگ می‌شود و حلقه ادامه می‌یابد."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            count = await run_db(fn)
+        except Exception:
+            logger.exception("Background job failed: %s", description)
+            continue
+        if count:
+            logger.info("%s: %d row(s)", description, count)
@@ -0,0 +1,21 @@
+from fastapi import Response, status
+
+from app.api.controller_schemas.responses.bulk_response_schema import BulkCreateResponse, BulkItemResult
+
+
+def bulk_response(response: Response, results: list) -> BulkCreateResponse:
+    """
+    نتایج عملیات گروهی را به پاسخ API تبدیل و کد وضعیت را تنظیم می‌کند:
+    201 همه ساخته شدند، 207 موفقیت نسبی، 422 هیچ آیتمی ساخته نشد.
+    """
+    created = sum(1 for r in results if r.id is not None)
+    failed = len(results) - created
+    if failed and created:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    elif failed:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return BulkCreateResponse(
+        created=created,
+        failed=failed,
+        results=[BulkItemResult.model_validate(r) for r in results],
+    )
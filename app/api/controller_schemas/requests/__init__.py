@@ -1,2 +1,2 @@
-from .project_request_schema import ProjectCreateRequest, ProjectUpdateRequest
-from .task_request_schema import TaskCreateRequest, TaskUpdateRequest
\ No newline at end of file
+from .project_request_schema import ProjectCreateRequest, ProjectUpdateRequest, ProjectBulkCreateRequest
+from .task_request_schema import TaskCreateRequest, TaskUpdateRequest, TaskBulkCreateRequest
\ No newline at end of file
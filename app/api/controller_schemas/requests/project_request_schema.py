@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 
 class ProjectCreateRequest(BaseModel):
     name: str = Field(..., min_length=3, max_length=50, description="Name of the project")
@@ -15,4 +15,8 @@ class ProjectCreateRequest(BaseModel):
 
 class ProjectUpdateRequest(BaseModel):
     name: Optional[str] = Field(None, min_length=3, max_length=50)
-    description: Optional[str] = Field(None, max_length=200)
\ No newline at end of file
+    description: Optional[str] = Field(None, max_length=200)
+
+class ProjectBulkCreateRequest(BaseModel):
+    items: List[ProjectCreateRequest] = Field(..., min_length=1, max_length=1000)
+    atomic: bool = Field(True, description="If true, nothing is created unless every item is valid")
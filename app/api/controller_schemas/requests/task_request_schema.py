@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class TaskCreateRequest(BaseModel):
@@ -22,4 +22,8 @@ class TaskUpdateRequest(BaseModel):
     title: Optional[str] = Field(None, min_length=3, max_length=100)
     description: Optional[str] = None
     due_date: Optional[datetime] = None
-    status: Optional[str] = Field(None, pattern="^(Pending|Doing|Done)$") # چک کردن وضعیت مجاز
\ No newline at end of file
+    status: Optional[str] = Field(None, pattern="^(Pending|Doing|Done)$") # چک کردن وضعیت مجاز
+
+class TaskBulkCreateRequest(BaseModel):
+    items: List[TaskCreateRequest] = Field(..., min_length=1, max_length=1000)
+    atomic: bool = Field(True, description="If true, nothing is created unless every item is valid")
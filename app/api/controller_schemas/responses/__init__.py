@@ -1,2 +1,5 @@
-from .project_response_schema import ProjectResponse
-from .task_response_schema import TaskResponse
\ No newline at end of file
+from .project_response_schema import ProjectResponse, ProjectWithTasksResponse
+from .task_response_schema import TaskResponse
+from .bulk_response_schema import BulkCreateResponse, BulkItemResult
+from .transfer_response_schema import ImportResponse
+from .project_stats_response_schema import ProjectStatsResponse, ProjectStatsBatchResponse
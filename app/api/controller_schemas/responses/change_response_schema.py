@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Literal, Optional, Union
+from .project_response_schema import ProjectResponse
+from .task_response_schema import TaskResponse
+
+class ChangeResponse(BaseModel):
+    entity: Literal["project", "task"]
+    id: int
+    op: Literal["created", "updated", "deleted"]
+    seq: int
+    changed_at: datetime
+    # وضعیت فعلی موجودیت؛ برای tombstone (op=deleted) خالی است
+    data: Optional[Union[TaskResponse, ProjectResponse]] = None
+
+class ChangeFeedResponse(BaseModel):
+    changes: List[ChangeResponse]
+    cursor: str
+    has_more: bool
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from .task_response_schema import TaskResponse
 
 class ProjectResponse(BaseModel):
     id: int
@@ -9,4 +10,7 @@ class ProjectResponse(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ProjectWithTasksResponse(ProjectResponse):
+    tasks: List[TaskResponse] = []
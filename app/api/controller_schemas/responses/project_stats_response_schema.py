@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Dict, List, Optional
+
+class ProjectStatsResponse(BaseModel):
+    project_id: int
+    total: int
+    by_status: Dict[str, int]
+    overdue: int
+    next_deadline: Optional[date] = None
+
+class ProjectStatsBatchResponse(BaseModel):
+    items: List[ProjectStatsResponse]
+    not_found: List[int] = []
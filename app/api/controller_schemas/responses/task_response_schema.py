@@ -12,4 +12,7 @@ class TaskResponse(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TaskSearchResponse(TaskResponse):
+    rank: float
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List
+
+class ImportResponse(BaseModel):
+    rows: int
+    created: int
+    skipped: int = 0
+    failed: int
+    batches: int
+    errors: List[str] = []
+
+    class Config:
+        from_attributes = True
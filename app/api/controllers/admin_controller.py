@@ -0,0 +1,46 @@
+from fastapi import APIRouter, status
+from app.cache import entity_cache
+from app import config
+from app.db.session import get_engine
+from app.db.pool import pool_status
+from app.events import broadcaster
+
+router = APIRouter()
+
+@router.get("/cache")
+async def get_cache_stats():
+    """
+    Cache statistics: backend, size, hit/miss counters and hit ratio.
+    """
+    return entity_cache.stats()
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_cache():
+    """
+    Drop every cached entry and reset the counters.
+    """
+    entity_cache.clear()
+    entity_cache.reset_stats()
+    return None
+
+
+@router.get("/pool")
+async def get_pool_stats():
+    """
+    Connection pool status: size, checked-out and overflow connections, checkout wait histogram and timeouts.
+    In `DB_MODE=async` the asyncpg pool is reported as well.
+    """
+    stats = {"sync": pool_status(get_engine())}
+    if config.DB_MODE == "async":
+        from app.db.async_session import async_engine
+
+        stats["async"] = pool_status(async_engine.sync_engine)
+    return stats
+
+
+@router.get("/events")
+async def get_event_stats():
+    """
+    Live event subscribers in this worker, events published and how many times a slow subscriber was sent `resync`.
+    """
+    return broadcaster.stats()
@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+from app import config
+from app.db.base import utcnow
+from app.db.runner import SessionRunner, get_runner
+from app.models.change_log import ChangeLogEntry
+from app.services import change_feed_service
+from app.api.controller_schemas.responses.change_response_schema import ChangeFeedResponse
+from app.api.controller_schemas.responses.project_response_schema import ProjectResponse
+from app.api.controller_schemas.responses.task_response_schema import TaskResponse
+from app.api.pagination import decode_change_cursor, encode_change_cursor
+from app.api.serialization import FastJSONResponse, rows_to_dicts
+
+router = APIRouter()
+
+DATA_MODELS = {ChangeLogEntry.PROJECT: ProjectResponse, ChangeLogEntry.TASK: TaskResponse}
+
+@router.get("/", response_model=ChangeFeedResponse)
+async def get_changes(
+    since: Optional[str] = Query(None, description="`cursor` from the previous response; omit to get the current head"),
+    limit: int = Query(500, ge=1, le=config.CHANGE_FEED_MAX_LIMIT),
+    db: SessionRunner = Depends(get_runner),
+):
+    """
+    Projects and tasks created, updated or deleted since a cursor, oldest first.
+    - Without `since`, only the current head `cursor` is returned: save it, load the full lists once, then poll with it.
+    - Each entity appears once per page with its current `data`; deletes are tombstones with `data: null`.
+    - Keep calling with the returned `cursor` while `has_more` is true.
+
+    Cursors older than the log retention get **410 Gone**; the client must reload the full lists and start from a new head.
+    """
+    seen_at = utcnow()
+    if since is None:
+        head = await db.run(change_feed_service.get_head)
+        return FastJSONResponse(content={"changes": [], "cursor": encode_change_cursor(head, seen_at), "has_more": False})
+
+    after_id, cursor_at = decode_change_cursor(since)
+    if cursor_at < change_feed_service.retention_cutoff(seen_at):
+        raise HTTPException(status_code=status.HTTP_410_GONE,
+                            detail="Cursor is older than the change log retention; reload the full lists.")
+
+    changes, last_id, has_more = await db.run(change_feed_service.get_changes, after_id, limit)
+    if has_more:
+        # کلاینت فقط تا آخرین تغییر این صفحه جلو آمده است
+        seen_at = changes[-1]["changed_at"]
+    content = [
+        {
+            "entity": change["entity"],
+            "id": change["id"],
+            "op": change["op"],
+            "seq": change["seq"],
+            "changed_at": change["changed_at"],
+            "data": rows_to_dicts([change["row"]], DATA_MODELS[change["entity"]])[0] if change["row"] else None,
+        }
+        for change in changes
+    ]
+    return FastJSONResponse(content={"changes": content, "cursor": encode_change_cursor(last_id, seen_at),
+                                     "has_more": has_more})
@@ -0,0 +1,60 @@
+import json
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app import config
+from app.events import RESYNC_EVENT, Subscription, broadcaster
+
+router = APIRouter()
+
+def _subscribe(project_id: Optional[int]) -> Subscription | None:
+    if not config.EVENTS_ENABLED or broadcaster.subscribers >= config.EVENTS_MAX_SUBSCRIBERS:
+        return None
+    return broadcaster.subscribe(project_id, config.EVENTS_QUEUE_SIZE)
+
+def _sse(event: dict) -> str:
+    name = "resync" if event is RESYNC_EVENT else "change"
+    return f"event: {name}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+@router.get("/")
+async def stream_events(project_id: Optional[int] = Query(None, description="Only events for this project and its tasks")):
+    """
+    Server-Sent Events stream of project and task changes (`event: change`).
+    Each event carries `entity`, `op` (created/updated/deleted), `project_id` and the changed `ids`.
+    - `event: resync` means this client fell behind and events were dropped; reload state (e.g. from `GET /api/changes`).
+    - A `: ping` comment is sent every `EVENTS_HEARTBEAT_SECONDS` while idle.
+    """
+    subscription = _subscribe(project_id)
+    if subscription is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Event stream is not available.",
+                            headers={"Retry-After": str(config.EVENTS_HEARTBEAT_SECONDS)})
+
+    async def generate():
+        try:
+            # کلاینت بلافاصله می‌فهمد اشتراک برقرار است
+            yield ": subscribed\n\n"
+            while True:
+                event = await subscription.next(config.EVENTS_HEARTBEAT_SECONDS)
+                yield ": ping\n\n" if event is None else _sse(event)
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(generate(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket, project_id: Optional[int] = None):
+    """Same events as the SSE stream, as JSON messages (`type`: change, resync or ping)."""
+    subscription = _subscribe(project_id)
+    if subscription is None:
+        await websocket.close(code=1013)  # Try Again Later
+        return
+    try:
+        await websocket.accept()
+        while True:
+            event = await subscription.next(config.EVENTS_HEARTBEAT_SECONDS)
+            await websocket.send_json(event if event is not None else {"type": "ping"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        broadcaster.unsubscribe(subscription)
@@ -1,56 +1,237 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.services import project_service
-from app.api.controller_schemas.requests.project_request_schema import ProjectCreateRequest, ProjectUpdateRequest
-from app.api.controller_schemas.responses.project_response_schema import ProjectResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
+from app import config
+from app.db.runner import SessionRunner, get_runner
+from app.exceptions.base import QuotaExceededError
+from app.models.task import TaskStatus
+from app.services import project_service, task_service, transfer_service
+from app.api.controller_schemas.requests.project_request_schema import ProjectCreateRequest, ProjectUpdateRequest, ProjectBulkCreateRequest
+from app.api.controller_schemas.responses.project_response_schema import ProjectResponse, ProjectWithTasksResponse
+from app.api.controller_schemas.responses.task_response_schema import TaskResponse
+from app.api.controller_schemas.responses.bulk_response_schema import BulkCreateResponse
+from app.api.controller_schemas.responses.transfer_response_schema import ImportResponse
+from app.api.controller_schemas.responses.project_stats_response_schema import ProjectStatsResponse, ProjectStatsBatchResponse
+from app.api.bulk import bulk_response
+from app.api.streaming import MEDIA_TYPES, spool_request_body, stream_with_session
+from app.api.pagination import decode_id_cursor, set_next_cursor
+from app.api.etag import compute_etag, entity_etag, is_not_modified, list_etag, not_modified
+from app.api.serialization import fast_list_response
+from app.api.fieldsets import parse_fields, sparse_response
 
 router = APIRouter()
 
+MAX_STATS_IDS = 1000
+
+def parse_ids(ids: str) -> list[int]:
+    """شناسه‌های جداشده با کاما (مثلاً "1,2,3") را می‌خواند؛ ترتیب حفظ و تکراری‌ها حذف می‌شوند."""
+    try:
+        parsed = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if not parsed:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    if len(parsed) > MAX_STATS_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_STATS_IDS} ids per request")
+    return parsed
+
+class TaskInclude:
+    """پارامترهای include=tasks مشترک بین لیست و جزئیات پروژه."""
+
+    def __init__(
+        self,
+        include: Optional[str] = Query(None, pattern="^tasks$", description="Set to `tasks` to embed each project's tasks"),
+        tasks_limit: Optional[int] = Query(None, ge=1, le=1000, description="Max tasks per project (lowest IDs first)"),
+        tasks_status: Optional[TaskStatus] = Query(None, description="Only embed tasks with this status"),
+    ):
+        self.enabled = include == "tasks"
+        self.limit = tasks_limit
+        self.status = tasks_status
+
+def with_tasks(project, tasks: list) -> ProjectWithTasksResponse:
+    return ProjectWithTasksResponse(
+        **ProjectResponse.model_validate(project).model_dump(),
+        tasks=[TaskResponse.model_validate(task) for task in tasks],
+    )
+
+def nested_response(response: Response, content) -> JSONResponse:
+    """پاسخ تو در تو را مستقیم برمی‌گرداند (response_model برای شکل ساده است) و هدرها را منتقل می‌کند."""
+    return JSONResponse(content=jsonable_encoder(content), headers=dict(response.headers))
+
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
-def create_project(request: ProjectCreateRequest, db: Session = Depends(get_db)):
+async def create_project(request: ProjectCreateRequest, db: SessionRunner = Depends(get_runner)):
     """
     Create a new project.
     This endpoint creates a new resource in the database.
     """
-    return project_service.create_project(db, request)
+    try:
+        return await db.run(project_service.create_project, request)
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        # نام تکراری (constraint یکتا) یا نقض قوانین تعداد کلمات
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_projects_bulk(request: ProjectBulkCreateRequest, response: Response, db: SessionRunner = Depends(get_runner)):
+    """
+    Create many projects in one transaction with a single multi-row INSERT.
+    - **atomic**: if true (default), nothing is created unless every item is valid.
+    Returns one result per item (`id` on success, `error` on failure).
+    Status is 201 when everything was created, 207 on partial success and 422 when nothing was created.
+    """
+    results = await db.run(project_service.create_projects_bulk, request.items, request.atomic)
+    return bulk_response(response, results)
 
 @router.get("/", response_model=List[ProjectResponse])
-def get_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_projects(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,name"),
+    include: TaskInclude = Depends(),
+    db: SessionRunner = Depends(get_runner),
+):
     """
-    Retrieve all projects with pagination.
-    - **skip**: Number of records to skip (for pagination)
+    Retrieve all projects with pagination, ordered by ID.
+    - **cursor**: Opaque token from the `X-Next-Cursor` header of the previous page (recommended).
+      Cursor pages are read with an index seek, so every page costs the same no matter how deep it is.
+    - **skip**: Number of records to skip (legacy; cost grows with the offset, ignored when `cursor` is given)
     - **limit**: Maximum number of records to return
+    - **include=tasks**: embed each project's tasks (`tasks_limit` per project, optional `tasks_status`).
+      All tasks of the page are loaded with one query, so the query count does not grow with the page size.
+    - **fields**: only select and return these columns (`id` is always included; not combinable with `include`).
+      Allowed: `id`, `name`, `description`, `created_at`, `updated_at`.
+
+    Responses carry an `ETag`; send it back in `If-None-Match` to get `304 Not Modified` when nothing changed.
+    """
+    columns = parse_fields(fields, project_service.PROJECT_FIELD_COLUMNS)
+    if columns and include.enabled:
+        raise HTTPException(status_code=400, detail="fields cannot be combined with include")
+    after_id = decode_id_cursor(cursor)
+    versions = [await db.run(project_service.get_projects_version)]
+    if include.enabled:
+        versions.append(await db.run(task_service.get_tasks_version))
+    etag = list_etag("projects", request, *versions)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    fast = config.FAST_SERIALIZATION and not include.enabled
+    if columns:
+        projects = await db.run(project_service.get_project_rows, skip, limit, after_id=after_id, columns=columns)
+    elif fast:
+        projects = await db.run(project_service.get_project_rows, skip, limit, after_id=after_id)
+    else:
+        projects = await db.run(project_service.get_projects, skip, limit, after_id=after_id)
+    set_next_cursor(response, projects, limit)
+    response.headers["ETag"] = etag
+    if columns:
+        return sparse_response(response, projects)
+    if include.enabled:
+        tasks = await db.run(task_service.get_tasks_for_projects, [p.id for p in projects], include.limit, include.status)
+        return nested_response(response, [with_tasks(p, tasks[p.id]) for p in projects])
+    if fast:
+        return fast_list_response(response, projects, ProjectResponse)
+    return projects
+
+@router.get("/export")
+async def export_projects(fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$")):
+    """
+    Stream all projects as NDJSON or CSV.
+    Rows are read through a server-side cursor, so memory stays constant however many projects there are.
+    """
+    return StreamingResponse(
+        stream_with_session(transfer_service.export_projects, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="projects.{fmt}"'},
+    )
+
+@router.post("/import", response_model=ImportResponse)
+async def import_projects(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(transfer_service.DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    db: SessionRunner = Depends(get_runner),
+):
+    """
+    Import projects from an NDJSON or CSV request body (same columns as the export).
+    The body is parsed in batches and each batch is bulk-inserted. Exported IDs are kept, so tasks imported
+    afterwards still point at the right project; a row whose ID already exists with the same name is skipped.
+    """
+    with await spool_request_body(request) as stream:
+        return await db.run(transfer_service.import_projects, stream, fmt, batch_size)
+
+@router.get("/stats", response_model=ProjectStatsBatchResponse)
+async def get_projects_stats(ids: str = Query(..., description="Comma-separated project IDs, e.g. 1,2,3"),
+                             db: SessionRunner = Depends(get_runner)):
+    """
+    Task statistics for many projects in one round trip (up to 1000 IDs).
+    Computed by a single GROUP BY query; tasks are never loaded.
+    Unknown IDs are listed in `not_found`.
+    """
+    project_ids = parse_ids(ids)
+    stats = await db.run(project_service.get_projects_stats, project_ids)
+    return {
+        "items": [stats[i] for i in project_ids if i in stats],
+        "not_found": [i for i in project_ids if i not in stats],
+    }
+
+@router.get("/{project_id}/stats", response_model=ProjectStatsResponse)
+async def get_project_stats(project_id: int, db: SessionRunner = Depends(get_runner)):
+    """
+    Task statistics for one project: counts by status, overdue count (open tasks past their deadline)
+    and the next upcoming deadline among open tasks.
     """
-    return project_service.get_projects(db, skip, limit)
+    stats = await db.run(project_service.get_projects_stats, [project_id])
+    if project_id not in stats:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return stats[project_id]
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(project_id: int, db: Session = Depends(get_db)):
+async def get_project(project_id: int, request: Request, response: Response,
+                      include: TaskInclude = Depends(), db: SessionRunner = Depends(get_runner)):
     """
     Get a specific project by ID.
+    - **include=tasks**: embed the project's tasks (`tasks_limit`, `tasks_status` as in the list endpoint).
+    Supports `If-None-Match` (304 when the project, and its tasks if included, are unchanged).
     """
-    project = project_service.get_project(db, project_id)
+    project = await db.run(project_service.get_project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    etag = entity_etag("project", project)
+    if include.enabled:
+        filters = task_service.TaskFilter(project_id=project_id)
+        etag = compute_etag(etag, *await db.run(task_service.get_tasks_version, filters), request.url.query)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    if include.enabled:
+        tasks = await db.run(task_service.get_tasks_for_projects, [project_id], include.limit, include.status)
+        return nested_response(response, with_tasks(project, tasks[project_id]))
     return project
 
 @router.put("/{project_id}", response_model=ProjectResponse)
-def update_project(project_id: int, request: ProjectUpdateRequest, db: Session = Depends(get_db)):
+async def update_project(project_id: int, request: ProjectUpdateRequest, db: SessionRunner = Depends(get_runner)):
     """
     Update a project.
     """
-    project = project_service.update_project(db, project_id, request)
+    try:
+        project = await db.run(project_service.update_project, project_id, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return project
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(project_id: int, db: Session = Depends(get_db)):
+async def delete_project(project_id: int, db: SessionRunner = Depends(get_runner)):
     """
     Delete a project.
     """
-    success = project_service.delete_project(db, project_id)
+    success = await db.run(project_service.delete_project, project_id)
     if not success:
         raise HTTPException(status_code=404, detail="Project not found")
     # در وضعیت 204 معمولاً چیزی برنمی‌گردانیم (یا فقط Response خالی)
@@ -1,58 +1,211 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.services import task_service
-from app.api.controller_schemas.requests.task_request_schema import TaskCreateRequest, TaskUpdateRequest
-from app.api.controller_schemas.responses.task_response_schema import TaskResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from datetime import date, datetime
+from app import config
+from app.db.runner import SessionRunner, get_runner
+from app.exceptions.base import QuotaExceededError
+from app.models.task import TaskStatus
+from app.services import task_service, transfer_service
+from app.api.controller_schemas.requests.task_request_schema import TaskCreateRequest, TaskUpdateRequest, TaskBulkCreateRequest
+from app.api.controller_schemas.responses.task_response_schema import TaskResponse, TaskSearchResponse
+from app.api.controller_schemas.responses.bulk_response_schema import BulkCreateResponse
+from app.api.controller_schemas.responses.transfer_response_schema import ImportResponse
+from app.api.bulk import bulk_response
+from app.api.streaming import MEDIA_TYPES, spool_request_body, stream_with_session
+from app.api.pagination import decode_id_cursor, decode_rank_cursor, set_next_cursor
+from app.api.etag import entity_etag, is_not_modified, list_etag, not_modified
+from app.api.serialization import fast_list_response
+from app.api.fieldsets import parse_fields, sparse_response
 
 router = APIRouter()
 
+SORT_PATTERN = "^-?(" + "|".join(task_service.TASK_SORT_FIELDS) + ")$"
+
+def task_filters(
+    project_id: Optional[int] = None,
+    status: Optional[TaskStatus] = None,
+    deadline_before: Optional[date] = None,
+    deadline_after: Optional[date] = None,
+    created_after: Optional[datetime] = None,
+) -> task_service.TaskFilter:
+    """Query-string filters shared by the task list endpoint and its ETag."""
+    return task_service.TaskFilter(
+        project_id=project_id,
+        status=status,
+        deadline_before=deadline_before,
+        deadline_after=deadline_after,
+        created_after=created_after,
+    )
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(request: TaskCreateRequest, db: Session = Depends(get_db)):
+async def create_task(request: TaskCreateRequest, db: SessionRunner = Depends(get_runner)):
     """
     Create a new task for a project.
     """
     try:
-        return task_service.create_task(db, request)
+        return await db.run(task_service.create_task, request)
+    except QuotaExceededError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         # اگر سرویس خطای ولیو برگرداند (مثلاً پروژه پیدا نشد)، اینجا 404 می‌دهیم
         raise HTTPException(status_code=404, detail=str(e))
 
+@router.post("/bulk", response_model=BulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_tasks_bulk(request: TaskBulkCreateRequest, response: Response, db: SessionRunner = Depends(get_runner)):
+    """
+    Create many tasks in one transaction.
+    Projects are looked up once, quotas are reserved once per project and rows go in with a single multi-row INSERT.
+    - **atomic**: if true (default), nothing is created unless every item is valid.
+    Status is 201 when everything was created, 207 on partial success and 422 when nothing was created.
+    """
+    results = await db.run(task_service.create_tasks_bulk, request.items, request.atomic)
+    return bulk_response(response, results)
+
 @router.get("/", response_model=List[TaskResponse])
-def get_tasks(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_tasks(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = Query("id", pattern=SORT_PATTERN),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,status,deadline"),
+    filters: task_service.TaskFilter = Depends(task_filters),
+    db: SessionRunner = Depends(get_runner),
+):
+    """
+    Retrieve tasks with optional filters and sorting.
+    - **project_id**, **status**: exact match (index `(project_id, status)`)
+    - **deadline_before** / **deadline_after**: strict date bounds (index `(status, deadline)`)
+    - **created_after**: creation time lower bound (index `created_at`)
+    - **sort**: one of `id`, `deadline`, `created_at`, `title`; prefix with `-` for descending. Ties break on ID.
+    - **cursor**: Opaque token from the `X-Next-Cursor` header of the previous page (recommended, constant cost per page).
+      Available for `sort=id` and `sort=-id`.
+    - **skip**: Number of records to skip (legacy; ignored when `cursor` is given)
+    - **limit**: Maximum number of records to return
+    - **fields**: only select and return these columns (`id` is always included).
+      Allowed: `id`, `title`, `description`, `status`, `deadline`, `project_id`, `created_at`, `updated_at`.
+
+    Responses carry an `ETag`; send it back in `If-None-Match` to get `304 Not Modified` when nothing changed.
+    """
+    columns = parse_fields(fields, task_service.TASK_FIELD_COLUMNS)
+    keyset = sort in task_service.KEYSET_SORTS
+    if cursor and not keyset:
+        raise HTTPException(status_code=400, detail="Cursor pagination is only available for sort=id or sort=-id")
+    after_id = decode_id_cursor(cursor)
+    etag = list_etag("tasks", request, await db.run(task_service.get_tasks_version, filters))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    if columns:
+        tasks = await db.run(task_service.get_task_rows, skip, limit, after_id=after_id, filters=filters,
+                             sort=sort, columns=columns)
+    elif config.FAST_SERIALIZATION:
+        tasks = await db.run(task_service.get_task_rows, skip, limit, after_id=after_id, filters=filters, sort=sort)
+    else:
+        tasks = await db.run(task_service.get_tasks, skip, limit, after_id=after_id, filters=filters, sort=sort)
+    if keyset:
+        set_next_cursor(response, tasks, limit)
+    response.headers["ETag"] = etag
+    if columns:
+        return sparse_response(response, tasks)
+    if config.FAST_SERIALIZATION:
+        return fast_list_response(response, tasks, TaskResponse)
+    return tasks
+
+@router.get("/search", response_model=List[TaskSearchResponse])
+async def search_tasks(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms; supports \"quoted phrases\", OR and -exclusion on PostgreSQL"),
+    project_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: SessionRunner = Depends(get_runner),
+):
+    """
+    Full-text search over task titles and descriptions, best matches first.
+    - **q**: search terms; title matches rank above description matches
+    - **project_id**: only search one project
+    - **cursor**: opaque token from the `X-Next-Cursor` header of the previous page
+
+    Matching uses an inverted index (PostgreSQL `tsvector` + GIN, SQLite FTS5), so cost depends on the number of matches, not the table size.
+    """
+    after = decode_rank_cursor(cursor)
+    etag = list_etag("tasks-search", request,
+                     await db.run(task_service.get_tasks_version, task_service.TaskFilter(project_id=project_id)))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    rows = await db.run(task_service.search_tasks, q, project_id, limit, after)
+    set_next_cursor(response, rows, limit, key=lambda row: {"rank": row.rank, "id": row.id})
+    response.headers["ETag"] = etag
+    return fast_list_response(response, rows, TaskSearchResponse)
+
+@router.get("/export")
+async def export_tasks(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    project_id: Optional[int] = None,
+):
+    """
+    Stream tasks as NDJSON or CSV, optionally for one project.
+    Rows are read through a server-side cursor, so memory stays constant even for millions of tasks.
+    """
+    return StreamingResponse(
+        stream_with_session(transfer_service.export_tasks, fmt, project_id),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{fmt}"'},
+    )
+
+@router.post("/import", response_model=ImportResponse)
+async def import_tasks(
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(transfer_service.DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    db: SessionRunner = Depends(get_runner),
+):
     """
-    Retrieve all tasks.
+    Import tasks from an NDJSON or CSV request body (same columns as the export).
+    The body is parsed in batches; each batch goes through the bulk-create path, so word rules and quotas apply.
+    Exported IDs and `status` are kept; a row whose ID already exists with the same project and title
+    is skipped, so importing the same file twice creates no duplicates. Rows without `id` get a new ID.
     """
-    return task_service.get_tasks(db, skip, limit)
+    with await spool_request_body(request) as stream:
+        return await db.run(transfer_service.import_tasks, stream, fmt, batch_size)
 
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(task_id: int, db: Session = Depends(get_db)):
+async def get_task(task_id: int, request: Request, response: Response, db: SessionRunner = Depends(get_runner)):
     """
     Get a specific task by ID.
+    Supports `If-None-Match` (304 when the task is unchanged).
     """
-    task = task_service.get_task(db, task_id)
+    task = await db.run(task_service.get_task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    etag = entity_etag("task", task)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return task
 
 @router.patch("/{task_id}", response_model=TaskResponse)
-def update_task(task_id: int, request: TaskUpdateRequest, db: Session = Depends(get_db)):
+async def update_task(task_id: int, request: TaskUpdateRequest, db: SessionRunner = Depends(get_runner)):
     """
     Update a task (e.g., mark as done).
     Using PATCH allows partial updates.
     """
-    task = task_service.update_task(db, task_id, request)
+    task = await db.run(task_service.update_task, task_id, request)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(task_id: int, db: Session = Depends(get_db)):
+async def delete_task(task_id: int, db: SessionRunner = Depends(get_runner)):
     """
     Delete a task.
     """
-    success = task_service.delete_task(db, task_id)
+    success = await db.run(task_service.delete_task, task_id)
     if not success:
         raise HTTPException(status_code=404, detail="Task not found")
     return None
\ No newline at end of file
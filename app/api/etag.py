@@ -0,0 +1,46 @@
+"""
+ETag و درخواست‌های شرطی (If-None-Match / 304 Not Modified).
+
+ETag تک‌آیتم از (id, updated_at) ساخته می‌شود و ETag لیست از یک کوئری تجمعی
+ارزان (count و max(updated_at)) به همراه پارامترهای درخواست؛ پس برای تصمیم 304
+هیچ بدنه‌ای سریال‌سازی نمی‌شود.
+"""
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def compute_etag(*parts) -> str:
+    """یک ETag قوی (strong) از اجزای داده‌شده می‌سازد."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.sha1(raw.encode()).hexdigest()[:32] + '"'
+
+
+def entity_etag(kind: str, entity) -> str:
+    return compute_etag(kind, entity.id, entity.updated_at.isoformat() if entity.updated_at else None)
+
+
+def list_etag(kind: str, request: Request, *versions: tuple) -> str:
+    """
+    هر version یک (count, max(updated_at)) است؛ query string صفحه و فیلترها را متمایز می‌کند.
+    برای پاسخ‌هایی که چند جدول را در بر می‌گیرند (مثلاً پروژه‌ها با تسک‌ها) چند version داده می‌شود.
+    """
+    parts = []
+    for count, last_updated in versions:
+        parts += [count, last_updated.isoformat() if last_updated else None]
+    return compute_etag(kind, *parts, request.url.query)
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """مقایسه ضعیف If-None-Match طبق RFC 9110 (پیشوند W/ نادیده گرفته می‌شود)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
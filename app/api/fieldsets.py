@@ -0,0 +1,32 @@
+"""
+Sparse fieldsets: پارامتر ?fields=id,title,status برای لیست‌ها.
+
+فقط ستون‌های خواسته‌شده در SQL انتخاب می‌شوند (ستون‌های حجیمی مثل description اصلاً
+خوانده نمی‌شوند) و پاسخ فقط همان کلیدها را دارد. id همیشه انتخاب و برگردانده می‌شود
+چون کرسر صفحه بعد و شناسایی آیتم‌ها به آن وابسته است.
+"""
+from fastapi import HTTPException, Response
+
+from app.api.serialization import FastJSONResponse
+
+
+def parse_fields(fields: str | None, allowed: dict) -> list | None:
+    """
+    "id,title" را به لیست ستون‌های SQLAlchemy تبدیل می‌کند (id اول، بدون تکرار).
+    None یعنی پارامتر داده نشده و همه ستون‌ها لازم است؛ نام ناشناخته HTTP 400 می‌دهد.
+    """
+    if fields is None:
+        return None
+    names = list(dict.fromkeys(["id"] + [name.strip() for name in fields.split(",") if name.strip()]))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return [allowed[name] for name in names]
+
+
+def sparse_response(response: Response, rows) -> FastJSONResponse:
+    """ردیف‌ها را با همان کلیدهای انتخاب‌شده برمی‌گرداند؛ هدرهای response منتقل می‌شوند."""
+    return FastJSONResponse(content=[dict(row._mapping) for row in rows], headers=dict(response.headers))
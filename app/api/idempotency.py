@@ -0,0 +1,159 @@
+"""
+کلید idempotency برای POSTهای ایجاد (Idempotency-Key).
+
+کلاینتی که پاسخ یک POST را گم کرده (timeout، قطع شبکه) می‌تواند همان درخواست را با همان
+هدر Idempotency-Key دوباره بفرستد و به جای ساختن پروژه یا تسک دوم، پاسخ اول را بگیرد:
+
+- اولین درخواست کلید را با INSERT ... ON CONFLICT DO NOTHING ادعا می‌کند و اجرا می‌شود؛
+  پاسخش (وضعیت، هدرها و بدنه) در جدول idempotency_keys ذخیره می‌شود.
+- تکرار با همان کلید و همان بدنه پاسخ ذخیره‌شده را با هدر Idempotent-Replayed: true می‌گیرد؛
+  منطق سرویس اصلاً اجرا نمی‌شود.
+- تکرار همزمان (وقتی اولی هنوز در حال اجراست) تا IDEMPOTENCY_WAIT_SECONDS منتظر نتیجه می‌ماند
+  و در غیر این صورت 409 با Retry-After می‌گیرد؛ پس فقط یک درخواست اجرا می‌شود.
+- همان کلید با بدنه یا مسیر دیگر 422 می‌گیرد.
+- پاسخ 5xx یا خطای پیش‌بینی‌نشده ذخیره نمی‌شود و ادعا آزاد می‌شود تا تلاش بعدی اجرا شود.
+
+کلیدها بعد از IDEMPOTENCY_TTL_SECONDS منقضی و در پس‌زمینه API (app/main.py) حذف می‌شوند.
+"""
+import asyncio
+import hashlib
+import json
+import time
+
+from app import config
+from app.api.background import run_db as _run
+from app.models.idempotency_key import IdempotencyKey
+from app.services import idempotency_service
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# مسیرهای POST که کلید را می‌پذیرند؛ import عمداً نیست (بدنه استریم می‌شود و بافر نمی‌کنیم)
+IDEMPOTENT_PATHS = frozenset({"/api/projects/", "/api/projects/bulk", "/api/tasks/", "/api/tasks/bulk"})
+
+_POLL_SECONDS = 0.05
+
+def _fingerprint(scope, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (scope["method"], scope["path"], scope.get("query_string", b"").decode("latin-1")):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def _request_key(scope) -> str | None:
+    name = IDEMPOTENCY_HEADER.lower().encode()
+    for header, value in scope["headers"]:
+        if header == name:
+            return value.decode("latin-1").strip()
+    return None
+
+
+async def _send_json(send, status_code: int, detail: str, headers: list[tuple[bytes, bytes]] = ()) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _replay(send, record) -> None:
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in record.response_headers]
+    headers.append((REPLAYED_HEADER.lower().encode(), b"true"))
+    await send({"type": "http.response.start", "status": record.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": record.response_body or b""})
+
+
+class IdempotencyMiddleware:
+    """میان‌افزار ASGI: ادعا، بازپخش و ذخیره پاسخ برای POSTهای IDEMPOTENT_PATHS با هدر Idempotency-Key."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in IDEMPOTENT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        key = _request_key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters.")
+            return
+
+        # بدنه برای fingerprint بافر می‌شود و بعد دوباره به اپ داده می‌شود
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        fingerprint = _fingerprint(scope, body)
+
+        if not await self._acquire(key, fingerprint, send):
+            return
+        await self._execute(scope, receive, send, key, body)
+
+    async def _acquire(self, key: str, fingerprint: str, send) -> bool:
+        """True یعنی کلید مال این درخواست است؛ در غیر این صورت پاسخ (بازپخش یا خطا) فرستاده شده."""
+        deadline = time.monotonic() + config.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            if await _run(idempotency_service.claim_key, key, fingerprint):
+                return True
+            record = await _run(idempotency_service.get_record, key)
+            if record is None:
+                # بین INSERT و SELECT آزاد شد (خطای سرور در درخواست اول)؛ دوباره ادعا می‌کنیم
+                continue
+            if record.fingerprint != fingerprint:
+                await _send_json(send, 422, f"{IDEMPOTENCY_HEADER} was already used with a different request.")
+                return False
+            if record.status == IdempotencyKey.COMPLETED:
+                await _replay(send, record)
+                return False
+            if time.monotonic() >= deadline:
+                await _send_json(send, 409, "A request with this Idempotency-Key is still in progress.",
+                                 [(b"retry-after", b"1")])
+                return False
+            await asyncio.sleep(_POLL_SECONDS)
+
+    async def _execute(self, scope, receive, send, key: str, body: bytes) -> None:
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = 500
+        headers: list[list[str]] = []
+        response_body = []
+
+        async def send_wrapper(message):
+            nonlocal status_code, headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [[name.decode("latin-1"), value.decode("latin-1")] for name, value in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        except BaseException:
+            await _run(idempotency_service.release_key, key)
+            raise
+        if status_code >= 500:
+            await _run(idempotency_service.release_key, key)
+        else:
+            await _run(idempotency_service.complete_key, key, status_code, headers, b"".join(response_body))
+
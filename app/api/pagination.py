@@ -0,0 +1,88 @@
+"""
+ابزارهای صفحه‌بندی مبتنی بر کرسر (Keyset Pagination).
+
+کرسر یک توکن مات (opaque) است که آخرین کلید دیده‌شده را در خود دارد.
+به جای OFFSET که تمام ردیف‌های رد شده را اسکن می‌کند، صفحه بعدی با
+شرط ``id > last_id`` روی ایندکس کلید اصلی خوانده می‌شود؛ بنابراین هزینه
+هر صفحه مستقل از عمق آن است.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(payload: dict) -> str:
+    """یک دیکشنری کوچک را به توکن base64 امن برای URL تبدیل می‌کند."""
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    توکن کرسر را به دیکشنری برمی‌گرداند.
+    در صورت نامعتبر بودن توکن HTTP 400 برمی‌گرداند.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return payload
+
+
+def decode_id_cursor(cursor: str | None) -> int | None:
+    """کرسری که فقط شامل آخرین id است را باز می‌کند."""
+    if cursor is None:
+        return None
+    last_id = decode_cursor(cursor).get("id")
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return last_id
+
+
+def decode_rank_cursor(cursor: str | None) -> tuple[float, int] | None:
+    """کرسر نتایج رتبه‌بندی‌شده (جست‌وجو): (rank، id) آخرین ردیف صفحه قبل."""
+    if cursor is None:
+        return None
+    payload = decode_cursor(cursor)
+    rank, last_id = payload.get("rank"), payload.get("id")
+    if not isinstance(rank, (int, float)) or isinstance(rank, bool) or not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return float(rank), last_id
+
+
+def encode_change_cursor(seq: int, seen_at: datetime) -> str:
+    """کرسر فید تغییرات: آخرین seq خوانده‌شده و زمانی که کلاینت تا آن لحظه همه تغییرات را دیده است."""
+    return encode_cursor({"seq": seq, "at": seen_at.isoformat()})
+
+
+def decode_change_cursor(cursor: str) -> tuple[int, datetime]:
+    """کرسر فید تغییرات را به (seq، زمان) برمی‌گرداند."""
+    payload = decode_cursor(cursor)
+    seq, seen_at = payload.get("seq"), payload.get("at")
+    if not isinstance(seq, int) or not isinstance(seen_at, str):
+        raise HTTPException(status_code=400, detail="Invalid change cursor")
+    try:
+        parsed = datetime.fromisoformat(seen_at)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid change cursor")
+    # SQLite زمان‌ها را بدون منطقه زمانی برمی‌گرداند؛ همه زمان‌ها UTC هستند
+    return seq, parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def set_next_cursor(response: Response, items: list, limit: int, key=None) -> None:
+    """
+    اگر صفحه پر باشد، کرسر صفحه بعد را در هدر X-Next-Cursor قرار می‌دهد.
+    صفحه ناقص یعنی به انتهای لیست رسیده‌ایم و هدری ارسال نمی‌شود.
+    key (اختیاری) محتوای کرسر را از آخرین آیتم می‌سازد؛ پیش‌فرض فقط id است.
+    """
+    if items and len(items) >= limit:
+        payload = key(items[-1]) if key else {"id": items[-1].id}
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(payload)
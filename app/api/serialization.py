@@ -0,0 +1,60 @@
+"""
+مسیر سریع سریال‌سازی برای لیست‌های بزرگ.
+
+مسیر عادی FastAPI هر آبجکت ORM را با from_attributes به مدل Pydantic، بعد به dict و
+در نهایت با json استاندارد به متن تبدیل می‌کند. برای لیست‌ها ریپازیتوری ردیف‌های Core
+(بدون identity map) برمی‌گرداند و این ماژول آن‌ها را بدون اعتبارسنجی دوباره، مستقیم
+با orjson (در صورت نصب بودن) یا json استاندارد به JSON تبدیل می‌کند.
+خروجی همان شکل response_model را دارد: کلیدها از فیلدهای مدل خوانده می‌شوند و
+فیلدی که ستون متناظر ندارد مقدار پیش‌فرض مدل را می‌گیرد.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterable
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # وابستگی اختیاری: pip install ".[fast]"
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """JSON فشرده؛ زمان‌های UTC مثل Pydantic با پسوند Z نوشته می‌شوند."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def rows_to_dicts(rows: Iterable, model: type[BaseModel]) -> list[dict]:
+    """ردیف‌های Core را به dictهایی با کلیدهای فیلدهای model تبدیل می‌کند (بدون اعتبارسنجی)."""
+    defaults = {name: field.default for name, field in model.model_fields.items()}
+    return [
+        {name: mapping.get(name, default) for name, default in defaults.items()}
+        for mapping in (row._mapping for row in rows)
+    ]
+
+
+def fast_list_response(response: Response, rows: Iterable, model: type[BaseModel]) -> FastJSONResponse:
+    """پاسخ لیست از ردیف‌های Core؛ هدرهای تنظیم‌شده روی response (ETag، کرسر) منتقل می‌شوند."""
+    return FastJSONResponse(content=rows_to_dicts(rows, model), headers=dict(response.headers))
@@ -0,0 +1,36 @@
+"""
+ابزارهای پاسخ و درخواست جریانی (streaming) برای خروجی/ورودی حجیم.
+"""
+import io
+import tempfile
+from typing import Callable, Iterator
+
+from fastapi import Request
+from app.db.session import SessionLocal
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# تا این اندازه بدنه درخواست در حافظه نگه داشته می‌شود و بعد از آن روی دیسک می‌رود
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+def stream_with_session(fn: Callable[..., Iterator[str]], *args, **kwargs) -> Iterator[str]:
+    """
+    یک ژنراتور سرویس را با سشن اختصاصی خودش اجرا می‌کند.
+    dependencyهای FastAPI قبل از ارسال بدنه پاسخ بسته می‌شوند، پس پاسخ جریانی
+    باید سشن (و کرسر سمت سرور) خودش را تا پایان ارسال باز نگه دارد.
+    """
+    with SessionLocal() as db:
+        yield from fn(db, *args, **kwargs)
+
+
+async def spool_request_body(request: Request) -> io.TextIOWrapper:
+    """
+    بدنه درخواست را تکه به تکه در یک فایل موقت (حافظه، سپس دیسک) می‌نویسد
+    و یک جریان متنی UTF-8 برای پردازش تدریجی برمی‌گرداند.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return io.TextIOWrapper(spool, encoding="utf-8", newline="")
@@ -0,0 +1,2 @@
+from .backends import CacheBackend, LRUCacheBackend
+from .entity_cache import entity_cache, configure_cache, project_key, task_key
@@ -0,0 +1,78 @@
+"""
+بک‌اندهای کش.
+هر بک‌اند باید رابط CacheBackend را پیاده کند؛ LRUCacheBackend پیاده‌سازی درون‌پردازه‌ای
+است و برای کش مشترک بین چند پردازه (مثلاً Redis) کافی است یک کلاس با همین رابط نوشته شود.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+
+class CacheBackend(ABC):
+    """رابط مشترک بک‌اندهای کش. مقادیر dictهای ساده و قابل pickle هستند."""
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """مقدار کلید یا None اگر وجود نداشته باشد یا منقضی شده باشد."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """ذخیره مقدار برای کلید."""
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        """حذف کلیدها (کلید ناموجود خطا نیست)."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """حذف تمام کلیدها."""
+
+    def size(self) -> int | None:
+        """تعداد کلیدها، اگر بک‌اند بتواند ارزان حساب کند."""
+        return None
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    کش درون‌پردازه‌ای با ظرفیت محدود (حذف قدیمی‌ترین استفاده) و انقضای زمانی (TTL).
+    برای استفاده همزمان از چند thread امن است.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def size(self) -> int:
+        return len(self._data)
@@ -0,0 +1,166 @@
+"""
+کش read-through برای پروژه‌ها و تسک‌ها در مرز سرویس/ریپازیتوری.
+
+در کش فقط snapshot ستون‌ها (dict) ذخیره می‌شود، نه آبجکت ORM؛ پس مقدار کش‌شده به
+هیچ سشنی وابسته نیست و بین درخواست‌ها و بک‌اندهای مشترک قابل استفاده است.
+سرویس‌ها بعد از هر create/update/delete کلیدهای مربوطه را صریحاً باطل می‌کنند.
+
+اگر کلیدی حین بارگذاری read-through باطل یا بازنویسی شود، snapshot خوانده‌شده ممکن است
+قدیمی‌تر از نوشتن باشد و ذخیره نمی‌شود (شمارنده نسل هر کلید در حال بارگذاری). این محافظت
+درون‌پردازه‌ای است؛ با بک‌اند مشترک، نوشتن در پردازه دیگر حداکثر تا CACHE_TTL_SECONDS
+(یا TTL بک‌اند سفارشی) کهنه دیده می‌شود.
+"""
+import importlib
+import threading
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from sqlalchemy import inspect as sa_inspect
+from app import config
+from app.cache.backends import CacheBackend, LRUCacheBackend
+
+# ستون‌هایی که مرتب عوض می‌شوند و در پاسخ‌ها استفاده نمی‌شوند کش نمی‌شوند
+EXCLUDED_COLUMNS = {"task_count"}
+
+
+def project_key(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+def task_key(task_id: int) -> str:
+    return f"task:{task_id}"
+
+
+def snapshot(obj) -> dict:
+    """مقادیر ستون‌های یک آبجکت ORM را به dict ساده تبدیل می‌کند."""
+    mapper = sa_inspect(obj).mapper
+    return {
+        attr.key: getattr(obj, attr.key)
+        for attr in mapper.column_attrs
+        if attr.key not in EXCLUDED_COLUMNS
+    }
+
+
+class EntityCache:
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        # فقط برای کلیدهای در حال بارگذاری: تعداد بارگذاری‌های همزمان و نسل کلید
+        self._loading: dict[str, int] = {}
+        self._generations: dict[str, int] = {}
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> SimpleNamespace | None:
+        """
+        اگر کلید در کش باشد snapshot آن را برمی‌گرداند، وگرنه loader را صدا زده
+        و نتیجه را ذخیره می‌کند. نتیجه None (پیدا نشد) کش نمی‌شود.
+        """
+        if not self.enabled:
+            obj = loader()
+            return SimpleNamespace(**snapshot(obj)) if obj is not None else None
+
+        cached = self.backend.get(key)
+        if cached is not None:
+            self._count("hits")
+            return SimpleNamespace(**cached)
+
+        self._count("misses")
+        generation = self._start_load(key)
+        try:
+            obj = loader()
+            if obj is None:
+                return None
+            data = snapshot(obj)
+            with self._lock:
+                # اگر کلید حین بارگذاری باطل یا بازنویسی شده، این snapshot ممکن است کهنه باشد
+                if self._generations[key] == generation:
+                    self.backend.set(key, data)
+        finally:
+            self._finish_load(key)
+        return SimpleNamespace(**data)
+
+    def put(self, key: str, obj) -> None:
+        """نوشتن مستقیم یک آبجکت تازه (write-through)، مثلاً بعد از ایجاد."""
+        if self.enabled:
+            data = snapshot(obj)
+            with self._lock:
+                self._bump(key)
+                self.backend.set(key, data)
+
+    def invalidate(self, *keys: str) -> None:
+        if self.enabled and keys:
+            with self._lock:
+                self._bump(*keys)
+                self.backend.delete(*keys)
+            self._count("invalidations", len(keys))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bump(*self._generations)
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "size": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+        }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.invalidations = 0
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def _start_load(self, key: str) -> int:
+        """ثبت یک بارگذاری در حال اجرا؛ نسل فعلی کلید را برمی‌گرداند."""
+        with self._lock:
+            self._loading[key] = self._loading.get(key, 0) + 1
+            return self._generations.setdefault(key, 0)
+
+    def _finish_load(self, key: str) -> None:
+        with self._lock:
+            self._loading[key] -= 1
+            if not self._loading[key]:
+                del self._loading[key]
+                del self._generations[key]
+
+    def _bump(self, *keys: str) -> None:
+        """نسل کلیدهای در حال بارگذاری را جلو می‌برد (باید زیر _lock صدا زده شود)."""
+        for key in keys:
+            if key in self._generations:
+                self._generations[key] += 1
+
+
+def _build_backend() -> CacheBackend:
+    """
+    بک‌اند را از تنظیمات می‌سازد. CACHE_BACKEND می‌تواند مسیر یک کلاس سفارشی
+    (مثل "mypkg.redis_cache:RedisCacheBackend") برای کش مشترک باشد.
+    """
+    if config.CACHE_BACKEND:
+        module_name, _, class_name = config.CACHE_BACKEND.partition(":")
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+        return backend_class()
+    return LRUCacheBackend(max_entries=config.CACHE_MAX_ENTRIES, ttl_seconds=config.CACHE_TTL_SECONDS)
+
+
+entity_cache = EntityCache(_build_backend(), enabled=config.CACHE_ENABLED)
+
+
+def configure_cache(backend: CacheBackend | None = None, enabled: bool | None = None) -> EntityCache:
+    """تعویض بک‌اند یا روشن/خاموش کردن کش در زمان اجرا (مثلاً برای تست یا بنچمارک)."""
+    if backend is not None:
+        entity_cache.backend = backend
+    if enabled is not None:
+        entity_cache.enabled = enabled
+    return entity_cache
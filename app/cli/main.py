@@ -6,7 +6,9 @@ import sys
 from datetime import datetime, date
 
 # اتصال به دیتابیس
+from app import config
 from app.db.session import SessionLocal
+from app.db.query_budget import track_queries
 
 # سرویس‌ها (به صورت ماژول ایمپورت می‌شوند)
 from app.services import project_service, task_service
@@ -156,7 +158,7 @@ class CLI:
                     if not proj:
                         print("❌ Project not found.")
                         return
-                    tasks = proj.tasks # استفاده از Relationship دیتابیس
+                    tasks = task_service.get_tasks_for_project(db, proj.id)
                     print(f"\n--- Tasks for Project {proj.name} ---")
                 else:
                     tasks = task_service.get_tasks(db, limit=100)
@@ -242,7 +244,16 @@ class CLI:
                 command_func = self.commands.get(command_input)
                 
                 if command_func:
-                    if command_func(): # اگر exit_app بود
+                    if config.QUERY_DEBUG:
+                        # حالت توسعه: شمارش کوئری‌های هر دستور
+                        with track_queries(command_input) as tracker:
+                            should_exit = command_func()
+                        print(tracker.summary())
+                        for fp, count in tracker.repeated():
+                            print(f"⚠️ Possible N+1: {count} x {fp}")
+                    else:
+                        should_exit = command_func()
+                    if should_exit: # اگر exit_app بود
                         break
                 else:
                     print("Unknown command. Type 'help' to see available commands.")
@@ -252,6 +263,9 @@ class CLI:
             except Exception as e:
                 print(f"Unexpected Error: {e}")
 
+def main():
+    """نقطه ورود دستور todolist (و python -m app.cli.main)."""
+    CLI().run()
+
 if __name__ == "__main__":
-    cli = CLI()
-    cli.run()
\ No newline at end of file
+    main()
\ No newline at end of file
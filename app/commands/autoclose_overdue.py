@@ -2,44 +2,44 @@
 اسکریپت مستقل برای بستن خودکار تسک‌های تاریخ‌گذشته.
 نسخه هماهنگ شده با فاز ۳ (استفاده از Repository).
 """
-import os
-import sys 
+import argparse
 
-# --- ترفند مسیر ---
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..', '..'))
-sys.path.append(PROJECT_ROOT)
-# ------------------
+def run_autoclose_overdue(chunk_size: int | None = None, dry_run: bool = False):
+    # ایمپورت دیرهنگام: --help و خطای آرگومان بدون بارگذاری SQLAlchemy و مدل‌ها جواب می‌دهند.
+    # تنظیمات .env را app.config در اولین دسترسی (یک بار) بارگذاری می‌کند.
+    from app.db.session import SessionLocal
+    from app.services import autoclose_service
 
-from dotenv import load_dotenv
-from app.db.session import SessionLocal
-from app.repositories.task_repository import TaskRepository
-
-def run_autoclose_overdue():
-    # 1. بارگذاری متغیرها
-    load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
-
-    # 2. ساخت سشن دیتابیس
+    # 1. ساخت سشن دیتابیس (engine هم در همین اولین استفاده ساخته می‌شود)
     db = SessionLocal()
-    
+
     try:
-        # 3. استفاده از Repository
-        # در فاز ۳، منطق بستن تسک‌ها را داخل TaskRepository متد autoclose_overdue_tasks گذاشتیم
-        task_repo = TaskRepository(db)
-        
-        print("🔍 Checking for overdue tasks...")
-        closed_count = task_repo.autoclose_overdue_tasks()
-        
-        if closed_count > 0:
-            print(f"✅ Success: Auto-closed {closed_count} overdue task(s).")
+        # 2. اجرای موتور مجموعه‌ای و دسته‌ای autoclose
+        print("🔍 Checking for overdue tasks..." + (" (dry run)" if dry_run else ""))
+        result = autoclose_service.run_autoclose(db, chunk_size=chunk_size, dry_run=dry_run)
+
+        verb = "Would auto-close" if dry_run else "Auto-closed"
+        if result.rows > 0:
+            print(f"✅ Success: {verb} {result.rows} overdue task(s) "
+                  f"in {result.chunks} chunk(s), {result.elapsed_seconds:.3f}s.")
         else:
-            print("ℹ️ Info: No overdue tasks found.")
-            
+            print(f"ℹ️ Info: No overdue tasks found ({result.elapsed_seconds:.3f}s).")
+        return result
+
     except Exception as e:
         print(f"❌ Error during auto-close job: {e}")
     finally:
-        # 4. بستن اجباری سشن
+        # 3. بستن اجباری سشن
         db.close()
 
+def main():
+    parser = argparse.ArgumentParser(description="Auto-close overdue tasks.")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Rows per UPDATE/transaction (default: AUTOCLOSE_CHUNK_SIZE).")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only count overdue tasks; do not change them.")
+    args = parser.parse_args()
+    run_autoclose_overdue(chunk_size=args.chunk_size, dry_run=args.dry_run)
+
 if __name__ == "__main__":
-    run_autoclose_overdue()
\ No newline at end of file
+    main()
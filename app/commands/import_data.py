@@ -0,0 +1,40 @@
+"""
+اسکریپت ورود داده جریانی (NDJSON یا CSV) برای تسک‌ها و پروژه‌ها.
+فایل خط به خط خوانده و دسته به دسته درج می‌شود، پس فایل‌های چند میلیون ردیفی
+هم در حافظه بارگذاری نمی‌شوند.
+
+مثال:
+    python -m app.commands.import_data tasks backup/tasks.ndjson --batch-size 5000
+"""
+import argparse
+
+from app.db.session import SessionLocal
+from app.services import transfer_service
+
+def run_import(kind: str, path: str, fmt: str | None = None, batch_size: int = transfer_service.DEFAULT_BATCH_SIZE):
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "ndjson")
+    importer = transfer_service.import_tasks if kind == "tasks" else transfer_service.import_projects
+
+    with SessionLocal() as db, open(path, encoding="utf-8", newline="") as stream:
+        print(f"📥 Importing {kind} from {path} ({fmt}, batch size {batch_size})...")
+        result = importer(db, stream, fmt, batch_size)
+
+    print(f"✅ Done: {result.rows} row(s) read, {result.created} created, "
+          f"{result.skipped} skipped (already imported), "
+          f"{result.failed} failed, {result.batches} batch(es).")
+    for error in result.errors:
+        print(f"  ❌ {error}")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream-import tasks or projects from NDJSON/CSV.")
+    parser.add_argument("kind", choices=("tasks", "projects"))
+    parser.add_argument("path")
+    parser.add_argument("--format", dest="fmt", choices=transfer_service.FORMATS, default=None,
+                        help="Input format (default: from file extension).")
+    parser.add_argument("--batch-size", type=int, default=transfer_service.DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    run_import(args.kind, args.path, args.fmt, args.batch_size)
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,46 @@
 """
 زمان‌بند (Scheduler) اصلی برنامه.
-این اسکریپت همیشه در حال اجراست و اسکریپت autoclose را صدا می‌زند.
+این اسکریپت همیشه در حال اجراست و تسک‌های تاریخ‌گذشته را می‌بندد؛ به جای اسکن کامل
+در هر دقیقه، تا مرز روز بعد یا تغییر یک تسک می‌خوابد (app/services/autoclose_scheduler.py).
 """
-import schedule
-import time
+import argparse
 import sys
-import os
 
-# --- ترفند مسیر ---
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..', '..'))
-sys.path.append(PROJECT_ROOT)
-# ------------------
+from app import config
+from app.db.session import SessionLocal, get_engine
+from app.metrics import serve_metrics
+from app.services.autoclose_scheduler import COORDINATION_MODES, DeadlineScheduler
 
-# حالا که مسیر درست شد، می‌توانیم فانکشن را ایمپورت کنیم
-from app.commands.autoclose_overdue import run_autoclose_overdue
+def main():
+    parser = argparse.ArgumentParser(description="Run the deadline-driven auto-close scheduler.")
+    parser.add_argument("--coordination", choices=COORDINATION_MODES, default=None,
+                        help="How replicas share the job (default: SCHEDULER_COORDINATION).")
+    parser.add_argument("--once", action="store_true",
+                        help="Run a single catch-up pass and exit (e.g. from cron on every node).")
+    args = parser.parse_args()
 
-def job():
-    """تابعی که قرار است به صورت زمان‌بندی شده اجرا شود."""
-    print(f"\n[{time.ctime()}] ⏰ Running scheduled job...")
-    try:
-        run_autoclose_overdue()
-    except Exception as e:
-        print(f"❌ Error in scheduled job: {e}")
+    scheduler = DeadlineScheduler(SessionLocal, get_engine(), coordination=args.coordination)
+    if args.once:
+        try:
+            rows = scheduler.tick(changed=False)
+        finally:
+            scheduler.close()
+        print(f"ℹ️ Auto-closed {rows} overdue task(s).")
+        return
 
-def main():
     print("🚀 Scheduler started.")
-    print("⏳ Job configured to run every 1 minute (for testing phase)...")
-    
-    schedule.every(1).minutes.do(job)
+    if config.METRICS_ENABLED and config.METRICS_PORT:
+        serve_metrics(config.METRICS_PORT)
+        print(f"📈 Metrics available at http://localhost:{config.METRICS_PORT}/metrics")
 
-    # یک بار همان اول اجرا می‌کنیم تا مطمئن شویم کار می‌کند
-    job()
+    if scheduler.listener.enabled:
+        print("👂 Listening for task changes (incremental runs).")
 
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(1)
+        scheduler.run_forever()
     except KeyboardInterrupt:
         print("\n🛑 Scheduler stopped by user.")
         sys.exit(0)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,146 @@
+"""
+تنظیمات سراسری اپلیکیشن که از متغیرهای محیطی (فایل .env) خوانده می‌شوند.
+
+تنظیمات یک بار، در اولین دسترسی، از محیط و فایل .env ریشه پروژه خوانده و در یک Settings
+کش می‌شوند؛ ایمپورت این ماژول هیچ فایلی نمی‌خواند. کد همچنان config.X می‌خواند
+(__getattr__ ماژول) و مقداردهی config.X = ... (مثلاً در benchmark) همان مقدار را جایگزین می‌کند.
+"""
+import os
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ENV_FILE = PROJECT_ROOT / ".env"
+
+# مقادیر رشته‌ای که بدون حساسیت به حروف مقایسه می‌شوند
+_LOWERCASE = {"DB_MODE", "EVENTS_BACKEND", "SCHEDULER_COORDINATION"}
+
+
+def _bool_env(name: str, default: bool) -> bool:
+    """یک متغیر محیطی بولی (1/true/yes/on) را می‌خواند."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _int_env(name: str, default: int) -> int:
+    """یک متغیر محیطی عددی را می‌خواند؛ مقدار خالی یا نامعتبر یعنی مقدار پیش‌فرض."""
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        print(f"Error: Invalid value for {name} in .env file. Using default value {default}.")
+        return default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """هر فیلد از متغیر محیطی هم‌نام خوانده می‌شود؛ مقدار پیش‌فرض فیلد برای متغیر خالی است."""
+
+    # اتصال دیتابیس؛ DB_MODE حالت دسترسی API است: "sync" (psycopg2 + threadpool) یا "async" (asyncpg)
+    DB_USER: str = "postgres"
+    DB_PASSWORD: str = "postgres"
+    DB_HOST: str = "localhost"
+    DB_PORT: str = "5432"
+    DB_NAME: str = "todolist_db"
+    DB_MODE: str = "sync"
+
+    # سقف‌های کسب‌وکار (Quota)
+    MAX_NUMBER_OF_PROJECT: int = 50
+    MAX_NUMBER_OF_TASK_PER_PROJECT: int = 100
+
+    # استخر اتصال دیتابیس؛ DB_POOL_TIMEOUT سقف انتظار برای اتصال است و بعد از آن API پاسخ 503 می‌دهد
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 5
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RETRY_AFTER: int = 1
+    # سقف زمان اجرای هر دستور SQL در PostgreSQL (میلی‌ثانیه)؛ 0 یعنی بدون سقف
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    # متریک‌های Prometheus (GET /metrics)؛ METRICS_PORT برای پردازه scheduler است (0 یعنی خاموش)
+    METRICS_ENABLED: bool = True
+    METRICS_PORT: int = 0
+
+    # حالت توسعه: شمارش کوئری هر درخواست، سقف هشدار (0 یعنی بدون سقف) و آستانه تشخیص N+1
+    QUERY_DEBUG: bool = False
+    QUERY_BUDGET: int = 0
+    N_PLUS_ONE_THRESHOLD: int = 3
+
+    # مسیر سریع لیست‌ها: ردیف‌های Core و orjson به جای آبجکت ORM و مدل Pydantic
+    FAST_SERIALIZATION: bool = True
+
+    # کلید idempotency در POSTهای ایجاد: مدت نگهداری پاسخ، انتظار تکرار همزمان، مهلت ادعای رهاشده
+    # و فاصله حذف کلیدهای منقضی در پس‌زمینه
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_TTL_SECONDS: int = 86_400
+    IDEMPOTENCY_WAIT_SECONDS: int = 10
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: int = 60
+    IDEMPOTENCY_GC_INTERVAL_SECONDS: int = 600
+
+    # فید تغییرات (GET /api/changes): نگهداری لاگ، فاصله فشرده‌سازی در پس‌زمینه، سقف اندازه صفحه
+    # و کلید advisory lock که ترتیب id ها را با ترتیب commit یکی می‌کند
+    CHANGE_FEED_RETENTION_SECONDS: int = 7 * 86_400
+    CHANGE_FEED_COMPACT_INTERVAL_SECONDS: int = 600
+    CHANGE_FEED_MAX_LIMIT: int = 1000
+    CHANGE_FEED_LOCK_KEY: int = 7_402_002
+
+    # رویدادهای زنده (SSE / WebSocket): "local" فقط همین پردازه، "postgres" پخش بین workerها با LISTEN/NOTIFY؛
+    # صف هر اتصال محدود است و با پر شدن، کلاینت رویداد resync می‌گیرد
+    EVENTS_ENABLED: bool = True
+    EVENTS_BACKEND: str = "local"
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+    EVENTS_MAX_SUBSCRIBERS: int = 1000
+
+    # موتور autoclose: تعداد ردیف در هر UPDATE/تراکنش
+    AUTOCLOSE_CHUNK_SIZE: int = 1000
+
+    # scheduler: حداکثر فاصله بین دو اجرای کامل (تور ایمنی) و گوش دادن به NOTIFY تغییر تسک‌ها در PostgreSQL
+    SCHEDULER_MAX_INTERVAL_SECONDS: int = 3600
+    SCHEDULER_LISTEN: bool = True
+    # هماهنگی چند replica: "lease" (فقط رهبر با advisory lock اجرا می‌کند)، "skip_locked"
+    # (همه اجرا می‌کنند و دسته‌های جدا برمی‌دارند) یا "none"
+    SCHEDULER_COORDINATION: str = "lease"
+    SCHEDULER_LOCK_KEY: int = 7_402_001
+    # فاصله تلاش replicaهای غیر رهبر برای گرفتن lease
+    SCHEDULER_LEASE_RETRY_SECONDS: int = 15
+
+    # کش read-through پروژه‌ها و تسک‌ها
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 10_000
+    CACHE_TTL_SECONDS: int = 30
+    CACHE_BACKEND: str = ""
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        values = {}
+        for field in fields(cls):
+            if field.type is bool:
+                values[field.name] = _bool_env(field.name, field.default)
+            elif field.type is int:
+                values[field.name] = _int_env(field.name, field.default)
+            else:
+                value = os.getenv(field.name, field.default)
+                values[field.name] = value.lower() if field.name in _LOWERCASE else value
+        return cls(**values)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """تنظیمات (یک بار خوانده و کش می‌شود)؛ متغیرهای محیط بر فایل .env مقدم هستند."""
+    from dotenv import load_dotenv
+
+    load_dotenv(ENV_FILE)
+    return Settings.from_env()
+
+
+def __getattr__(name: str):
+    if name.isupper():
+        try:
+            return getattr(get_settings(), name)
+        except AttributeError:
+            pass
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,68 @@
+"""
+Lease رهبری بین چند replica با advisory lock سطح session در PostgreSQL.
+
+قفل روی یک اتصال اختصاصی (خارج از تراکنش‌ها) گرفته می‌شود و تا وقتی آن اتصال زنده
+است نگه داشته می‌شود؛ اگر پردازه یا اتصال از بین برود، PostgreSQL قفل را آزاد می‌کند
+و replica دیگری در تلاش بعدی آن را می‌گیرد. در دیتابیس‌های دیگر (مثل SQLite محلی)
+فقط یک پردازه فرض می‌شود و lease همیشه در اختیار است.
+"""
+from typing import Callable
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+
+
+class AdvisoryLease:
+    """lease روی کلید key؛ acquire هم برای گرفتن و هم برای بررسی زنده بودن lease صدا زده می‌شود."""
+
+    def __init__(self, engine: Engine, key: int, log: Callable[[str], None] = print):
+        self.engine = engine
+        self.key = key
+        self.log = log
+        self.held = False
+        self._conn: Connection | None = None
+        self.enabled = engine.dialect.name == "postgresql"
+
+    def acquire(self) -> bool:
+        """
+        اگر lease در اختیار است زنده بودن اتصال را بررسی می‌کند، وگرنه بدون انتظار
+        (pg_try_advisory_lock) تلاش به گرفتن آن می‌کند. True یعنی این replica رهبر است.
+        """
+        if not self.enabled:
+            self.held = True
+            return True
+        try:
+            if self._conn is None:
+                self._conn = self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            if self.held:
+                self._conn.execute(select(1))
+            else:
+                self.held = bool(self._conn.scalar(select(func.pg_try_advisory_lock(self.key))))
+        except Exception as e:
+            # با بسته شدن اتصال، قفل سمت سرور هم آزاد شده است
+            if self.held:
+                self.log(f"⚠️ Scheduler lease lost: {e}")
+            self._discard()
+        return self.held
+
+    def release(self) -> None:
+        """آزاد کردن lease (در توقف scheduler) تا replica دیگری بلافاصله رهبر شود."""
+        if self._conn is not None and self.held:
+            try:
+                self._conn.scalar(select(func.pg_advisory_unlock(self.key)))
+                self._conn.close()
+                self._conn = None
+            except Exception:
+                pass
+        self._discard()
+
+    def _discard(self) -> None:
+        """اتصال را دور می‌اندازد (به استخر برنمی‌گردد تا قفل احتمالی همراهش نماند)."""
+        self.held = False
+        if self._conn is not None:
+            try:
+                self._conn.invalidate()
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
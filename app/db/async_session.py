@@ -0,0 +1,24 @@
+"""
+موتور و سشن غیرهمزمان (asyncpg) برای حالت DB_MODE=async.
+این ماژول فقط در حالت async ایمپورت می‌شود، چون ساخت موتور به asyncpg نیاز دارد.
+"""
+from typing import AsyncGenerator
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.db.pool import engine_options
+from app.db.session import database_url
+from app.metrics import instrument_engine
+
+# ایجاد موتور اتصال غیرهمزمان
+async_engine = create_async_engine(database_url("asyncpg"), **engine_options("asyncpg"))
+instrument_engine(async_engine.sync_engine)
+
+# expire_on_commit=False تا خواندن فیلدها بعد از commit باعث I/O پنهان (و خطای greenlet) نشود
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async dependency function for FastAPI.
+    Creates a new AsyncSession for each request and closes it afterwards.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from sqlalchemy.orm import DeclarativeBase
 
 class Base(DeclarativeBase):
@@ -5,4 +6,13 @@ class Base(DeclarativeBase):
     SQLAlchemy Base class.
     All database models (tables) should inherit from this class.
     """
-    pass
\ No newline at end of file
+    pass
+
+
+def utcnow() -> datetime:
+    """
+    زمان فعلی UTC با دقت میکروثانیه.
+    به عنوان default/onupdate ستون updated_at استفاده می‌شود تا روی UPDATEهای Core
+    (مثل autoclose) هم اعمال شود و دقتش به دیتابیس (مثلاً ثانیه در SQLite) وابسته نباشد.
+    """
+    return datetime.now(timezone.utc)
@@ -0,0 +1,26 @@
+"""ساخت دستورهای مخصوص دیالکت (مثل INSERT ... ON CONFLICT) بر اساس اتصال سشن."""
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# INSERT با ON CONFLICT مخصوص هر دیالکت
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def upsert_insert(db: Session, entity):
+    """INSERT دیالکت فعلی که on_conflict_do_nothing / on_conflict_do_update دارد."""
+    return _UPSERT_INSERTS[db.get_bind().dialect.name](entity)
+
+
+def sync_id_sequence(db: Session, entity) -> None:
+    """
+    بعد از درج ردیف با شناسه صریح (بازگردانی خروجی)، sequence ستون id را در PostgreSQL
+    به بیشترین id جدول می‌رساند تا درج‌های بعدی با شناسه‌های بازگردانده‌شده برخورد نکنند.
+    SQLite شناسه بعدی را خودش از max(id) می‌سازد.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    table = entity.__table__
+    max_id = func.max(table.c.id)
+    db.execute(select(func.setval(func.pg_get_serial_sequence(table.name, "id"),
+                                  func.coalesce(max_id, 1), max_id.is_not(None))).select_from(table))
@@ -0,0 +1,58 @@
+"""
+LISTEN روی یک کانال PostgreSQL با یک اتصال autocommit اختصاصی (خارج از استخر تراکنش‌ها).
+
+wait تا timeout ثانیه منتظر اعلان‌ها می‌ماند و payload آن‌ها را برمی‌گرداند. در دیتابیس
+غیر PostgreSQL (یا وقتی enabled خاموش است) فقط می‌خوابد؛ اگر اتصال قطع شود خطا لاگ
+و اتصال در فراخوانی بعدی دوباره ساخته می‌شود.
+"""
+import select
+import time
+from typing import Callable
+
+from sqlalchemy.engine import Engine
+
+
+class PgListener:
+    def __init__(self, engine: Engine, channel: str, log: Callable[[str], None] = print, enabled: bool = True):
+        self.engine = engine
+        self.channel = channel
+        self.log = log
+        self._raw = None
+        self.enabled = enabled and engine.dialect.name == "postgresql"
+
+    def _connect(self):
+        if self._raw is None:
+            self._raw = self.engine.raw_connection()
+            driver_conn = self._raw.driver_connection
+            driver_conn.autocommit = True
+            with driver_conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+        return self._raw.driver_connection
+
+    def wait(self, timeout: float) -> list[str]:
+        """payload اعلان‌های رسیده تا timeout ثانیه (لیست خالی یعنی اعلانی نبود)."""
+        if not self.enabled:
+            time.sleep(max(timeout, 0))
+            return []
+        try:
+            conn = self._connect()
+            if not conn.notifies:
+                select.select([conn], [], [], max(timeout, 0))
+                conn.poll()
+            payloads = [notify.payload for notify in conn.notifies]
+            conn.notifies.clear()
+            return payloads
+        except Exception as e:
+            # اتصال در دور بعد دوباره ساخته می‌شود
+            self.log(f"⚠️ Listener error on {self.channel}: {e}")
+            self.close()
+            time.sleep(min(max(timeout, 0), 5))
+            return []
+
+    def close(self) -> None:
+        if self._raw is not None:
+            try:
+                self._raw.invalidate()
+            except Exception:
+                pass
+            self._raw = None
@@ -0,0 +1,128 @@
+"""
+تنظیمات و آمار استخر اتصال (connection pool) دیتابیس.
+
+QueuePool پیش‌فرض SQLAlchemy هیچ آماری از زمان انتظار برای گرفتن اتصال نمی‌دهد.
+InstrumentedQueuePool زمان هر checkout را در یک هیستوگرام ثبت می‌کند و timeoutها را
+می‌شمارد؛ GET /api/admin/pool همین آمار را همراه با وضعیت لحظه‌ای استخر نشان می‌دهد.
+وقتی انتظار از DB_POOL_TIMEOUT بیشتر شود، TimeoutError بالا می‌رود و API آن را به
+503 با هدر Retry-After تبدیل می‌کند (به جای صف شدن thread‌ها).
+"""
+import bisect
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app import config
+
+# مرزهای بالای بازه‌های هیستوگرام زمان انتظار (میلی‌ثانیه)؛ بازه آخر بی‌نهایت است
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolWaitStats:
+    """شمارنده‌های checkout استخر (برای استفاده همزمان از چند thread امن است)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_ms_total = 0.0
+            self.wait_ms_max = 0.0
+            self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            self.buckets[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            labels = [f"<={bound}ms" for bound in WAIT_BUCKETS_MS] + [f">{WAIT_BUCKETS_MS[-1]}ms"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_ms_total / attempts, 3) if attempts else None,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+                "wait_histogram": dict(zip(labels, self.buckets)),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """زمان connect() (انتظار در صف + ساخت اتصال overflow + pre-ping) را ثبت می‌کند."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolWaitStats()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        self.stats.record((time.perf_counter() - started) * 1000)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() استخر را از نو می‌سازد؛ آمار تجمعی حفظ می‌شود
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(driver: str = "psycopg2") -> dict:
+    """
+    آرگومان‌های create_engine بر اساس تنظیمات DB_POOL_*.
+    statement_timeout سمت سرور PostgreSQL است و برای هر درایور به شکل خودش ارسال می‌شود.
+    """
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if driver == "asyncpg" else InstrumentedQueuePool,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+    if config.DB_STATEMENT_TIMEOUT_MS > 0:
+        if driver == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def pool_status(engine) -> dict:
+    """وضعیت لحظه‌ای استخر یک موتور همراه با آمار انتظار."""
+    pool = engine.pool
+    status = {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "timeout_seconds": config.DB_POOL_TIMEOUT,
+    }
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.to_dict())
+    return status
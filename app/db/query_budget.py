@@ -0,0 +1,206 @@
+"""
+شمارش کوئری‌ها، سقف کوئری (query budget) و تشخیص N+1 برای توسعه و تست.
+
+هر دستور SQL به یک fingerprint تبدیل می‌شود (مقادیر و placeholderها با ? جایگزین
+و لیست‌های IN جمع می‌شوند). اگر یک fingerprint چند بار با پارامترهای مختلف اجرا شود،
+به احتمال زیاد یک حلقه N+1 است.
+
+در تست:
+    with query_budget(3):
+        client.get("/api/tasks/")
+
+    @query_budget(2)
+    def test_get_task(): ...
+
+در توسعه: با QUERY_DEBUG=true هر درخواست API شمرده می‌شود، هدر X-Query-Count
+برمی‌گردد و عبور از QUERY_BUDGET یا الگوی N+1 در لاگ هشدار داده می‌شود.
+"""
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import ContextDecorator, contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app import config
+from app.exceptions.base import QueryBudgetExceededError
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|:\w+|\?")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """شکل کلی یک دستور SQL، مستقل از مقدار پارامترها و طول لیست IN."""
+    text = _STRING.sub("?", statement)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _IN_LIST.sub("(?...)", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+class QueryTracker:
+    """دستورات SQL اجراشده در یک بازه (درخواست، فراخوانی سرویس یا بلوک تست)."""
+
+    def __init__(self, name: str | None = None):
+        self.name = name
+        self.statements: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, parameters) -> None:
+        with self._lock:
+            self.statements.append((fingerprint(statement), repr(parameters)))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def by_fingerprint(self) -> Counter:
+        return Counter(fp for fp, _ in self.statements)
+
+    def repeated(self, threshold: int | None = None) -> list[tuple[str, int]]:
+        """fingerprintهایی که حداقل threshold بار با پارامترهای متفاوت اجرا شده‌اند (کاندید N+1)."""
+        threshold = threshold or config.N_PLUS_ONE_THRESHOLD
+        distinct: dict[str, set] = {}
+        for fp, params in self.statements:
+            distinct.setdefault(fp, set()).add(params)
+        return sorted(
+            ((fp, len(params)) for fp, params in distinct.items() if len(params) >= threshold),
+            key=lambda item: -item[1],
+        )
+
+    def summary(self, limit: int = 10) -> str:
+        lines = [f"{self.count} quer{'y' if self.count == 1 else 'ies'}" + (f" in {self.name}" if self.name else "")]
+        for fp, count in self.by_fingerprint().most_common(limit):
+            lines.append(f"  {count:>4} x {fp}")
+        return "\n".join(lines)
+
+
+# ردیاب بازه جاری (مثلاً درخواست) از طریق ContextVar؛ ردیاب‌های سراسری همه threadها را می‌بینند،
+# چون TestClient برنامه را در thread دیگری اجرا می‌کند
+_context_tracker: ContextVar[QueryTracker | None] = ContextVar("query_tracker", default=None)
+_global_trackers: list[QueryTracker] = []
+_listening = False
+_listen_lock = threading.Lock()
+
+
+def _on_execute(conn, cursor, statement, parameters, context, executemany):
+    tracker = _context_tracker.get()
+    if tracker is not None:
+        tracker.record(statement, parameters)
+    for tracker in _global_trackers:
+        tracker.record(statement, parameters)
+
+
+def enable() -> None:
+    """listener را روی کلاس Engine (همه موتورها، sync و async) نصب می‌کند؛ فقط بار اول اثر دارد."""
+    global _listening
+    with _listen_lock:
+        if not _listening:
+            event.listen(Engine, "before_cursor_execute", _on_execute)
+            _listening = True
+
+
+@contextmanager
+def track_queries(name: str | None = None, all_threads: bool = True) -> Iterator[QueryTracker]:
+    """
+    کوئری‌های داخل بلوک را ثبت می‌کند.
+    all_threads=True (پیش‌فرض، برای تست) کوئری همه threadها را می‌شمارد؛
+    all_threads=False فقط کوئری‌های همین context (مثل یک درخواست) را.
+    """
+    enable()
+    tracker = QueryTracker(name)
+    if all_threads:
+        _global_trackers.append(tracker)
+        try:
+            yield tracker
+        finally:
+            _global_trackers.remove(tracker)
+    else:
+        token = _context_tracker.set(tracker)
+        try:
+            yield tracker
+        finally:
+            _context_tracker.reset(token)
+
+
+class query_budget(ContextDecorator):
+    """
+    اگر کوئری‌های بلوک (یا تابع) از max_queries بیشتر شود یا الگوی N+1 دیده شود،
+    QueryBudgetExceededError می‌دهد. با allow_repeats=True فقط تعداد بررسی می‌شود.
+    """
+
+    def __init__(self, max_queries: int, name: str | None = None, allow_repeats: bool = False,
+                 threshold: int | None = None):
+        self.max_queries = max_queries
+        self.name = name
+        self.allow_repeats = allow_repeats
+        self.threshold = threshold
+        self.tracker: QueryTracker | None = None
+        self._cm = None
+
+    def __enter__(self) -> QueryTracker:
+        self._cm = track_queries(self.name)
+        self.tracker = self._cm.__enter__()
+        return self.tracker
+
+    def __exit__(self, *exc_info):
+        self._cm.__exit__(*exc_info)
+        if exc_info[0] is not None:
+            return False
+        tracker = self.tracker
+        if tracker.count > self.max_queries:
+            raise QueryBudgetExceededError(
+                f"Query budget exceeded: {tracker.count} > {self.max_queries}\n{tracker.summary()}"
+            )
+        repeated = [] if self.allow_repeats else tracker.repeated(self.threshold)
+        if repeated:
+            detail = "\n".join(f"  {count:>4} x {fp}" for fp, count in repeated)
+            raise QueryBudgetExceededError(f"Possible N+1 query pattern:\n{detail}")
+        return False
+
+
+class QueryDebugMiddleware:
+    """
+    میان‌افزار ASGI حالت توسعه (QUERY_DEBUG): کوئری‌های هر درخواست را می‌شمارد،
+    X-Query-Count را به پاسخ اضافه و عبور از بودجه یا N+1 را لاگ می‌کند.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        enable()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(f"{scope['method']} {scope['path']}", all_threads=False) as tracker:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((QUERY_COUNT_HEADER.lower().encode(), str(tracker.count).encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        _report(tracker)
+
+
+def _report(tracker: QueryTracker) -> None:
+    if config.QUERY_BUDGET and tracker.count > config.QUERY_BUDGET:
+        logger.warning("Query budget %d exceeded: %s", config.QUERY_BUDGET, tracker.summary())
+    for fp, count in tracker.repeated():
+        logger.warning("Possible N+1 in %s: %d x %s", tracker.name, count, fp)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(tracker.summary())
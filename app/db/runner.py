@@ -0,0 +1,59 @@
+"""
+اجرای سرویس‌ها روی سشن دیتابیس بدون مسدود کردن event loop.
+
+سرویس‌ها و ریپازیتوری‌ها کد همزمان (sync) هستند. کنترلرهای async آن‌ها را از طریق
+SessionRunner صدا می‌زنند:
+- حالت sync: سرویس در threadpool و روی Session معمولی (psycopg2) اجرا می‌شود.
+- حالت async: سرویس با AsyncSession.run_sync روی اتصال asyncpg اجرا می‌شود؛
+  هر کوئری داخل greenlet به event loop برمی‌گردد و هیچ thread اشغال نمی‌شود.
+"""
+from abc import ABC, abstractmethod
+from typing import AsyncGenerator, Callable, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+from app import config
+from app.db import session as db_session
+
+T = TypeVar("T")
+
+
+class SessionRunner(ABC):
+    """پایه مشترک: یک تابع سرویس با امضای fn(db, *args) را اجرا می‌کند."""
+
+    @abstractmethod
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """fn(db, *args, **kwargs) را روی سشن این runner اجرا می‌کند و نتیجه‌اش را برمی‌گرداند."""
+
+
+class ThreadpoolSessionRunner(SessionRunner):
+    def __init__(self, db):
+        self.db = db
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        return await run_in_threadpool(fn, self.db, *args, **kwargs)
+
+
+class AsyncSessionRunner(SessionRunner):
+    def __init__(self, db):
+        self.db = db
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        return await self.db.run_sync(fn, *args, **kwargs)
+
+
+async def get_runner() -> AsyncGenerator[SessionRunner, None]:
+    """
+    Dependency function for FastAPI.
+    Yields a SessionRunner bound to a new session; DB_MODE picks the sync or async engine.
+    """
+    if config.DB_MODE == "async":
+        from app.db.async_session import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            yield AsyncSessionRunner(db)
+    else:
+        db = db_session.SessionLocal()
+        try:
+            yield ThreadpoolSessionRunner(db)
+        finally:
+            await run_in_threadpool(db.close)
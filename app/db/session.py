@@ -1,27 +1,46 @@
-import os
-from dotenv import load_dotenv
+"""
+موتور و سشن دیتابیس (psycopg2).
+
+ایمپورت این ماژول اتصالی نمی‌سازد و درایور را بارگذاری نمی‌کند: موتور در اولین استفاده
+(get_engine یا اولین SessionLocal()) ساخته و کش می‌شود، پس دستورهایی که به دیتابیس
+نمی‌رسند (مثل --help) هزینه ساخت موتور را نمی‌دهند.
+"""
+from functools import lru_cache
+from typing import Generator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from app import config
+from app.db.pool import engine_options
+from app.metrics import instrument_engine
+
+
+def database_url(driver: str = "psycopg2") -> str:
+    """آدرس اتصال (Connection String) از تنظیمات DB_*؛ driver برای حالت async همان asyncpg است."""
+    return (f"postgresql+{driver}://{config.DB_USER}:{config.DB_PASSWORD}"
+            f"@{config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}")
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """موتور اتصال (تنظیمات استخر از DB_POOL_* در app.config)؛ یک بار ساخته می‌شود."""
+    engine = create_engine(database_url(), **engine_options("psycopg2"))
+    instrument_engine(engine)
+    return engine
 
-# بارگذاری متغیرها از فایل .env
-load_dotenv()
 
-# خواندن اطلاعات اتصال با مقادیر پیش‌فرض ایمن
-DB_USER = os.getenv("DB_USER", "postgres")
-DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = os.getenv("DB_PORT", "5432")
-DB_NAME = os.getenv("DB_NAME", "todolist_db")
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker که اگر bind صریح نداشته باشد، در اولین سشن به get_engine() وصل می‌شود."""
 
-# ساخت آدرس اتصال (Connection String)
-SQLALCHEMY_DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
 
-# ایجاد موتور اتصال به دیتابیس
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
-# ساخت کارخانه سشن‌ها (برای ساخت ارتباط در هر درخواست)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# کارخانه سشن‌ها (برای ساخت ارتباط در هر درخواست)؛ configure(bind=...) موتور دیگری را جایگزین می‌کند
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
 
 def get_db() -> Generator:
     """
@@ -32,4 +51,4 @@ def get_db() -> Generator:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
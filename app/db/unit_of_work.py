@@ -0,0 +1,87 @@
+"""
+Unit of Work: چند عملیات نوشتن سرویس در یک تراکنش.
+
+ریپازیتوری‌ها دیگر commit نمی‌کنند؛ فقط دستور SQL (معمولاً با RETURNING) اجرا می‌کنند.
+سرویس نوشتن‌ها را داخل unit_of_work می‌گذارد و در پایان بلوک یک commit انجام می‌شود
+(یا در صورت خطا rollback). کارهای بعد از commit مثل به‌روزرسانی کش با on_commit
+ثبت می‌شوند تا فقط وقتی داده واقعاً ثبت شده اجرا شوند. نوشتن‌هایی که باید آخرین دستور
+تراکنش باشند (مثل لاگ تغییرات) با before_commit ثبت می‌شوند.
+
+    with unit_of_work(db) as uow:
+        project = repo.create_project(...)
+        uow.on_commit(entity_cache.put, project_key(project.id), project)
+
+بلوک‌های تو در تو به تراکنش بیرونی می‌پیوندند؛ پس یک سرویس می‌تواند سرویس دیگری را
+که خودش unit_of_work دارد داخل تراکنش خودش صدا بزند.
+"""
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session
+
+_SESSION_KEY = "unit_of_work"
+
+
+class UnitOfWork:
+    def __init__(self, db: Session):
+        self.db = db
+        self._outer: "UnitOfWork | None" = None
+        self._callbacks: list[tuple[Callable, tuple]] = []
+        self._before_commit: list[tuple[Callable, tuple]] = []
+        self._rollback_only = False
+
+    def __enter__(self) -> "UnitOfWork":
+        outer = self.db.info.get(_SESSION_KEY)
+        if outer is not None:
+            self._outer = outer
+            return outer
+        self.db.info[_SESSION_KEY] = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._outer is not None:
+            return False
+        del self.db.info[_SESSION_KEY]
+        if exc_type is not None or self._rollback_only:
+            self._discard()
+            return False
+        try:
+            hooks, self._before_commit = self._before_commit, []
+            for fn, args in hooks:
+                fn(*args)
+        except BaseException:
+            self._discard()
+            raise
+
+        # مقادیر آبجکت‌ها از RETURNING آمده‌اند؛ expire بعد از commit فقط SELECT اضافه (refresh) می‌سازد
+        expire_on_commit = self.db.expire_on_commit
+        self.db.expire_on_commit = False
+        try:
+            self.db.commit()
+        finally:
+            self.db.expire_on_commit = expire_on_commit
+
+        callbacks, self._callbacks = self._callbacks, []
+        for fn, args in callbacks:
+            fn(*args)
+        return False
+
+    def _discard(self) -> None:
+        self.db.rollback()
+        self._callbacks.clear()
+        self._before_commit.clear()
+
+    def on_commit(self, fn: Callable[..., Any], *args) -> None:
+        """fn(*args) را بعد از commit موفق اجرا می‌کند (با rollback دور ریخته می‌شود)."""
+        self._callbacks.append((fn, args))
+
+    def before_commit(self, fn: Callable[..., Any], *args) -> None:
+        """fn(*args) را داخل تراکنش و درست قبل از commit اجرا می‌کند؛ خطای آن کل تراکنش را rollback می‌کند."""
+        self._before_commit.append((fn, args))
+
+    def rollback(self) -> None:
+        """بدون خطا، کل تراکنش را در پایان بلوک rollback می‌کند (مثلاً شکست حالت atomic)."""
+        self._rollback_only = True
+
+
+def unit_of_work(db: Session) -> UnitOfWork:
+    return UnitOfWork(db)
@@ -0,0 +1,2 @@
+from .broadcaster import RESYNC_EVENT, Broadcaster, Subscription, broadcaster
+from .publisher import EVENT_BACKENDS, EVENTS_CHANNEL, PgEventRelay, build_events, publish_on_commit, uses_postgres
@@ -0,0 +1,86 @@
+"""
+پخش رویدادهای تغییر پروژه و تسک به مشترک‌های زنده (SSE / WebSocket) در همین پردازه.
+
+سرویس‌ها بعد از commit رویدادها را publish می‌کنند (از thread استخر یا خود event loop)؛
+تحویل همیشه با call_soon_threadsafe روی event loop انجام می‌شود، پس مجموعه مشترک‌ها فقط
+در یک thread لمس می‌شود. هر مشترک صف محدود خودش را دارد: اگر مصرف‌کننده کند باشد و صف
+پر شود، رویدادهای در صف دور ریخته و یک رویداد resync جایگزین می‌شود تا کلاینت وضعیت را
+(مثلاً با GET /api/changes) دوباره بخواند؛ یک کلاینت کند حافظه یا انتشار را نگه نمی‌دارد.
+"""
+import asyncio
+from typing import Iterable
+
+RESYNC_EVENT = {"type": "resync"}
+
+
+class Subscription:
+    def __init__(self, project_id: int | None, max_queue: int):
+        self.project_id = project_id
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue)
+        self.overflows = 0
+
+    def matches(self, event: dict) -> bool:
+        return self.project_id is None or event.get("project_id") == self.project_id
+
+    def offer(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # مصرف‌کننده عقب مانده است؛ به جای نگه داشتن همه رویدادها فقط resync می‌فرستیم
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+            self.overflows += 1
+
+    async def next(self, timeout: float) -> dict | None:
+        """رویداد بعدی، یا None اگر تا timeout ثانیه چیزی نرسید (زمان heartbeat)."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broadcaster:
+    def __init__(self):
+        self._subscriptions: set[Subscription] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.published = 0
+        self.overflows = 0
+
+    def subscribe(self, project_id: int | None, max_queue: int) -> Subscription:
+        """مشترک جدید (روی event loop صدا زده می‌شود)."""
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(project_id, max_queue)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+        self.overflows += subscription.overflows
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, events: Iterable[dict]) -> None:
+        """ارسال رویدادها به مشترک‌های منطبق؛ از هر thread قابل صدا زدن است و منتظر نمی‌ماند."""
+        if not self._subscriptions or self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._deliver, list(events))
+
+    def _deliver(self, events: list[dict]) -> None:
+        self.published += len(events)
+        for subscription in list(self._subscriptions):
+            for event in events:
+                if subscription.matches(event):
+                    subscription.offer(event)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscribers,
+            "published": self.published,
+            "overflows": self.overflows + sum(s.overflows for s in self._subscriptions),
+        }
+
+
+broadcaster = Broadcaster()
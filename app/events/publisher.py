@@ -0,0 +1,81 @@
+"""
+ساخت رویدادهای تغییر در سرویس‌ها و رساندن آن‌ها به broadcaster.
+
+- EVENTS_BACKEND=local: رویدادها بعد از commit به broadcaster همین پردازه داده می‌شوند.
+- EVENTS_BACKEND=postgres: رویدادها داخل همان تراکنش با pg_notify روی EVENTS_CHANNEL
+  فرستاده می‌شوند (PostgreSQL فقط با commit تحویل می‌دهد). هر worker API با PgEventRelay
+  گوش می‌دهد، پس نوشتن‌های workerهای دیگر، CLI و scheduler هم به همه مشترک‌ها می‌رسد.
+"""
+import json
+import threading
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from app import config
+from app.db.pg_listener import PgListener
+from app.db.unit_of_work import UnitOfWork
+from app.events.broadcaster import broadcaster
+
+EVENT_BACKENDS = ("local", "postgres")
+EVENTS_CHANNEL = "entity_events"
+# حداکثر شناسه در یک رویداد؛ payload هر NOTIFY باید زیر 8000 بایت بماند
+MAX_IDS_PER_EVENT = 500
+
+
+def build_events(entity: str, op: str, changes: Iterable[tuple[int, int]]) -> list[dict]:
+    """رویدادهای یک نوع تغییر، یکی برای هر پروژه؛ changes جفت‌های (شناسه، شناسه پروژه) است."""
+    by_project = defaultdict(list)
+    for entity_id, project_id in changes:
+        by_project[project_id].append(entity_id)
+    return [
+        {"type": "change", "entity": entity, "op": op, "project_id": project_id,
+         "ids": ids[start:start + MAX_IDS_PER_EVENT]}
+        for project_id, ids in by_project.items()
+        for start in range(0, len(ids), MAX_IDS_PER_EVENT)
+    ]
+
+
+def uses_postgres(engine: Engine) -> bool:
+    return config.EVENTS_BACKEND == "postgres" and engine.dialect.name == "postgresql"
+
+
+def publish_on_commit(uow: UnitOfWork, events: list[dict]) -> None:
+    """رویدادها فقط اگر تراکنش uow commit شود منتشر می‌شوند."""
+    if not events or not config.EVENTS_ENABLED:
+        return
+    if uses_postgres(uow.db.get_bind()):
+        uow.before_commit(_notify, uow.db, events)
+    else:
+        uow.on_commit(broadcaster.publish, events)
+
+
+def _notify(db, events: list[dict]) -> None:
+    for event in events:
+        db.execute(select(func.pg_notify(EVENTS_CHANNEL, json.dumps(event, separators=(",", ":")))))
+
+
+class PgEventRelay:
+    """thread پس‌زمینه API: اعلان‌های EVENTS_CHANNEL را می‌خواند و به broadcaster همین پردازه می‌دهد."""
+
+    def __init__(self, engine: Engine, log=print):
+        self.listener = PgListener(engine, EVENTS_CHANNEL, log)
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="event-relay", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            payloads = self.listener.wait(1.0)
+            if payloads:
+                broadcaster.publish(json.loads(payload) for payload in payloads)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.listener.close()
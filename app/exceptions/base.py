@@ -7,9 +7,10 @@ class AppException(Exception):
     pass
 
 
-class ProjectNotFoundError(AppException):
+class ProjectNotFoundError(AppException, ValueError):
     """
     خطایی که زمانی رخ می‌دهد که پروژه‌ای با شناسه مورد نظر پیدا نشود.
+    از ValueError هم ارث می‌برد تا کنترلرها مثل خطای «پروژه پیدا نشد» سرویس‌ها با آن رفتار کنند.
     """
     pass
 
@@ -18,4 +19,20 @@ class TaskNotFoundError(AppException):
     """
     خطایی که زمانی رخ می‌دهد که تسکی با شناسه مورد نظر پیدا نشود.
     """
-    pass
\ No newline at end of file
+    pass
+
+
+class QuotaExceededError(AppException, ValueError):
+    """
+    خطایی که زمانی رخ می‌دهد که سقف تعداد پروژه‌ها یا تسک‌های یک پروژه پر شده باشد.
+    از ValueError هم ارث می‌برد تا با خطاهای اعتبارسنجی سرویس‌ها سازگار بماند.
+    """
+    pass
+
+
+class QueryBudgetExceededError(AppException, AssertionError):
+    """
+    خطایی که زمانی رخ می‌دهد که یک بلوک query_budget بیش از سقف مجاز کوئری بزند
+    یا الگوی N+1 در آن دیده شود. از AssertionError ارث می‌برد تا در تست‌ها شکست حساب شود.
+    """
+    pass
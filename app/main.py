@@ -1,14 +1,71 @@
-from fastapi import FastAPI
-from app.api.controllers import project_controller, task_controller
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app import config
+from app.api.background import run_periodically
+from app.api.idempotency import IdempotencyMiddleware
+from app.api.controllers import admin_controller, change_controller, event_controller, project_controller, task_controller
+from app.db.session import get_engine
+from app.db.query_budget import QueryDebugMiddleware
+from app.events import EVENT_BACKENDS, PgEventRelay, uses_postgres
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.services import change_feed_service, idempotency_service
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # کارهای نگهداری در پس‌زمینه: حذف کلیدهای idempotency منقضی و فشرده‌سازی فید تغییرات
+    jobs = []
+    if config.IDEMPOTENCY_ENABLED and config.IDEMPOTENCY_GC_INTERVAL_SECONDS > 0:
+        jobs.append(run_periodically(config.IDEMPOTENCY_GC_INTERVAL_SECONDS, idempotency_service.purge_expired,
+                                     "Purged expired idempotency keys"))
+    if config.CHANGE_FEED_COMPACT_INTERVAL_SECONDS > 0:
+        jobs.append(run_periodically(config.CHANGE_FEED_COMPACT_INTERVAL_SECONDS, change_feed_service.compact,
+                                     "Compacted change log"))
+    tasks = [asyncio.create_task(job) for job in jobs]
+
+    # رویدادهای زنده بین workerها: اعلان‌های PostgreSQL به broadcaster همین پردازه می‌رسند
+    if config.EVENTS_BACKEND not in EVENT_BACKENDS:
+        raise ValueError(f"Invalid EVENTS_BACKEND: {config.EVENTS_BACKEND!r} (expected one of {', '.join(EVENT_BACKENDS)}).")
+    relay = None
+    if config.EVENTS_ENABLED and config.EVENTS_BACKEND == "postgres" and uses_postgres(get_engine()):
+        relay = PgEventRelay(get_engine())
+        relay.start()
+    yield
+    for task in tasks:
+        task.cancel()
+    if relay is not None:
+        relay.stop()
+
 
 app = FastAPI(
     title="ToDo List API",
     description="A simple ToDo List API developed for Software Engineering Course (Phase 3)",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+# داخلی‌ترین میان‌افزار: پاسخ بازپخش‌شده هم در متریک‌ها و شمارش کوئری دیده می‌شود
+if config.IDEMPOTENCY_ENABLED:
+    app.add_middleware(IdempotencyMiddleware)
+if config.QUERY_DEBUG:
+    app.add_middleware(QueryDebugMiddleware)
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # اتصال آزاد در مهلت DB_POOL_TIMEOUT پیدا نشد؛ به جای صف کردن درخواست‌ها سریع 503 می‌دهیم
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database is busy, please retry shortly."},
+        headers={"Retry-After": str(config.DB_POOL_RETRY_AFTER)},
+    )
+
 
 app.include_router(
     project_controller.router,
@@ -22,6 +79,29 @@ app.include_router(
     tags=["Tasks"]           # در سواگر زیر دسته Tasks قرار می‌گیرند
 )
 
+app.include_router(
+    change_controller.router,
+    prefix="/api/changes",
+    tags=["Changes"]
+)
+
+app.include_router(
+    event_controller.router,
+    prefix="/api/events",
+    tags=["Events"]
+)
+
+app.include_router(
+    admin_controller.router,
+    prefix="/api/admin",
+    tags=["Admin"]
+)
+
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to ToDo List API! Go to /docs to see the API documentation."}
\ No newline at end of file
+    return {"message": "Welcome to ToDo List API! Go to /docs to see the API documentation."}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text exposition of request, query and job metrics (empty when METRICS_ENABLED=false)."""
+    return Response(content=registry.render() if registry.enabled else "", media_type=CONTENT_TYPE)
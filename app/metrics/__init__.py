@@ -0,0 +1,9 @@
+from .registry import Counter, Gauge, Histogram, Registry
+from .instrumentation import (
+    CONTENT_TYPE,
+    MetricsMiddleware,
+    instrument_engine,
+    record_autoclose,
+    registry,
+    serve_metrics,
+)
@@ -0,0 +1,126 @@
+"""
+اندازه‌گیری درخواست‌های HTTP، کوئری‌های دیتابیس و job autoclose.
+
+- MetricsMiddleware یک میان‌افزار ASGI خام است (بدون BaseHTTPMiddleware) که تأخیر را
+  به ازای قالب مسیر (مثل /api/tasks/{task_id})، متد و کد وضعیت ثبت می‌کند.
+- رویدادهای before/after_cursor_execute موتور، تعداد و مدت کوئری‌ها را به ازای همان
+  قالب مسیر ثبت می‌کنند. scope درخواست جاری در یک ContextVar است که به threadpool
+  و greenletهای AsyncSession هم منتقل می‌شود. کوئری‌های بیرون از درخواست (CLI، jobها)
+  با route="none" ثبت می‌شوند.
+"""
+import time
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from sqlalchemy import event
+from app import config
+from app.metrics.registry import Registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = Registry(enabled=config.METRICS_ENABLED)
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status"))
+REQUESTS_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served.", ("method",))
+DB_QUERIES = registry.counter(
+    "db_queries_total", "SQL statements executed, by route template.", ("route",))
+DB_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds", "SQL statement execution time, by route template.", ("route",))
+AUTOCLOSE_RUNS = registry.counter(
+    "autoclose_runs_total", "Auto-close job runs.", ("dry_run",))
+AUTOCLOSE_ROWS = registry.counter(
+    "autoclose_rows_total", "Overdue tasks closed (or found, in dry runs) by the auto-close job.", ("dry_run",))
+AUTOCLOSE_DURATION = registry.histogram(
+    "autoclose_duration_seconds", "Auto-close job run time.", ("dry_run",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0))
+
+_current_scope: ContextVar[dict | None] = ContextVar("metrics_scope", default=None)
+
+
+def route_label(scope: dict | None) -> str:
+    """قالب مسیر درخواست؛ مسیرهای ناشناخته (404) همه یک برچسب دارند تا تعداد سری‌ها محدود بماند."""
+    if scope is None:
+        return "none"
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        token = _current_scope.set(scope)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_DURATION.observe(method, route_label(scope), status_code, value=time.perf_counter() - started)
+            REQUESTS_IN_PROGRESS.dec(method)
+            _current_scope.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_metrics_started", None)
+    route = route_label(_current_scope.get())
+    DB_QUERIES.inc(route)
+    if started is not None:
+        DB_QUERY_DURATION.observe(route, value=time.perf_counter() - started)
+
+
+def instrument_engine(engine) -> None:
+    """رویدادهای شمارش و زمان‌سنجی کوئری را روی یک موتور (sync یا sync_engine موتور async) نصب می‌کند."""
+    if registry.enabled and not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def record_autoclose(dry_run: bool, rows: int, elapsed_seconds: float) -> None:
+    label = "true" if dry_run else "false"
+    AUTOCLOSE_RUNS.inc(label)
+    AUTOCLOSE_ROWS.inc(label, amount=rows)
+    AUTOCLOSE_DURATION.observe(label, value=elapsed_seconds)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int) -> ThreadingHTTPServer:
+    """
+    یک سرور HTTP کوچک در thread پس‌زمینه که متریک‌های این پردازه را برمی‌گرداند؛
+    برای پردازه‌هایی که API ندارند (مثل scheduler).
+    """
+    server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,32 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from app.db.base import Base, utcnow
+
+
+class ChangeLogEntry(Base):
+    """
+    یک تغییر پروژه یا تسک برای فید تغییرات (GET /api/changes).
+    سرویس‌ها ردیف را در همان تراکنش نوشتن اضافه می‌کنند؛ id ترتیب یکنواخت تغییرات و
+    پایه کرسر کلاینت‌هاست و حذف‌ها به صورت tombstone (op=deleted) می‌مانند.
+    """
+    __tablename__ = "change_log"
+    __table_args__ = (
+        # فشرده‌سازی: پیدا کردن تغییرات جدیدتر همان موجودیت
+        Index("ix_change_log_entity", "entity", "entity_id", "id"),
+    )
+
+    PROJECT = "project"
+    TASK = "task"
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+    # در SQLite فقط INTEGER PRIMARY KEY خودافزاینده است
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity = Column(String(16), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(16), nullable=False)
+    changed_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, index=True)
+
+    def __repr__(self):
+        return f"<ChangeLogEntry(id={self.id}, {self.entity}:{self.entity_id} {self.op})>"
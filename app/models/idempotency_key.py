@@ -0,0 +1,28 @@
+from sqlalchemy import JSON, Column, DateTime, Integer, LargeBinary, String
+from app.db.base import Base, utcnow
+
+
+class IdempotencyKey(Base):
+    """
+    پاسخ ذخیره‌شده یک درخواست POST با هدر Idempotency-Key.
+    ردیف با وضعیت in_progress ادعا (claim) می‌شود تا فقط یک درخواست همزمان اجرا شود
+    و بعد از پایان، پاسخ برای تکرارهای بعدی تا expires_at نگه داشته می‌شود.
+    """
+    __tablename__ = "idempotency_keys"
+
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+
+    key = Column(String(255), primary_key=True)
+    # hash متد، مسیر و بدنه درخواست؛ همان کلید با درخواست متفاوت رد می‌شود
+    fingerprint = Column(String(64), nullable=False)
+    status = Column(String(16), nullable=False, default=IN_PROGRESS)
+    status_code = Column(Integer, nullable=True)
+    response_headers = Column(JSON, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    # زمان ادعا؛ ادعای in_progress قدیمی‌تر از IDEMPOTENCY_LOCK_TIMEOUT_SECONDS رها‌شده حساب می‌شود
+    locked_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key='{self.key}', status='{self.status}')>"
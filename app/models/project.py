@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.db.base import Base
+from app.db.base import Base, utcnow
 
 class Project(Base):
     __tablename__ = "projects"
@@ -10,6 +10,11 @@ class Project(Base):
     name = Column(String(50), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # برای ETag و درخواست‌های شرطی؛ با هر UPDATE به‌روز می‌شود
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow,
+                        server_default=func.now(), nullable=False, index=True)
+    # شمارنده تسک‌ها برای بررسی سقف در زمان ثابت (در همان تراکنش درج/حذف تسک به‌روز می‌شود)
+    task_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # ارتباط با تسک‌ها
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
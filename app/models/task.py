@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, Date, DateTime
+from sqlalchemy import DDL, Column, Integer, String, Text, ForeignKey, Enum, Date, DateTime, Index, event, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.db.base import Base
+from app.db.base import Base, utcnow
 import enum
 
 class TaskStatus(str, enum.Enum):
@@ -11,6 +11,18 @@ class TaskStatus(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # ایندکس جزئی: فقط تسک‌های باز، تا autoclose فقط ردیف‌های کاندید را اسکن کند
+        Index(
+            "ix_tasks_overdue_candidates", "deadline",
+            postgresql_where=text("status <> 'DONE'"),
+            sqlite_where=text("status <> 'DONE'"),
+        ),
+        # ایندکس‌های ترکیبی برای فیلترهای GET /api/tasks و تسک‌های یک پروژه
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        Index("ix_tasks_status_deadline", "status", "deadline"),
+        Index("ix_tasks_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
@@ -18,9 +30,41 @@ class Task(Base):
     status = Column(Enum(TaskStatus), default=TaskStatus.TODO)
     deadline = Column(Date, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now()) 
+    # برای ETag و درخواست‌های شرطی؛ با هر UPDATE (ORM یا Core) به‌روز می‌شود
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow,
+                        server_default=func.now(), nullable=False, index=True)
     
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     project = relationship("Project", back_populates="tasks")
 
     def __repr__(self):
-        return f"<Task(id={self.id}, title='{self.title}')>"
\ No newline at end of file
+        return f"<Task(id={self.id}, title='{self.title}')>"
+
+
+# جست‌وجوی متنی: در PostgreSQL ستون تولیدشده search_vector با ایندکس GIN (مایگریشن 9b1f6c2d7e41؛
+# create_all در تست‌ها همان ستون و ایندکس را با TASKS_SEARCH_VECTOR_DDL می‌سازد).
+# در SQLite (اجرای محلی و تست با create_all) یک جدول FTS5 هم‌محتوا با تریگر همگام نگه داشته می‌شود.
+TASKS_SEARCH_VECTOR_DDL = (
+    "ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)",
+)
+
+TASKS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+)
+
+for _statement in TASKS_SEARCH_VECTOR_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in TASKS_FTS_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Task.__table__, "after_drop", DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"))
@@ -0,0 +1,57 @@
+from datetime import datetime
+from sqlalchemy import delete, exists, func, insert, select
+from sqlalchemy.orm import Session, aliased
+from app.db.base import utcnow
+from app.models.change_log import ChangeLogEntry
+
+CHANGE_COLUMNS = (ChangeLogEntry.id, ChangeLogEntry.entity, ChangeLogEntry.entity_id,
+                  ChangeLogEntry.op, ChangeLogEntry.changed_at)
+
+class ChangeLogRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def append(self, rows: list[dict], lock_key: int) -> None:
+        """
+        درج تغییرات با یک INSERT چندردیفی (commit با unit of work سرویس است).
+        در PostgreSQL اول pg_advisory_xact_lock گرفته می‌شود تا id ها به ترتیب commit تخصیص
+        یابند: قفل تا پایان تراکنش می‌ماند، پس نویسنده بعدی id بزرگ‌تر را فقط بعد از commit
+        این تراکنش می‌گیرد و خواننده هرگز id کوچک‌تری را بعد از دیدن id بزرگ‌تر نمی‌بیند.
+        """
+        if not rows:
+            return
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(select(func.pg_advisory_xact_lock(lock_key)))
+        now = utcnow()
+        self.db.execute(insert(ChangeLogEntry).values([{**row, "changed_at": now} for row in rows]))
+
+    def get_head(self) -> int:
+        """بزرگ‌ترین id ثبت‌شده (0 اگر لاگ خالی است)."""
+        return self.db.scalar(select(func.coalesce(func.max(ChangeLogEntry.id), 0)))
+
+    def get_page(self, after_id: int, limit: int) -> list:
+        """تغییرات بعد از after_id به ترتیب id (keyset روی کلید اصلی)."""
+        stmt = select(*CHANGE_COLUMNS).where(ChangeLogEntry.id > after_id).order_by(ChangeLogEntry.id).limit(limit)
+        return self.db.execute(stmt).all()
+
+    def delete_older_than(self, cutoff: datetime, limit: int) -> int:
+        """حذف حداکثر limit تغییر قدیمی‌تر از cutoff (روی ایندکس changed_at)."""
+        old = select(ChangeLogEntry.id).where(ChangeLogEntry.changed_at < cutoff).limit(limit)
+        stmt = delete(ChangeLogEntry).where(ChangeLogEntry.id.in_(old.scalar_subquery()))
+        return self.db.execute(stmt, execution_options={"synchronize_session": False}).rowcount
+
+    def delete_superseded(self, limit: int) -> int:
+        """
+        حذف حداکثر limit تغییری که برای همان موجودیت تغییر جدیدتری دارد. کلاینت فقط آخرین
+        وضعیت هر موجودیت را لازم دارد، پس این حذف برای هیچ کرسری چیزی را گم نمی‌کند.
+        """
+        newer = aliased(ChangeLogEntry)
+        superseded = (
+            select(ChangeLogEntry.id)
+            .where(exists().where(newer.entity == ChangeLogEntry.entity,
+                                  newer.entity_id == ChangeLogEntry.entity_id,
+                                  newer.id > ChangeLogEntry.id))
+            .limit(limit)
+        )
+        stmt = delete(ChangeLogEntry).where(ChangeLogEntry.id.in_(superseded.scalar_subquery()))
+        return self.db.execute(stmt, execution_options={"synchronize_session": False}).rowcount
@@ -0,0 +1,66 @@
+from datetime import datetime
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+from app.db.dialect import upsert_insert
+from app.models.idempotency_key import IdempotencyKey
+
+# ستون‌های لازم برای تصمیم‌گیری و بازپخش پاسخ (بدون ساخت آبجکت ORM)
+RECORD_COLUMNS = (
+    IdempotencyKey.fingerprint, IdempotencyKey.status, IdempotencyKey.status_code,
+    IdempotencyKey.response_headers, IdempotencyKey.response_body,
+    IdempotencyKey.locked_at, IdempotencyKey.expires_at,
+)
+
+class IdempotencyRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim(self, key: str, fingerprint: str, now: datetime, expires_at: datetime, stale_before: datetime) -> bool:
+        """
+        ادعای کلید با INSERT ... ON CONFLICT DO NOTHING؛ اگر کلید بود ولی منقضی شده یا ادعای
+        in_progress آن رها شده (قبل از stale_before)، با یک UPDATE شرطی دوباره ادعا می‌شود.
+        True یعنی این درخواست باید اجرا شود. commit با unit of work سرویس است.
+        """
+        values = {"fingerprint": fingerprint, "status": IdempotencyKey.IN_PROGRESS, "locked_at": now,
+                  "expires_at": expires_at}
+        stmt = (upsert_insert(self.db, IdempotencyKey).values(key=key, **values)
+                .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+                .returning(IdempotencyKey.key))
+        if self.db.scalar(stmt) is not None:
+            return True
+
+        takeover = (
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.key == key,
+                or_(IdempotencyKey.expires_at < now,
+                    (IdempotencyKey.status == IdempotencyKey.IN_PROGRESS) & (IdempotencyKey.locked_at < stale_before)),
+            )
+            .values(status_code=None, response_headers=None, response_body=None, **values)
+            .returning(IdempotencyKey.key)
+        )
+        return self.db.scalar(takeover, execution_options={"synchronize_session": False}) is not None
+
+    def get_record(self, key: str):
+        """ردیف Core کلید (یا None)."""
+        return self.db.execute(select(*RECORD_COLUMNS).where(IdempotencyKey.key == key)).first()
+
+    def complete(self, key: str, status_code: int, headers: list[list[str]], body: bytes) -> None:
+        """ذخیره پاسخ نهایی برای بازپخش."""
+        stmt = (update(IdempotencyKey)
+                .where(IdempotencyKey.key == key, IdempotencyKey.status == IdempotencyKey.IN_PROGRESS)
+                .values(status=IdempotencyKey.COMPLETED, status_code=status_code,
+                        response_headers=headers, response_body=body))
+        self.db.execute(stmt, execution_options={"synchronize_session": False})
+
+    def release(self, key: str) -> None:
+        """حذف ادعای in_progress (خطای سرور) تا تلاش بعدی دوباره اجرا شود."""
+        stmt = delete(IdempotencyKey).where(IdempotencyKey.key == key,
+                                            IdempotencyKey.status == IdempotencyKey.IN_PROGRESS)
+        self.db.execute(stmt, execution_options={"synchronize_session": False})
+
+    def delete_expired(self, now: datetime, limit: int) -> int:
+        """حذف حداکثر limit کلید منقضی (روی ایندکس expires_at)؛ تعداد حذف‌شده را برمی‌گرداند."""
+        expired = select(IdempotencyKey.key).where(IdempotencyKey.expires_at < now).limit(limit)
+        stmt = delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired.scalar_subquery()))
+        return self.db.execute(stmt, execution_options={"synchronize_session": False}).rowcount
@@ -1,5 +1,15 @@
+from datetime import date, datetime
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import Session
+from app.db.dialect import sync_id_sequence, upsert_insert
 from app.models.project import Project
+from app.models.task import Task, TaskStatus
+
+# ستون‌های لیست در مسیر سریع (ردیف Core به جای آبجکت ORM)
+PROJECT_LIST_COLUMNS = (Project.id, Project.name, Project.description, Project.created_at, Project.updated_at)
+
+# ستون‌های قابل انتخاب با ?fields= (sparse fieldsets)
+PROJECT_FIELD_COLUMNS = {column.key: column for column in PROJECT_LIST_COLUMNS}
 
 class ProjectRepository:
     def __init__(self, db: Session):
@@ -13,28 +23,114 @@ class ProjectRepository:
         """دریافت یک پروژه بر اساس نام."""
         return self.db.query(Project).filter(Project.name == name).first()
 
-    def get_all_projects(self, skip: int = 0, limit: int = 100) -> list[Project]:
+    def get_projects_by_ids(self, project_ids: set[int]) -> dict[int, Project]:
+        """دریافت چند پروژه با یک کوئری IN، به صورت دیکشنری id -> Project."""
+        if not project_ids:
+            return {}
+        projects = self.db.query(Project).filter(Project.id.in_(project_ids)).all()
+        return {project.id: project for project in projects}
+
+    def get_project_rows_by_ids(self, project_ids: set[int]) -> list:
+        """ردیف‌های Core چند پروژه با یک کوئری IN (شناسه‌های ناموجود در نتیجه نیستند)."""
+        if not project_ids:
+            return []
+        return self.db.execute(select(*PROJECT_LIST_COLUMNS).where(Project.id.in_(project_ids))).all()
+
+    def get_all_projects(self, skip: int = 0, limit: int = 100, after_id: int | None = None) -> list[Project]:
         """
         دریافت لیست پروژه‌ها با قابلیت صفحه‌بندی.
         اصلاح شده برای دریافت skip و limit.
+
+        اگر after_id داده شود، صفحه‌بندی keyset (id > after_id) انجام می‌شود
+        که برخلاف offset هزینه‌اش به عمق صفحه بستگی ندارد.
+        """
+        return list(self.db.scalars(self._list_statement((Project,), skip, limit, after_id)))
+
+    def get_all_project_rows(self, skip: int = 0, limit: int = 100, after_id: int | None = None,
+                             columns: list | None = None) -> list:
+        """
+        همان get_all_projects ولی با ردیف‌های Core (Row) برای مسیر سریع سریال‌سازی.
+        columns (اختیاری) فقط همان ستون‌ها را SELECT می‌کند (sparse fieldsets).
+        """
+        return self.db.execute(self._list_statement(columns or PROJECT_LIST_COLUMNS, skip, limit, after_id)).all()
+
+    def _list_statement(self, columns, skip: int, limit: int, after_id: int | None):
+        stmt = select(*columns).order_by(Project.id)
+        if after_id is not None:
+            return stmt.where(Project.id > after_id).limit(limit)
+        return stmt.offset(skip).limit(limit)
+
+    def get_version(self) -> tuple[int, datetime | None]:
+        """(تعداد، بیشترین updated_at) پروژه‌ها برای ETag لیست؛ max روی ایندکس updated_at است."""
+        row = self.db.execute(select(func.count(), func.max(Project.updated_at)).select_from(Project)).one()
+        return row[0], row[1]
+
+    def get_task_stats(self, project_ids: set[int], today: date) -> list:
         """
-        return self.db.query(Project).offset(skip).limit(limit).all()
-
-    def create_project(self, name: str, description: str) -> Project:
-        """ایجاد یک پروژه جدید."""
-        db_project = Project(name=name, description=description)
-        self.db.add(db_project)
-        self.db.commit()
-        self.db.refresh(db_project)
-        return db_project
-
-    def delete_project(self, project: Project) -> None:
-        """حذف یک پروژه."""
-        self.db.delete(project)
-        self.db.commit()
-
-    def update_project(self, project: Project) -> Project:
-        """به‌روزرسانی یک پروژه."""
-        self.db.commit()
-        self.db.refresh(project)
-        return project
\ No newline at end of file
+        آمار تسک‌های چند پروژه با یک کوئری تجمعی (LEFT JOIN + GROUP BY)، بدون بارگذاری تسک‌ها.
+        پروژه‌های بدون تسک با شمارش صفر برمی‌گردند و شناسه‌های ناموجود در نتیجه نیستند.
+        """
+        if not project_ids:
+            return []
+        is_open = Task.status != TaskStatus.DONE
+        stmt = (
+            select(
+                Project.id.label("project_id"),
+                func.count(Task.id).label("total"),
+                *(func.count(Task.id).filter(Task.status == status).label(status.value) for status in TaskStatus),
+                func.count(Task.id).filter(is_open, Task.deadline < today).label("overdue"),
+                func.min(Task.deadline).filter(is_open, Task.deadline >= today).label("next_deadline"),
+            )
+            .outerjoin(Task, Task.project_id == Project.id)
+            .where(Project.id.in_(project_ids))
+            .group_by(Project.id)
+        )
+        return self.db.execute(stmt).mappings().all()
+
+    def _insert_ignoring_duplicate_names(self):
+        """INSERT ... ON CONFLICT (name) DO NOTHING؛ ردیف تکراری چیزی در RETURNING برنمی‌گرداند."""
+        return upsert_insert(self.db, Project).on_conflict_do_nothing(index_elements=[Project.name])
+
+    def create_project(self, name: str, description: str) -> Project | None:
+        """
+        ایجاد یک پروژه جدید با INSERT ... RETURNING (بدون refresh). commit با unit of work سرویس است.
+        اگر نام تکراری باشد (constraint یکتا، ON CONFLICT) None برمی‌گرداند.
+        """
+        stmt = self._insert_ignoring_duplicate_names().values(name=name, description=description).returning(Project)
+        return self.db.scalars(stmt).first()
+
+    def create_projects_bulk(self, rows: list[dict]) -> dict[str, int]:
+        """
+        درج چند پروژه با یک INSERT چندردیفی (ON CONFLICT DO NOTHING، RETURNING id و نام).
+        دیکشنری نام -> id فقط برای پروژه‌های درج‌شده برمی‌گردد؛ نام‌های تکراری در آن نیستند.
+        ردیف‌هایی که id دارند (بازگردانی خروجی) با همان شناسه در یک INSERT جدا درج می‌شوند.
+        """
+        inserted = {}
+        for group in ([row for row in rows if "id" not in row], [row for row in rows if "id" in row]):
+            if group:
+                stmt = self._insert_ignoring_duplicate_names().values(group).returning(Project.id, Project.name)
+                inserted.update({name: project_id for project_id, name in self.db.execute(stmt)})
+        if any("id" in row for row in rows):
+            sync_id_sequence(self.db, Project)
+        return inserted
+
+    def delete_project(self, project_id: int) -> tuple[str, list[int]] | None:
+        """
+        حذف پروژه و تسک‌هایش با دو DELETE ... RETURNING (بدون بارگذاری تسک‌ها برای cascade).
+        (نام پروژه، شناسه تسک‌های حذف‌شده) را برای باطل کردن کش برمی‌گرداند؛ None یعنی پروژه نبود.
+        """
+        # اول ردیف پروژه قفل می‌شود: ساخت تسک همزمان (که همین ردیف را برای سهمیه UPDATE می‌کند) یا
+        # قبل از ما commit می‌شود و تسکش هم حذف می‌شود، یا بعد از ما پروژه را پیدا نمی‌کند؛
+        # وگرنه تسکی بین دو DELETE درج و حذف پروژه با خطای کلید خارجی رد می‌شد
+        if self.db.scalar(select(Project.id).where(Project.id == project_id).with_for_update()) is None:
+            return None
+        task_ids = list(self.db.scalars(delete(Task).where(Task.project_id == project_id).returning(Task.id)))
+        name = self.db.scalar(delete(Project).where(Project.id == project_id).returning(Project.name))
+        if name is None:
+            return None
+        return name, task_ids
+
+    def update_project(self, project_id: int, values: dict) -> Project | None:
+        """UPDATE ... RETURNING؛ None یعنی پروژه وجود ندارد. نام تکراری IntegrityError می‌دهد."""
+        stmt = update(Project).where(Project.id == project_id).values(**values).returning(Project)
+        return self.db.scalars(stmt, execution_options={"synchronize_session": False}).first()
@@ -0,0 +1,55 @@
+from sqlalchemy import false, func, select, update
+from sqlalchemy.orm import Session
+from app.models.project import Project
+
+# کلید ثابت قفل advisory برای سریال کردن ساخت پروژه‌ها
+PROJECT_QUOTA_LOCK_KEY = 7_300_001
+
+
+class QuotaRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def lock_project_quota(self) -> None:
+        """
+        قفل advisory سطح تراکنش را در PostgreSQL می‌گیرد تا شمارش و درج پروژه
+        بین درخواست‌های همزمان سریال شود. قفل با commit یا rollback آزاد می‌شود.
+        در SQLite یک UPDATE بی‌اثر قفل نوشتن پایگاه را قبل از شمارش می‌گیرد؛ بدون آن
+        شمارش بیرون از تراکنش نوشتن اجرا می‌شود و نویسنده‌های همزمان همه یک عدد را می‌بینند.
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            self.db.execute(select(func.pg_advisory_xact_lock(PROJECT_QUOTA_LOCK_KEY)))
+        elif dialect == "sqlite":
+            self.db.execute(update(Project).where(false()).values(task_count=Project.task_count),
+                            execution_options={"synchronize_session": False})
+
+    def count_projects(self) -> int:
+        """تعداد پروژه‌ها با یک کوئری تجمعی (بدون بارگذاری ردیف‌ها)."""
+        return self.db.scalar(select(func.count()).select_from(Project))
+
+    def try_reserve_task_slots(self, project_id: int, count: int, limit: int) -> bool:
+        """
+        شمارنده task_count پروژه را به صورت اتمیک افزایش می‌دهد، به شرط آنکه از سقف عبور نکند.
+        شرط و افزایش در یک UPDATE هستند و قفل ردیف پروژه تا پایان تراکنش نگه داشته می‌شود،
+        پس دو درخواست همزمان نمی‌توانند هر دو از سقف رد شوند.
+        updated_at دست نمی‌خورد چون شمارنده بخشی از نمایش پروژه نیست.
+        """
+        result = self.db.execute(
+            update(Project)
+            .where(Project.id == project_id, Project.task_count + count <= limit)
+            .values(task_count=Project.task_count + count, updated_at=Project.updated_at)
+        )
+        return result.rowcount == 1
+
+    def project_exists(self, project_id: int) -> bool:
+        """آیا پروژه وجود دارد (برای تشخیص «پروژه حذف شده» از «سقف پر است» وقتی رزرو ردیفی را عوض نکرد)."""
+        return self.db.scalar(select(Project.id).where(Project.id == project_id)) is not None
+
+    def release_task_slots(self, project_id: int, count: int) -> None:
+        """شمارنده task_count پروژه را پس از حذف تسک‌ها کاهش می‌دهد."""
+        self.db.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(task_count=Project.task_count - count, updated_at=Project.updated_at)
+        )
@@ -1,7 +1,92 @@
-from sqlalchemy.orm import Session
+import re
+from dataclasses import dataclass
+from sqlalchemy import and_, column, delete, func, insert, literal_column, or_, select, table, update
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session, aliased
+from app.db.dialect import sync_id_sequence
 from app.models.task import Task, TaskStatus
 from app.models.project import Project
-from datetime import date
+from datetime import date, datetime
+
+# فیلدهای مجاز برای مرتب‌سازی (پیشوند "-" یعنی نزولی)؛ id همیشه برای یکتایی ترتیب اضافه می‌شود
+TASK_SORT_FIELDS = {
+    "id": Task.id,
+    "deadline": Task.deadline,
+    "created_at": Task.created_at,
+    "title": Task.title,
+}
+
+# کانال LISTEN/NOTIFY که scheduler برای تسک‌های تازه تاریخ‌گذشته گوش می‌دهد
+TASK_CHANGES_CHANNEL = "task_overdue_changes"
+
+# ستون‌های لیست در مسیر سریع (ردیف Core به جای آبجکت ORM)
+TASK_LIST_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.status, Task.deadline,
+    Task.project_id, Task.created_at, Task.updated_at,
+)
+
+# ستون‌های قابل انتخاب با ?fields= (sparse fieldsets)
+TASK_FIELD_COLUMNS = {column.key: column for column in TASK_LIST_COLUMNS}
+
+# جست‌وجوی متنی: ستون تولیدشده PostgreSQL (فقط در مایگریشن) و جدول FTS5 در SQLite (app/models/task.py)
+SEARCH_TS_CONFIG = "simple"
+TASK_SEARCH_VECTOR = column("search_vector", TSVECTOR)
+TASKS_FTS = table("tasks_fts", column("rowid"))
+_FTS_TOKEN = re.compile(r"\w+")
+
+# مرتب‌سازی‌هایی که صفحه‌بندی keyset (کرسر روی id) را پشتیبانی می‌کنند
+KEYSET_SORTS = ("id", "-id")
+
+
+@dataclass
+class TaskFilter:
+    """
+    فیلترهای لیست تسک‌ها. هر فیلتر با یکی از ایندکس‌های ترکیبی پوشش داده می‌شود:
+    (project_id, status)، (status, deadline) و (created_at).
+    """
+    project_id: int | None = None
+    status: TaskStatus | None = None
+    deadline_before: date | None = None
+    deadline_after: date | None = None
+    created_after: datetime | None = None
+
+    def clauses(self) -> list:
+        clauses = []
+        if self.project_id is not None:
+            clauses.append(Task.project_id == self.project_id)
+        if self.status is not None:
+            clauses.append(Task.status == self.status)
+        if self.deadline_before is not None:
+            clauses.append(Task.deadline < self.deadline_before)
+        if self.deadline_after is not None:
+            clauses.append(Task.deadline > self.deadline_after)
+        if self.created_after is not None:
+            clauses.append(Task.created_at > self.created_after)
+        return clauses
+
+
+def overdue_clauses(today: date, since: date | None = None, changed_since: datetime | None = None) -> list:
+    """
+    شرط تسک‌های تاریخ‌گذشته و باز. برای اجرای افزایشی:
+    since فقط ددلاین‌های [since, today) را می‌گیرد (تسک‌هایی که از مرز روز قبلی رد شده‌اند)
+    و changed_since فقط تسک‌هایی که بعد از آن زمان ویرایش شده‌اند (ایندکس updated_at).
+    """
+    clauses = [Task.deadline < today, Task.status != TaskStatus.DONE]
+    if since is not None:
+        clauses.append(Task.deadline >= since)
+    if changed_since is not None:
+        clauses.append(Task.updated_at >= changed_since)
+    return clauses
+
+
+def task_order_by(sort: str) -> list:
+    """عبارت ORDER BY برای یک مقدار sort مجاز (مثلاً "-deadline")."""
+    descending = sort.startswith("-")
+    column = TASK_SORT_FIELDS[sort.lstrip("-")]
+    if column is Task.id:
+        return [Task.id.desc() if descending else Task.id]
+    return [column.desc() if descending else column, Task.id.desc() if descending else Task.id]
+
 
 class TaskRepository:
     def __init__(self, db: Session):
@@ -11,41 +96,181 @@ class TaskRepository:
         """دریافت یک تسک بر اساس شناسه."""
         return self.db.query(Task).filter(Task.id == task_id).first()
 
+    def get_task_rows_by_ids(self, task_ids: set[int]) -> list:
+        """ردیف‌های Core چند تسک با یک کوئری IN (شناسه‌های ناموجود در نتیجه نیستند)."""
+        if not task_ids:
+            return []
+        return self.db.execute(select(*TASK_LIST_COLUMNS).where(Task.id.in_(task_ids))).all()
+
     def get_tasks_for_project(self, project_id: int) -> list[Task]:
         """دریافت لیست تمام تسک‌های یک پروژه."""
         return self.db.query(Task).filter(Task.project_id == project_id).all()
 
-    def get_all_tasks(self, skip: int = 0, limit: int = 100) -> list[Task]:
+    def get_tasks_for_projects(self, project_ids: list[int], per_project_limit: int | None = None,
+                               status: TaskStatus | None = None) -> dict[int, list[Task]]:
         """
-        دریافت تمام تسک‌ها (بدون فیلتر پروژه) با صفحه‌بندی.
+        تسک‌های چند پروژه با یک کوئری، به صورت دیکشنری project_id -> لیست تسک‌ها (مرتب بر اساس id).
+        با per_project_limit فقط N تسک اول هر پروژه با تابع پنجره‌ای row_number() خوانده می‌شود.
+        """
+        grouped = {project_id: [] for project_id in project_ids}
+        if not project_ids:
+            return grouped
+        clauses = [Task.project_id.in_(project_ids)]
+        if status is not None:
+            clauses.append(Task.status == status)
+
+        if per_project_limit is None:
+            stmt = select(Task).where(*clauses).order_by(Task.project_id, Task.id)
+        else:
+            row_number = func.row_number().over(partition_by=Task.project_id, order_by=Task.id).label("row_number")
+            ranked = select(Task, row_number).where(*clauses).subquery()
+            ranked_task = aliased(Task, ranked)
+            stmt = (
+                select(ranked_task)
+                .where(ranked.c.row_number <= per_project_limit)
+                .order_by(ranked.c.project_id, ranked.c.id)
+            )
+        for task in self.db.scalars(stmt):
+            grouped[task.project_id].append(task)
+        return grouped
+
+    def get_all_tasks(self, skip: int = 0, limit: int = 100, after_id: int | None = None,
+                      filters: TaskFilter | None = None, sort: str = "id") -> list[Task]:
+        """
+        دریافت تسک‌ها با فیلتر، مرتب‌سازی و صفحه‌بندی.
         این متد برای نمایش لیست کلی تسک‌ها در API نیاز است.
+
+        ترتیب همیشه قطعی است (id به عنوان معیار دوم) تا صفحه‌ها پایدار باشند.
+        اگر after_id داده شود (فقط برای sort=id یا -id)، صفحه‌بندی keyset انجام می‌شود
+        که روی ایندکس در زمان ثابت اجرا می‌شود و skip نادیده گرفته می‌شود.
+        """
+        return list(self.db.scalars(self._list_statement((Task,), skip, limit, after_id, filters, sort)))
+
+    def get_all_task_rows(self, skip: int = 0, limit: int = 100, after_id: int | None = None,
+                          filters: TaskFilter | None = None, sort: str = "id", columns: list | None = None) -> list:
+        """
+        همان get_all_tasks ولی با ردیف‌های Core (Row) به جای آبجکت ORM؛ بدون identity map
+        و ساخت آبجکت، برای مسیر سریع سریال‌سازی لیست‌های بزرگ.
+        columns (اختیاری) فقط همان ستون‌ها را SELECT می‌کند (sparse fieldsets).
         """
-        return self.db.query(Task).offset(skip).limit(limit).all()
+        stmt = self._list_statement(columns or TASK_LIST_COLUMNS, skip, limit, after_id, filters, sort)
+        return self.db.execute(stmt).all()
+
+    def _list_statement(self, columns, skip: int, limit: int, after_id: int | None,
+                        filters: TaskFilter | None, sort: str):
+        stmt = select(*columns).where(*(filters.clauses() if filters else [])).order_by(*task_order_by(sort))
+        if after_id is not None:
+            keyset = Task.id < after_id if sort == "-id" else Task.id > after_id
+            return stmt.where(keyset).limit(limit)
+        return stmt.offset(skip).limit(limit)
+
+    def search_task_rows(self, query: str, project_id: int | None = None, limit: int = 20,
+                         after: tuple[float, int] | None = None) -> list:
+        """
+        جست‌وجوی متنی در عنوان و توضیحات؛ ردیف‌های Core با ستون rank (بزرگ‌تر یعنی مرتبط‌تر)،
+        مرتب بر اساس (rank نزولی، id صعودی). after همان (rank، id) آخرین ردیف صفحه قبل است.
+
+        تطبیق از ایندکس معکوس (GIN یا FTS5) می‌آید و رتبه برای همه تطبیق‌ها حساب می‌شود تا بهترین
+        نتیجه هرگز جا نیفتد؛ هزینه با تعداد تطبیق‌ها رشد می‌کند، نه با اندازه جدول.
+        """
+        candidates = self._search_candidates(query, project_id)
+        if candidates is None:
+            return []
+        rank = candidates.c.rank
+        stmt = (
+            select(*TASK_LIST_COLUMNS, rank)
+            .join(candidates, Task.id == candidates.c.id)
+            .order_by(rank.desc(), Task.id)
+            .limit(limit)
+        )
+        if after is not None:
+            after_rank, after_id = after
+            stmt = stmt.where(or_(rank < after_rank, and_(rank == after_rank, Task.id > after_id)))
+        return self.db.execute(stmt).all()
+
+    def _search_candidates(self, query: str, project_id: int | None):
+        """زیرکوئری (id، rank) تسک‌های منطبق؛ None یعنی عبارت جست‌وجو هیچ واژه‌ای ندارد."""
+        clauses = [] if project_id is None else [Task.project_id == project_id]
+        if self.db.get_bind().dialect.name == "postgresql":
+            ts_query = func.websearch_to_tsquery(SEARCH_TS_CONFIG, query)
+            stmt = (
+                select(Task.id, func.ts_rank_cd(TASK_SEARCH_VECTOR, ts_query).label("rank"))
+                .where(TASK_SEARCH_VECTOR.op("@@")(ts_query), *clauses)
+            )
+        else:
+            # FTS5: هر واژه به صورت عبارت نقل‌قول‌شده (AND ضمنی)؛ bm25 کوچک‌تر بهتر است، پس منفی می‌شود
+            tokens = _FTS_TOKEN.findall(query)
+            if not tokens:
+                return None
+            match = " ".join(f'"{token}"' for token in tokens)
+            fts = literal_column("tasks_fts")
+            stmt = (
+                select(Task.id, (-func.bm25(fts, 2.0, 1.0)).label("rank"))
+                .select_from(TASKS_FTS)
+                .join(Task, Task.id == TASKS_FTS.c.rowid)
+                .where(fts.op("MATCH")(match), *clauses)
+            )
+        return stmt.subquery()
+
+    def get_version(self, filters: TaskFilter | None = None) -> tuple[int, datetime | None]:
+        """(تعداد، بیشترین updated_at) تسک‌ها برای ETag لیست؛ max روی ایندکس updated_at است."""
+        stmt = select(func.count(), func.max(Task.updated_at)).select_from(Task)
+        if filters:
+            stmt = stmt.where(*filters.clauses())
+        row = self.db.execute(stmt).one()
+        return row[0], row[1]
 
     def add_task_to_project(self, project: Project, title: str, description: str, deadline: date | None) -> Task:
-        """ایجاد یک تسک جدید برای یک پروژه مشخص."""
-        db_task = Task(
-            title=title,
-            description=description,
-            deadline=deadline,
-            project_id=project.id,
-            status=TaskStatus.TODO # مقدار پیش‌فرض
+        """
+        ایجاد یک تسک جدید برای یک پروژه مشخص با INSERT ... RETURNING (بدون refresh).
+        commit با unit of work سرویس انجام می‌شود.
+        """
+        stmt = (
+            insert(Task)
+            .values(
+                title=title,
+                description=description,
+                deadline=deadline,
+                project_id=project.id,
+                status=TaskStatus.TODO # مقدار پیش‌فرض
+            )
+            .returning(Task)
         )
-        self.db.add(db_task)
-        self.db.commit()
-        self.db.refresh(db_task)
-        return db_task
-
-    def delete_task(self, task: Task) -> None:
-        """حذف یک تسک."""
-        self.db.delete(task)
-        self.db.commit()
-
-    def update_task(self, task: Task) -> Task:
-        """به‌روزرسانی یک تسک."""
-        self.db.commit()
-        self.db.refresh(task)
-        return task
+        return self.db.scalars(stmt).one()
+
+    def add_tasks_bulk(self, rows: list[dict]) -> list[int]:
+        """
+        درج چند تسک با یک INSERT چندردیفی (RETURNING id).
+        شناسه‌ها به ترتیب ردیف‌های ورودی برگردانده می‌شوند. ردیف‌هایی که id دارند (بازگردانی
+        خروجی) با همان شناسه و در یک INSERT جدا درج می‌شوند و sequence شناسه جلو برده می‌شود.
+        """
+        if not rows:
+            return []
+        generated = [row for row in rows if "id" not in row]
+        restored = [row for row in rows if "id" in row]
+        new_ids = iter(self.db.scalars(insert(Task).returning(Task.id, sort_by_parameter_order=True), generated)
+                       if generated else ())
+        if restored:
+            self.db.execute(insert(Task), restored)
+            sync_id_sequence(self.db, Task)
+        return [row["id"] if "id" in row else next(new_ids) for row in rows]
+
+    def delete_task(self, task_id: int) -> int | None:
+        """حذف یک تسک با DELETE ... RETURNING؛ project_id تسک حذف‌شده یا None اگر وجود نداشت."""
+        return self.db.scalar(delete(Task).where(Task.id == task_id).returning(Task.project_id))
+
+    def update_task(self, task_id: int, values: dict) -> Task | None:
+        """به‌روزرسانی یک تسک با UPDATE ... RETURNING؛ None یعنی تسک وجود ندارد."""
+        stmt = update(Task).where(Task.id == task_id).values(**values).returning(Task)
+        return self.db.scalars(stmt, execution_options={"synchronize_session": False}).first()
+
+    def notify_overdue_change(self) -> None:
+        """
+        در PostgreSQL به scheduler خبر می‌دهد که تسکی همین الان تاریخ‌گذشته شده است (NOTIFY).
+        پیام با commit همین تراکنش تحویل داده می‌شود و با rollback دور ریخته می‌شود.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(select(func.pg_notify(TASK_CHANGES_CHANNEL, "")))
 
     def get_overdue_tasks(self) -> list[Task]:
         """
@@ -58,18 +283,41 @@ class TaskRepository:
             Task.status != TaskStatus.DONE
         ).all()
 
-    def autoclose_overdue_tasks(self) -> int:
+    def close_overdue_chunk(self, today: date, chunk_size: int, since: date | None = None,
+                            changed_since: datetime | None = None, skip_locked: bool = False) -> list:
         """
-        تسک‌های تاریخ‌گذشته را پیدا کرده و وضعیت آن‌ها را به DONE تغییر می‌دهد.
+        حداکثر chunk_size تسک تاریخ‌گذشته را با یک UPDATE مجموعه‌ای می‌بندد (commit با سرویس است).
+        (شناسه، شناسه پروژه) تسک‌های بسته‌شده با RETURNING برگردانده می‌شوند؛ هیچ آبجکت ORM بارگذاری نمی‌شود.
+        ردیف‌های بسته‌شده دیگر در شرط صدق نمی‌کنند، پس فراخوانی بعدی دسته بعد را برمی‌دارد.
+        since و changed_since دامنه را برای اجرای افزایشی محدود می‌کنند (overdue_clauses).
+        با skip_locked ردیف‌ها با FOR UPDATE SKIP LOCKED برداشته می‌شوند تا چند replica
+        همزمان دسته‌های جدا از هم بردارند و پشت قفل یکدیگر منتظر نمانند.
         """
-        overdue_tasks = self.get_overdue_tasks()
-        
-        if not overdue_tasks:
-            return 0 
+        candidates = (
+            select(Task.id)
+            .where(*overdue_clauses(today, since, changed_since))
+            .limit(chunk_size)
+        )
+        if skip_locked:
+            candidates = candidates.with_for_update(skip_locked=True)
+        stmt = (
+            update(Task)
+            .where(Task.id.in_(candidates.scalar_subquery()))
+            .values(status=TaskStatus.DONE)
+            .returning(Task.id, Task.project_id)
+        )
+        return self.db.execute(stmt, execution_options={"synchronize_session": False}).all()
 
-        for task in overdue_tasks:
-            task.status = TaskStatus.DONE
-        
-        self.db.commit()
-        
-        return len(overdue_tasks)
\ No newline at end of file
+    def find_overdue_chunk(self, today: date, chunk_size: int, after_id: int = 0, since: date | None = None,
+                           changed_since: datetime | None = None) -> list[int]:
+        """
+        شناسه‌های تسک‌های تاریخ‌گذشته را بدون تغییر آن‌ها برمی‌گرداند (برای حالت dry-run).
+        صفحه‌بندی keyset روی id انجام می‌شود.
+        """
+        stmt = (
+            select(Task.id)
+            .where(*overdue_clauses(today, since, changed_since), Task.id > after_id)
+            .order_by(Task.id)
+            .limit(chunk_size)
+        )
+        return list(self.db.scalars(stmt))
@@ -0,0 +1,165 @@
+"""
+زمان‌بند مبتنی بر ددلاین برای autoclose.
+
+ددلاین‌ها تاریخ ساده هستند، پس مجموعه تسک‌های تاریخ‌گذشته فقط در دو حالت عوض می‌شود:
+با رسیدن نیمه‌شب (مرز روز) یا با ویرایش ددلاین/وضعیت یک تسک. به جای اسکن کامل جدول
+در هر دقیقه، scheduler:
+
+- در شروع یک اجرای کامل (catch-up) انجام می‌دهد؛
+- تا نیمه‌شب بعدی می‌خوابد و بعد فقط ددلاین‌های روز(های) گذشته را می‌بندد (since)؛
+- با NOTIFY سرویس تسک (فقط PostgreSQL) بیدار می‌شود و فقط تسک‌های ویرایش‌شده
+  از آخرین اجرا را بررسی می‌کند (changed_since)؛
+- اگر SCHEDULER_MAX_INTERVAL_SECONDS از آخرین اجرای کامل گذشته باشد، برای اطمینان
+  دوباره کل جدول را بررسی می‌کند.
+
+با چند replica (SCHEDULER_COORDINATION):
+- lease: فقط replicaی که advisory lock را دارد اجرا می‌کند؛ بقیه هر
+  SCHEDULER_LEASE_RETRY_SECONDS تلاش می‌کنند و رهبر جدید با یک اجرای کامل شروع می‌کند.
+- skip_locked: همه replicaها اجرا می‌کنند و هر کدام دسته‌های جدا (FOR UPDATE SKIP LOCKED) برمی‌دارد.
+"""
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app import config
+from app.db.advisory_lock import AdvisoryLease
+from app.db.base import utcnow
+from app.db.pg_listener import PgListener
+from app.repositories.task_repository import TASK_CHANGES_CHANNEL
+from app.services import autoclose_service
+from app.services.autoclose_service import AutocloseResult
+
+# حاشیه امن برای اختلاف ساعت بین پردازه API (که updated_at را می‌نویسد) و scheduler
+WATERMARK_SKEW = timedelta(seconds=5)
+# فاصله تلاش دوباره وقتی اجرای catch-up شکست خورده است
+RETRY_SECONDS = 60
+
+COORDINATION_MODES = ("lease", "skip_locked", "none")
+
+
+def seconds_until_midnight(now: datetime | None = None) -> float:
+    """ثانیه‌های باقی‌مانده تا نیمه‌شب محلی بعدی (مرز بعدی تاریخ‌گذشته شدن ددلاین‌ها)."""
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max((midnight - now).total_seconds(), 0.0)
+
+
+class TaskChangeListener(PgListener):
+    """
+    روی کانال TASK_CHANGES_CHANNEL گوش می‌دهد (فقط PostgreSQL و با SCHEDULER_LISTEN).
+    اگر اتصال قطع شود، تا اتصال دوباره اجرای کامل دوره‌ای پوشش می‌دهد.
+    """
+
+    def __init__(self, engine: Engine, log: Callable[[str], None] = print):
+        super().__init__(engine, TASK_CHANGES_CHANNEL, log, enabled=config.SCHEDULER_LISTEN)
+
+    def wait(self, timeout: float) -> bool:
+        """تا timeout ثانیه منتظر اعلان می‌ماند؛ True یعنی حداقل یک تسک تغییر کرده است."""
+        return bool(super().wait(timeout))
+
+
+class DeadlineScheduler:
+    """حلقه زمان‌بندی autoclose: catch-up، مرز نیمه‌شب، اجرای افزایشی با اعلان و اجرای کامل دوره‌ای."""
+
+    def __init__(self, session_factory: Callable[[], Session], engine: Engine,
+                 max_interval: int | None = None, log: Callable[[str], None] = print,
+                 coordination: str | None = None):
+        coordination = coordination or config.SCHEDULER_COORDINATION
+        if coordination not in COORDINATION_MODES:
+            raise ValueError(f"Invalid scheduler coordination mode: {coordination!r} "
+                             f"(expected one of {', '.join(COORDINATION_MODES)}).")
+        self.session_factory = session_factory
+        self.listener = TaskChangeListener(engine, log)
+        self.lease = AdvisoryLease(engine, config.SCHEDULER_LOCK_KEY, log) if coordination == "lease" else None
+        self.skip_locked = coordination == "skip_locked"
+        self.max_interval = max_interval or config.SCHEDULER_MAX_INTERVAL_SECONDS
+        self.log = log
+        self.last_date: date | None = None
+        self.last_full: float | None = None
+        self.watermark: datetime | None = None
+
+    def run(self, kind: str, since: date | None = None, changed_since: datetime | None = None) -> AutocloseResult | None:
+        """
+        یک اجرای autoclose؛ وضعیت فقط در صورت موفقیت جلو می‌رود. watermark فقط با اجرای
+        کامل یا افزایشی جلو می‌رود، چون اجرای مرز روز تسک‌های ویرایش‌شده را پوشش نمی‌دهد.
+        """
+        today = date.today()
+        started_at = utcnow() - WATERMARK_SKEW
+        db = self.session_factory()
+        try:
+            result = autoclose_service.run_autoclose(db, today=today, since=since, changed_since=changed_since,
+                                                     skip_locked=self.skip_locked)
+        except Exception as e:
+            self.log(f"❌ Error in {kind} auto-close run: {e}")
+            return None
+        finally:
+            db.close()
+
+        if since is None:
+            self.watermark = started_at
+        if changed_since is None:
+            self.last_date = today
+        if since is None and changed_since is None:
+            self.last_full = time.monotonic()
+        if result.rows:
+            self.log(f"✅ [{kind}] Auto-closed {result.rows} overdue task(s) "
+                     f"in {result.chunks} chunk(s), {result.elapsed_seconds:.3f}s.")
+        return result
+
+    def next_timeout(self) -> float:
+        """ثانیه تا رویداد زمانی بعدی: نیمه‌شب یا سررسید اجرای کامل دوره‌ای، هر کدام زودتر."""
+        if self.lease and not self.lease.held:
+            return config.SCHEDULER_LEASE_RETRY_SECONDS
+        if self.last_full is None:
+            return RETRY_SECONDS
+        until_full = self.max_interval - (time.monotonic() - self.last_full)
+        return max(min(seconds_until_midnight(), until_full), 0.0)
+
+    def tick(self, changed: bool) -> int:
+        """
+        بعد از هر بیدار شدن تصمیم می‌گیرد کدام نوع اجرا لازم است.
+        تعداد تسک‌های بسته‌شده در این دور را برمی‌گرداند (replica غیر رهبر: 0).
+        """
+        if not self._lead():
+            return 0
+        if self.last_full is None or time.monotonic() - self.last_full >= self.max_interval:
+            runs = [self.run("full")]
+        else:
+            runs = []
+            if self.last_date != date.today():
+                runs.append(self.run("boundary", since=self.last_date))
+            if changed:
+                runs.append(self.run("changes", changed_since=self.watermark))
+        return sum(result.rows for result in runs if result)
+
+    def _lead(self) -> bool:
+        """در حالت lease فقط رهبر اجرا می‌کند؛ رهبر تازه وضعیت قبلی را معتبر نمی‌داند و از اجرای کامل شروع می‌کند."""
+        if self.lease is None:
+            return True
+        was_leader = self.lease.held
+        if not self.lease.acquire():
+            return False
+        if not was_leader:
+            if self.lease.enabled:
+                self.log("👑 Acquired scheduler lease; this replica runs auto-close.")
+            self.last_full = None
+        return True
+
+    def run_forever(self) -> None:
+        self.log(f"⏳ Catch-up run; then sleeping until the next midnight, a task change "
+                 f"or at most {self.max_interval}s between full scans.")
+        self.tick(changed=False)
+        try:
+            while True:
+                changed = self.listener.wait(self.next_timeout())
+                self.tick(changed)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """اتصال LISTEN را می‌بندد و lease را آزاد می‌کند تا replica دیگری فوراً رهبر شود."""
+        self.listener.close()
+        if self.lease:
+            self.lease.release()
@@ -0,0 +1,81 @@
+"""
+موتور بستن خودکار تسک‌های تاریخ‌گذشته.
+
+به جای بارگذاری همه تسک‌ها در حافظه، تسک‌ها با UPDATE مجموعه‌ای و در دسته‌های
+کوچک بسته می‌شوند. هر دسته تراکنش جداگانه دارد، پس قفل‌ها کوتاه‌مدت هستند
+و مصرف حافظه به اندازه دسته محدود است.
+"""
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable
+
+from sqlalchemy.orm import Session
+from app import config
+from app.cache import entity_cache, task_key
+from app.db.unit_of_work import unit_of_work
+from app.metrics import record_autoclose
+from app.models.change_log import ChangeLogEntry
+from app.repositories.task_repository import TaskRepository
+from app.services.change_feed_service import record_changes
+
+
+@dataclass
+class AutocloseResult:
+    """گزارش یک اجرای autoclose."""
+    rows: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    dry_run: bool = False
+
+
+def run_autoclose(
+    db: Session,
+    chunk_size: int | None = None,
+    dry_run: bool = False,
+    today: date | None = None,
+    on_chunk: Callable[[list[int]], None] | None = None,
+    since: date | None = None,
+    changed_since: datetime | None = None,
+    skip_locked: bool = False,
+) -> AutocloseResult:
+    """
+    تسک‌های تاریخ‌گذشته را دسته به دسته می‌بندد (یا در حالت dry_run فقط می‌شمارد).
+    on_chunk در صورت وجود با شناسه‌های هر دسته صدا زده می‌شود.
+    since / changed_since اجرا را افزایشی می‌کنند: فقط ددلاین‌های از since به بعد،
+    یا فقط تسک‌هایی که بعد از changed_since ویرایش شده‌اند (به جای بررسی کل جدول).
+    skip_locked (حالت تقسیم کار بین replicaها) ردیف‌های قفل‌شده توسط replica دیگر را رد می‌کند؛
+    دسته ناقص یعنی بقیه ردیف‌ها در دست دیگران است، پس حلقه تمام می‌شود.
+    """
+    repo = TaskRepository(db)
+    chunk_size = chunk_size or config.AUTOCLOSE_CHUNK_SIZE
+    today = today or date.today()
+    result = AutocloseResult(dry_run=dry_run)
+    started = time.perf_counter()
+
+    after_id = 0
+    while True:
+        if dry_run:
+            ids = repo.find_overdue_chunk(today, chunk_size, after_id, since, changed_since)
+        else:
+            # هر دسته تراکنش جداگانه دارد تا قفل‌ها کوتاه بمانند
+            with unit_of_work(db) as uow:
+                closed = repo.close_overdue_chunk(today, chunk_size, since, changed_since, skip_locked)
+                record_changes(uow, ChangeLogEntry.TASK, ChangeLogEntry.UPDATED, closed)
+            ids = [task_id for task_id, _ in closed]
+        if not ids:
+            break
+
+        result.rows += len(ids)
+        result.chunks += 1
+        after_id = max(ids)
+        if not dry_run:
+            entity_cache.invalidate(*(task_key(i) for i in ids))
+        if on_chunk:
+            on_chunk(ids)
+        if len(ids) < chunk_size:
+            break
+
+    result.elapsed_seconds = time.perf_counter() - started
+    record_autoclose(dry_run, result.rows, result.elapsed_seconds)
+    return result
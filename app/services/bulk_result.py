@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+SKIPPED_MESSAGE = "Skipped: another item in the atomic batch failed."
+
+
+@dataclass
+class BulkItemResult:
+    """نتیجه ایجاد یک آیتم در عملیات گروهی (id در صورت موفقیت، error در صورت شکست)."""
+    index: int
+    id: int | None = None
+    error: str | None = None
+
+
+def skip_pending(results: list[BulkItemResult]) -> None:
+    """در حالت اتمیک، آیتم‌های سالمی که به خاطر خطای دیگران ساخته نشدند را علامت می‌زند."""
+    for result in results:
+        if result.error is None and result.id is None:
+            result.error = SKIPPED_MESSAGE
@@ -0,0 +1,102 @@
+"""
+فید تغییرات پروژه‌ها و تسک‌ها برای کلاینت‌های همگام‌سازی (GET /api/changes).
+
+هر سرویس نوشتن، تغییراتش را با record_changes در همان unit of work ثبت می‌کند؛ درج در
+change_log آخرین دستور تراکنش است (before_commit)، پس اگر تراکنش rollback شود تغییری
+هم ثبت نمی‌شود. خواننده به جای دریافت دوباره کل لیست فقط تغییرات بعد از کرسرش را می‌گیرد.
+همان تغییرات به صورت رویداد زنده هم (app/events) برای مشترک‌های SSE / WebSocket منتشر می‌شوند.
+"""
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app import config
+from app.db.base import utcnow
+from app.db.unit_of_work import UnitOfWork, unit_of_work
+from app.events import build_events, publish_on_commit
+from app.models.change_log import ChangeLogEntry
+from app.repositories.change_log_repository import ChangeLogRepository
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+
+def record_changes(uow: UnitOfWork, entity: str, op: str, changes) -> None:
+    """
+    ثبت تغییر موجودیت‌ها؛ changes جفت‌های (شناسه، شناسه پروژه) است (برای پروژه هر دو یکی).
+    درج در لاگ و انتشار رویداد فقط با commit تراکنش uow انجام می‌شوند.
+    """
+    changes = list(changes)
+    if not changes:
+        return
+    rows = [{"entity": entity, "entity_id": entity_id, "op": op} for entity_id, _ in changes]
+    uow.before_commit(_append, uow.db, rows)
+    publish_on_commit(uow, build_events(entity, op, changes))
+
+def _append(db: Session, rows: list[dict]) -> None:
+    ChangeLogRepository(db).append(rows, config.CHANGE_FEED_LOCK_KEY)
+
+def get_head(db: Session) -> int:
+    return ChangeLogRepository(db).get_head()
+
+def get_changes(db: Session, after_id: int, limit: int) -> tuple[list[dict], int, bool]:
+    """
+    حداکثر limit ردیف لاگ بعد از after_id، فشرده به یک تغییر برای هر موجودیت با وضعیت فعلی آن.
+    (تغییرات، id آخرین ردیف خوانده‌شده، آیا ردیف بیشتری هست) را برمی‌گرداند.
+
+    هر تغییر: entity، id، op (created / updated / deleted)، seq (id آخرین ردیف لاگ آن)،
+    changed_at و row (ردیف Core فعلی، یا None برای tombstone). موجودیتی که دیگر نیست
+    حذف‌شده گزارش می‌شود، حتی اگر ردیف حذفش بعد از این صفحه باشد.
+    """
+    entries = ChangeLogRepository(db).get_page(after_id, limit + 1)
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if not entries:
+        return [], after_id, False
+
+    latest: dict[tuple[str, int], dict] = {}
+    for entry in entries:
+        key = (entry.entity, entry.entity_id)
+        previous = latest.pop(key, None)  # ترتیب خروجی بر اساس آخرین تغییر هر موجودیت
+        op = entry.op
+        if op != ChangeLogEntry.DELETED and previous and previous["op"] == ChangeLogEntry.CREATED:
+            op = ChangeLogEntry.CREATED
+        latest[key] = {
+            "entity": entry.entity,
+            "id": entry.entity_id,
+            "op": op,
+            "seq": entry.id,
+            "changed_at": entry.changed_at,
+            "row": None,
+        }
+
+    live = {entity: {c["id"] for c in latest.values() if c["entity"] == entity and c["op"] != ChangeLogEntry.DELETED}
+            for entity in (ChangeLogEntry.PROJECT, ChangeLogEntry.TASK)}
+    rows = {
+        ChangeLogEntry.PROJECT: {row.id: row for row in ProjectRepository(db).get_project_rows_by_ids(live[ChangeLogEntry.PROJECT])},
+        ChangeLogEntry.TASK: {row.id: row for row in TaskRepository(db).get_task_rows_by_ids(live[ChangeLogEntry.TASK])},
+    }
+    for change in latest.values():
+        if change["op"] != ChangeLogEntry.DELETED:
+            change["row"] = rows[change["entity"]].get(change["id"])
+            if change["row"] is None:
+                change["op"] = ChangeLogEntry.DELETED
+    return list(latest.values()), entries[-1].id, has_more
+
+def retention_cutoff(now: datetime | None = None) -> datetime:
+    """کرسرهای قدیمی‌تر از این زمان ممکن است به ردیف‌های فشرده‌شده نیاز داشته باشند."""
+    return (now or utcnow()) - timedelta(seconds=config.CHANGE_FEED_RETENTION_SECONDS)
+
+def compact(db: Session, batch_size: int = 1000) -> int:
+    """
+    فشرده‌سازی لاگ در دسته‌های batch_size (هر دسته یک تراکنش کوتاه):
+    تغییرات قدیمی‌تر از CHANGE_FEED_RETENTION_SECONDS و تغییراتی که تغییر جدیدتری برای همان
+    موجودیت دارند حذف می‌شوند. مجموع ردیف‌های حذف‌شده را برمی‌گرداند.
+    """
+    repo = ChangeLogRepository(db)
+    cutoff = retention_cutoff()
+    total = 0
+    for purge in (lambda: repo.delete_older_than(cutoff, batch_size), lambda: repo.delete_superseded(batch_size)):
+        while True:
+            with unit_of_work(db):
+                deleted = purge()
+            total += deleted
+            if deleted < batch_size:
+                break
+    return total
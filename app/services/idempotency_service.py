@@ -0,0 +1,39 @@
+from datetime import timedelta
+from sqlalchemy.orm import Session
+from app import config
+from app.db.base import utcnow
+from app.db.unit_of_work import unit_of_work
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+def claim_key(db: Session, key: str, fingerprint: str) -> bool:
+    """ادعای کلید در تراکنش کوتاه خودش؛ True یعنی درخواست باید اجرا شود (نه بازپخش)."""
+    now = utcnow()
+    with unit_of_work(db):
+        return IdempotencyRepository(db).claim(
+            key, fingerprint, now,
+            expires_at=now + timedelta(seconds=config.IDEMPOTENCY_TTL_SECONDS),
+            stale_before=now - timedelta(seconds=config.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS),
+        )
+
+def get_record(db: Session, key: str):
+    return IdempotencyRepository(db).get_record(key)
+
+def complete_key(db: Session, key: str, status_code: int, headers: list[list[str]], body: bytes) -> None:
+    with unit_of_work(db):
+        IdempotencyRepository(db).complete(key, status_code, headers, body)
+
+def release_key(db: Session, key: str) -> None:
+    with unit_of_work(db):
+        IdempotencyRepository(db).release(key)
+
+def purge_expired(db: Session, batch_size: int = 1000) -> int:
+    """حذف کلیدهای منقضی در دسته‌های batch_size (هر دسته یک تراکنش کوتاه)؛ مجموع حذف‌شده‌ها."""
+    repo = IdempotencyRepository(db)
+    now = utcnow()
+    total = 0
+    while True:
+        with unit_of_work(db):
+            deleted = repo.delete_expired(now, batch_size)
+        total += deleted
+        if deleted < batch_size:
+            return total
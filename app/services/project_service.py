@@ -1,66 +1,179 @@
+from datetime import date
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.db.unit_of_work import unit_of_work
+from app.exceptions.base import QuotaExceededError
+from app.models.change_log import ChangeLogEntry
 from app.models.project import Project
-from app.repositories.project_repository import ProjectRepository
+from app.models.task import TaskStatus
+from app.repositories.project_repository import PROJECT_FIELD_COLUMNS, ProjectRepository
+from app.cache import entity_cache, project_key, task_key
+from app.services import quota_service
+from app.services.change_feed_service import record_changes
+from app.services.bulk_result import BulkItemResult, skip_pending
 from app.api.controller_schemas.requests.project_request_schema import ProjectCreateRequest, ProjectUpdateRequest
 
-MAX_PROJECTS_LIMIT = 50
+def _validate_project_text(name: str, description: str | None) -> None:
+    """قوانین تعداد کلمات نام و توضیحات پروژه."""
+    if len(name.split()) > 30:
+        raise ValueError("Project name cannot exceed 30 words.")
+    
+    if description and len(description.split()) > 150:
+        raise ValueError("Project description cannot exceed 150 words.")
 
 def create_project(db: Session, request: ProjectCreateRequest) -> Project:
     """یک پروژه جدید ایجاد می‌کند."""
     repo = ProjectRepository(db)
 
-    # 1. بیزینس لاجیک: بررسی سقف تعداد پروژه‌ها
-    if len(repo.get_all_projects(limit=1000)) >= MAX_PROJECTS_LIMIT:
-        raise ValueError("Cannot create more projects. The maximum limit has been reached.")
+    # 1. بیزینس لاجیک: تعداد کلمات
+    _validate_project_text(request.name, request.description)
 
-    # 2. بیزینس لاجیک: نام تکراری
-    if repo.get_project_by_name(request.name):
-        raise ValueError(f"A project with the name '{request.name}' already exists.")
+    with unit_of_work(db) as uow:
+        # 2. بیزینس لاجیک: بررسی سقف تعداد پروژه‌ها (شمارش تجمعی زیر قفل تراکنش)
+        quota_service.reserve_project_slots(db)
 
-    # 3. بیزینس لاجیک: تعداد کلمات
-    if len(request.name.split()) > 30:
-        raise ValueError("Project name cannot exceed 30 words.")
-    
-    if request.description and len(request.description.split()) > 150:
-        raise ValueError("Project description cannot exceed 150 words.")
+        # 3. ذخیره؛ نام تکراری را constraint یکتا (ON CONFLICT) تشخیص می‌دهد، نه یک SELECT جدا
+        project = repo.create_project(name=request.name, description=request.description)
+        if project is None:
+            raise ValueError(f"A project with the name '{request.name}' already exists.")
+        record_changes(uow, ChangeLogEntry.PROJECT, ChangeLogEntry.CREATED, [(project.id, project.id)])
+        uow.on_commit(entity_cache.put, project_key(project.id), project)
+    return project
+
+def create_projects_bulk(db: Session, requests: list[ProjectCreateRequest], atomic: bool = True,
+                         ids: list[int | None] | None = None) -> list[BulkItemResult]:
+    """
+    ایجاد گروهی پروژه‌ها در یک تراکنش.
+    سهمیه یک بار برای کل دسته رزرو می‌شود و درج با یک INSERT چندردیفی (ON CONFLICT DO NOTHING)
+    انجام می‌شود؛ نام‌هایی که در RETURNING نیستند در دیتابیس تکراری بوده‌اند.
+    ids (اختیاری، برای بازگردانی خروجی) شناسه هر آیتم را تعیین می‌کند؛ None یعنی شناسه جدید.
+    """
+    repo = ProjectRepository(db)
+    results = [BulkItemResult(index=i) for i in range(len(requests))]
+
+    # 1. اعتبارسنجی آیتم‌ها و نام‌های تکراری داخل دسته
+    seen = set()
+    for result, request in zip(results, requests):
+        try:
+            _validate_project_text(request.name, request.description)
+        except ValueError as e:
+            result.error = str(e)
+            continue
+        if request.name in seen:
+            result.error = f"Duplicate project name '{request.name}' in batch."
+        seen.add(request.name)
+
+    if atomic and any(r.error for r in results):
+        skip_pending(results)
+        return results
 
-    # 4. ذخیره
-    return repo.create_project(name=request.name, description=request.description)
+    accepted = [r.index for r in results if not r.error]
+    if not accepted:
+        return results
 
-def get_projects(db: Session, skip: int = 0, limit: int = 100):
+    with unit_of_work(db) as uow:
+        # 2. سقف تعداد پروژه‌ها: یک بار برای کل دسته
+        try:
+            quota_service.reserve_project_slots(db, len(accepted))
+        except QuotaExceededError as e:
+            uow.rollback()
+            for index in accepted:
+                results[index].error = str(e)
+            return results
+
+        # 3. درج چندردیفی و commit واحد
+        rows = [{"name": requests[i].name, "description": requests[i].description} for i in accepted]
+        if ids:
+            for row, index in zip(rows, accepted):
+                if ids[index] is not None:
+                    row["id"] = ids[index]
+        inserted = repo.create_projects_bulk(rows)
+        record_changes(uow, ChangeLogEntry.PROJECT, ChangeLogEntry.CREATED, ((i, i) for i in inserted.values()))
+        for index in accepted:
+            if requests[index].name in inserted:
+                results[index].id = inserted[requests[index].name]
+            else:
+                results[index].error = f"A project with the name '{requests[index].name}' already exists."
+        if atomic and len(inserted) < len(accepted):
+            uow.rollback()
+            for index in accepted:
+                results[index].id = None
+            skip_pending(results)
+    return results
+
+def get_projects(db: Session, skip: int = 0, limit: int = 100, after_id: int | None = None):
     repo = ProjectRepository(db)
-    return repo.get_all_projects(skip=skip, limit=limit)
+    return repo.get_all_projects(skip=skip, limit=limit, after_id=after_id)
+
+def get_project_rows(db: Session, skip: int = 0, limit: int = 100, after_id: int | None = None,
+                     columns: list | None = None):
+    """لیست پروژه‌ها به صورت ردیف‌های Core (مسیر سریع API)؛ columns برای sparse fieldsets."""
+    repo = ProjectRepository(db)
+    return repo.get_all_project_rows(skip=skip, limit=limit, after_id=after_id, columns=columns)
+
+def get_projects_version(db: Session):
+    repo = ProjectRepository(db)
+    return repo.get_version()
 
 def get_project(db: Session, project_id: int):
+    """دریافت پروژه (snapshot فقط‌خواندنی) از طریق کش read-through."""
+    repo = ProjectRepository(db)
+    return entity_cache.get_or_load(project_key(project_id), lambda: repo.get_project_by_id(project_id))
+
+def get_projects_stats(db: Session, project_ids: list[int], today: date | None = None) -> dict[int, dict]:
+    """
+    آمار تسک‌های چند پروژه (تعداد به تفکیک وضعیت، تاریخ‌گذشته‌ها و نزدیک‌ترین ددلاین)
+    با یک کوئری؛ کلید نتیجه شناسه پروژه است و پروژه‌های ناموجود در آن نیستند.
+    """
     repo = ProjectRepository(db)
-    return repo.get_project_by_id(project_id)
+    rows = repo.get_task_stats(set(project_ids), today or date.today())
+    return {
+        row["project_id"]: {
+            "project_id": row["project_id"],
+            "total": row["total"],
+            "by_status": {status.value: row[status.value] for status in TaskStatus},
+            "overdue": row["overdue"],
+            "next_deadline": row["next_deadline"],
+        }
+        for row in rows
+    }
 
 def update_project(db: Session, project_id: int, request: ProjectUpdateRequest):
     repo = ProjectRepository(db)
-    project = repo.get_project_by_id(project_id)
-    if not project:
-        return None
+    values = {}
 
     if request.name:
-        existing = repo.get_project_by_name(request.name)
-        if existing and existing.id != project_id:
-            raise ValueError(f"Another project with name '{request.name}' already exists.")
-        
         if len(request.name.split()) > 30:
             raise ValueError("New project name cannot exceed 30 words.")
-        project.name = request.name
+        values["name"] = request.name
 
     if request.description:
         if len(request.description.split()) > 150:
             raise ValueError("New project description cannot exceed 150 words.")
-        project.description = request.description
+        values["description"] = request.description
+
+    if not values:
+        return get_project(db, project_id)
 
-    return repo.update_project(project)
+    # یک UPDATE ... RETURNING؛ نام تکراری را constraint یکتا تشخیص می‌دهد
+    try:
+        with unit_of_work(db) as uow:
+            project = repo.update_project(project_id, values)
+            if project is not None:
+                record_changes(uow, ChangeLogEntry.PROJECT, ChangeLogEntry.UPDATED, [(project_id, project_id)])
+            uow.on_commit(entity_cache.invalidate, project_key(project_id))
+    except IntegrityError:
+        raise ValueError(f"Another project with name '{request.name}' already exists.")
+    return project
 
 def delete_project(db: Session, project_id: int):
     repo = ProjectRepository(db)
-    project = repo.get_project_by_id(project_id)
-    if not project:
-        return False
-    repo.delete_project(project)
+    with unit_of_work(db) as uow:
+        deleted = repo.delete_project(project_id)
+        if deleted is None:
+            return False
+        _, task_ids = deleted
+        record_changes(uow, ChangeLogEntry.TASK, ChangeLogEntry.DELETED, ((i, project_id) for i in task_ids))
+        record_changes(uow, ChangeLogEntry.PROJECT, ChangeLogEntry.DELETED, [(project_id, project_id)])
+        uow.on_commit(entity_cache.invalidate, project_key(project_id), *(task_key(i) for i in task_ids))
     return True
\ No newline at end of file
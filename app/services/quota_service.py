@@ -0,0 +1,38 @@
+"""
+زیرسیستم سهمیه (Quota) برای سقف تعداد پروژه‌ها و تسک‌های هر پروژه.
+
+رزرو سهمیه باید در همان تراکنشی انجام شود که ردیف جدید درج می‌شود؛
+با commit هر دو ثبت می‌شوند و با rollback هر دو برمی‌گردند.
+"""
+from sqlalchemy.orm import Session
+from app import config
+from app.exceptions.base import ProjectNotFoundError, QuotaExceededError
+from app.repositories.quota_repository import QuotaRepository
+
+
+def reserve_project_slots(db: Session, count: int = 1) -> None:
+    """جا برای count پروژه جدید رزرو می‌کند یا QuotaExceededError می‌دهد."""
+    repo = QuotaRepository(db)
+    repo.lock_project_quota()
+    if repo.count_projects() + count > config.MAX_NUMBER_OF_PROJECT:
+        raise QuotaExceededError("Cannot create more projects. The maximum limit has been reached.")
+
+
+def reserve_task_slots(db: Session, project_id: int, count: int = 1, project_name: str | None = None) -> None:
+    """
+    جا برای count تسک جدید در پروژه رزرو می‌کند یا QuotaExceededError می‌دهد.
+    اگر UPDATE ردیفی را عوض نکند و پروژه دیگر وجود نداشته باشد (مثلاً snapshot کش‌شده کهنه بود)
+    ProjectNotFoundError می‌دهد، نه خطای سقف.
+    """
+    repo = QuotaRepository(db)
+    if not repo.try_reserve_task_slots(project_id, count, config.MAX_NUMBER_OF_TASK_PER_PROJECT):
+        if not repo.project_exists(project_id):
+            raise ProjectNotFoundError(f"Project with ID {project_id} not found.")
+        raise QuotaExceededError(
+            f"Cannot add more tasks. Project '{project_name or project_id}' has reached the limit."
+        )
+
+
+def release_task_slots(db: Session, project_id: int, count: int = 1) -> None:
+    """سهمیه تسک‌های حذف‌شده را به پروژه برمی‌گرداند."""
+    QuotaRepository(db).release_task_slots(project_id, count)
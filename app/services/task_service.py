@@ -1,78 +1,225 @@
+from collections import defaultdict
+from datetime import date, datetime
 from sqlalchemy.orm import Session
+from app.db.unit_of_work import unit_of_work
+from app.exceptions.base import ProjectNotFoundError, QuotaExceededError
+from app.models.change_log import ChangeLogEntry
 from app.models.task import Task, TaskStatus
-from app.repositories.task_repository import TaskRepository
+from app.repositories.task_repository import KEYSET_SORTS, TASK_FIELD_COLUMNS, TASK_SORT_FIELDS, TaskFilter, TaskRepository
 from app.repositories.project_repository import ProjectRepository
+from app.cache import entity_cache, project_key, task_key
+from app.services import project_service, quota_service
+from app.services.change_feed_service import record_changes
+from app.services.bulk_result import BulkItemResult, skip_pending
 from app.api.controller_schemas.requests.task_request_schema import TaskCreateRequest, TaskUpdateRequest
 
-MAX_TASKS_PER_PROJECT = 100
+def _validate_task_text(title: str, description: str | None) -> None:
+    """قوانین تعداد کلمات عنوان و توضیحات تسک."""
+    if len(title.split()) > 30:
+        raise ValueError("Task title cannot exceed 30 words.")
+    
+    if description and len(description.split()) > 150:
+        raise ValueError("Task description cannot exceed 150 words.")
+
+def _is_overdue(deadline: date | datetime | None, status: TaskStatus | None) -> bool:
+    """آیا تسک با این ددلاین و وضعیت کاندید autoclose است (برای بیدار کردن scheduler)."""
+    if isinstance(deadline, datetime):  # due_date درخواست‌ها datetime است
+        deadline = deadline.date()
+    return deadline is not None and deadline < date.today() and status != TaskStatus.DONE
 
 def create_task(db: Session, request: TaskCreateRequest) -> Task:
     task_repo = TaskRepository(db)
-    project_repo = ProjectRepository(db)
 
-    # 1. بررسی وجود پروژه
-    project = project_repo.get_project_by_id(request.project_id)
+    # 1. بررسی وجود پروژه (از طریق کش)
+    project = project_service.get_project(db, request.project_id)
     if not project:
         raise ValueError(f"Project with ID {request.project_id} not found.")
 
-    # 2. بررسی سقف تعداد تسک
-    if len(project.tasks) >= MAX_TASKS_PER_PROJECT:
-        raise ValueError(f"Cannot add more tasks. Project '{project.name}' has reached the limit.")
+    # 2. بررسی تعداد کلمات
+    _validate_task_text(request.title, request.description)
 
-    # 3. بررسی تعداد کلمات
-    if len(request.title.split()) > 30:
-        raise ValueError("Task title cannot exceed 30 words.")
-    
-    if request.description and len(request.description.split()) > 150:
-        raise ValueError("Task description cannot exceed 150 words.")
+    with unit_of_work(db) as uow:
+        # 3. رزرو اتمیک سهمیه تسک روی شمارنده پروژه (بدون بارگذاری project.tasks)؛
+        #    اگر پروژه در این فاصله (یا در worker دیگر) حذف شده باشد، snapshot کش کهنه است
+        try:
+            quota_service.reserve_task_slots(db, project.id, project_name=project.name)
+        except ProjectNotFoundError:
+            entity_cache.invalidate(project_key(project.id))
+            raise
+
+        # 4. ایجاد تسک در همان تراکنش رزرو؛ تسک تاریخ‌گذشته scheduler را بیدار می‌کند
+        if _is_overdue(request.due_date, TaskStatus.TODO):
+            task_repo.notify_overdue_change()
+        task = task_repo.add_task_to_project(
+            project=project,
+            title=request.title,
+            description=request.description,
+            deadline=request.due_date 
+        )
+        record_changes(uow, ChangeLogEntry.TASK, ChangeLogEntry.CREATED, [(task.id, task.project_id)])
+        uow.on_commit(entity_cache.put, task_key(task.id), task)
+    return task
+
+def create_tasks_bulk(db: Session, requests: list[TaskCreateRequest], atomic: bool = True,
+                      statuses: list[TaskStatus] | None = None,
+                      ids: list[int | None] | None = None) -> list[BulkItemResult]:
+    """
+    ایجاد گروهی تسک‌ها در یک تراکنش.
+    پروژه‌ها با یک کوئری خوانده می‌شوند، سهمیه برای هر پروژه یک بار رزرو می‌شود
+    و همه ردیف‌ها با یک INSERT چندردیفی درج می‌شوند.
+    در حالت atomic اگر حتی یک آیتم خطا داشته باشد هیچ تسکی ساخته نمی‌شود.
+    statuses (اختیاری، برای ورود داده) وضعیت اولیه هر آیتم را تعیین می‌کند.
+    ids (اختیاری، برای بازگردانی خروجی) شناسه هر آیتم را تعیین می‌کند؛ None یعنی شناسه جدید.
+    """
+    task_repo = TaskRepository(db)
+    project_repo = ProjectRepository(db)
+    results = [BulkItemResult(index=i) for i in range(len(requests))]
+
+    # 1. اعتبارسنجی آیتم‌ها
+    for result, request in zip(results, requests):
+        try:
+            _validate_task_text(request.title, request.description)
+        except ValueError as e:
+            result.error = str(e)
 
-    # 4. ایجاد تسک
-    return task_repo.add_task_to_project(
-        project=project,
-        title=request.title,
-        description=request.description,
-        deadline=request.due_date 
-    )
+    # 2. بررسی وجود پروژه‌ها با یک کوئری
+    projects = project_repo.get_projects_by_ids({r.project_id for r in requests})
+    by_project = defaultdict(list)
+    for result, request in zip(results, requests):
+        if result.error:
+            continue
+        if request.project_id not in projects:
+            result.error = f"Project with ID {request.project_id} not found."
+        else:
+            by_project[request.project_id].append(result.index)
 
-def get_tasks(db: Session, skip: int = 0, limit: int = 100):
+    if atomic and any(r.error for r in results):
+        skip_pending(results)
+        return results
+
+    with unit_of_work(db) as uow:
+        # 3. رزرو سهمیه: یک بار برای هر پروژه، به ترتیب شناسه تا دو درخواست گروهی هم‌پوشان
+        # قفل ردیف پروژه‌ها را با ترتیب یکسان بگیرند و در PostgreSQL به بن‌بست نخورند
+        accepted = []
+        for project_id in sorted(by_project):
+            indexes = by_project[project_id]
+            try:
+                quota_service.reserve_task_slots(db, project_id, len(indexes), project_name=projects[project_id].name)
+            except (QuotaExceededError, ProjectNotFoundError) as e:
+                for index in indexes:
+                    results[index].error = str(e)
+                if atomic:
+                    uow.rollback()
+                    skip_pending(results)
+                    return results
+            else:
+                accepted.extend(indexes)
+
+        # 4. درج چندردیفی و commit واحد
+        accepted.sort()
+        rows = [
+            {
+                "title": requests[i].title,
+                "description": requests[i].description,
+                "deadline": requests[i].due_date,
+                "project_id": requests[i].project_id,
+                "status": statuses[i] if statuses else TaskStatus.TODO,
+            }
+            for i in accepted
+        ]
+        if ids:
+            for row, index in zip(rows, accepted):
+                if ids[index] is not None:
+                    row["id"] = ids[index]
+        if any(_is_overdue(row["deadline"], row["status"]) for row in rows):
+            task_repo.notify_overdue_change()
+        task_ids = task_repo.add_tasks_bulk(rows)
+        record_changes(uow, ChangeLogEntry.TASK, ChangeLogEntry.CREATED,
+                       zip(task_ids, (row["project_id"] for row in rows)))
+        for index, task_id in zip(accepted, task_ids):
+            results[index].id = task_id
+    return results
+
+def get_tasks(db: Session, skip: int = 0, limit: int = 100, after_id: int | None = None,
+              filters: TaskFilter | None = None, sort: str = "id"):
+    repo = TaskRepository(db)
+    return repo.get_all_tasks(skip, limit, after_id=after_id, filters=filters, sort=sort)
+
+def get_task_rows(db: Session, skip: int = 0, limit: int = 100, after_id: int | None = None,
+                  filters: TaskFilter | None = None, sort: str = "id", columns: list | None = None):
+    """لیست تسک‌ها به صورت ردیف‌های Core (مسیر سریع API)؛ columns برای sparse fieldsets."""
+    repo = TaskRepository(db)
+    return repo.get_all_task_rows(skip, limit, after_id=after_id, filters=filters, sort=sort, columns=columns)
+
+def search_tasks(db: Session, query: str, project_id: int | None = None, limit: int = 20,
+                 after: tuple[float, int] | None = None):
+    """جست‌وجوی متنی رتبه‌بندی‌شده (ردیف‌های Core با ستون rank)."""
     repo = TaskRepository(db)
-    return repo.get_all_tasks(skip, limit)
+    return repo.search_task_rows(query, project_id, limit, after)
+
+def get_tasks_version(db: Session, filters: TaskFilter | None = None):
+    repo = TaskRepository(db)
+    return repo.get_version(filters)
+
+def get_tasks_for_project(db: Session, project_id: int):
+    repo = TaskRepository(db)
+    return repo.get_tasks_for_project(project_id)
+
+def get_tasks_for_projects(db: Session, project_ids: list[int], per_project_limit: int | None = None,
+                           status: TaskStatus | None = None) -> dict[int, list[Task]]:
+    """تسک‌های چند پروژه با یک کوئری (برای include=tasks در لیست پروژه‌ها)."""
+    repo = TaskRepository(db)
+    return repo.get_tasks_for_projects(project_ids, per_project_limit, status)
 
 def get_task(db: Session, task_id: int):
+    """دریافت تسک (snapshot فقط‌خواندنی) از طریق کش read-through."""
     repo = TaskRepository(db)
-    return repo.get_task_by_id(task_id)
+    return entity_cache.get_or_load(task_key(task_id), lambda: repo.get_task_by_id(task_id))
 
 def update_task(db: Session, task_id: int, request: TaskUpdateRequest):
     repo = TaskRepository(db)
-    task = repo.get_task_by_id(task_id)
-    if not task:
-        return None
+    values = {}
 
     if request.title:
         if len(request.title.split()) > 30:
             raise ValueError("New task title cannot exceed 30 words.")
-        task.title = request.title
+        values["title"] = request.title
 
     if request.description:
         if len(request.description.split()) > 150:
             raise ValueError("New task description cannot exceed 150 words.")
-        task.description = request.description
+        values["description"] = request.description
     
     if request.due_date is not None:
-        task.deadline = request.due_date
+        values["deadline"] = request.due_date
         
     if request.status:
         try:
-            task.status = TaskStatus(request.status.lower())
+            values["status"] = TaskStatus(request.status.lower())
         except ValueError:
             raise ValueError("Invalid status")
 
-    return repo.update_task(task)
+    if not values:
+        return get_task(db, task_id)
+
+    # یک UPDATE ... RETURNING به جای SELECT + commit + refresh
+    with unit_of_work(db) as uow:
+        task = repo.update_task(task_id, values)
+        if task is None:
+            return None
+        if ("deadline" in values or "status" in values) and _is_overdue(task.deadline, task.status):
+            repo.notify_overdue_change()
+        record_changes(uow, ChangeLogEntry.TASK, ChangeLogEntry.UPDATED, [(task_id, task.project_id)])
+        uow.on_commit(entity_cache.invalidate, task_key(task_id))
+    return task
 
 def delete_task(db: Session, task_id: int):
     repo = TaskRepository(db)
-    task = repo.get_task_by_id(task_id)
-    if not task:
-        return False
-    repo.delete_task(task)
-    return True
\ No newline at end of file
+    with unit_of_work(db) as uow:
+        project_id = repo.delete_task(task_id)
+        if project_id is None:
+            return False
+        quota_service.release_task_slots(db, project_id)
+        record_changes(uow, ChangeLogEntry.TASK, ChangeLogEntry.DELETED, [(task_id, project_id)])
+        uow.on_commit(entity_cache.invalidate, task_key(task_id))
+    return True
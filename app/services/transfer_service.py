@@ -0,0 +1,267 @@
+"""
+خروجی و ورودی جریانی (streaming) تسک‌ها و پروژه‌ها با فرمت NDJSON و CSV.
+
+خروجی از کرسر سمت سرور (yield_per / stream_results) خوانده می‌شود و ورودی
+دسته به دسته پردازش و با INSERT چندردیفی درج می‌شود؛ در هر دو حالت حافظه
+مصرفی به اندازه یک دسته است، نه کل فایل.
+
+ورودی، خروجی همین ماژول را بازمی‌گرداند: ردیف‌هایی که ستون id دارند با همان شناسه درج
+می‌شوند، پس project_id تسک‌ها همچنان به پروژه درست اشاره می‌کند. ردیفی که شناسه‌اش با
+همان داده از قبل وجود دارد رد می‌شود (skipped)، پس ورود دوباره یک فایل تکرار نمی‌سازد.
+ردیف‌های بدون id شناسه جدید می‌گیرند.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from typing import IO, Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+from app.services import project_service, task_service
+from app.services.bulk_result import BulkItemResult
+from app.api.controller_schemas.requests.project_request_schema import ProjectCreateRequest
+from app.api.controller_schemas.requests.task_request_schema import TaskCreateRequest
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+TASK_EXPORT_COLUMNS = (Task.id, Task.title, Task.description, Task.status, Task.deadline, Task.project_id, Task.created_at)
+PROJECT_EXPORT_COLUMNS = (Project.id, Project.name, Project.description, Project.created_at)
+
+FORMATS = ("ndjson", "csv")
+
+
+@dataclass
+class ImportResult:
+    """گزارش یک عملیات ورود داده."""
+    rows: int = 0
+    created: int = 0
+    skipped: int = 0
+    failed: int = 0
+    batches: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"row {line}: {message}")
+
+
+# --- خروجی ---
+
+def _plain(value):
+    """مقادیر دیتابیس را به مقادیر قابل نوشتن در JSON/CSV تبدیل می‌کند."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _iter_rows(db: Session, columns, order_by, where=None, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[dict]:
+    stmt = select(*columns).order_by(order_by)
+    if where is not None:
+        stmt = stmt.where(where)
+    result = db.execute(stmt, execution_options={"yield_per": batch_size})
+    for row in result.mappings():
+        yield {key: _plain(value) for key, value in row.items()}
+
+
+def _encode(rows: Iterable[dict], fmt: str, headers: list[str], batch_size: int) -> Iterator[str]:
+    """ردیف‌ها را دسته به دسته به متن NDJSON یا CSV تبدیل می‌کند."""
+    buffer = io.StringIO()
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=headers)
+        writer.writeheader()
+
+    pending = 0
+    for row in rows:
+        if writer:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False))
+            buffer.write("\n")
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_tasks(db: Session, fmt: str = "ndjson", project_id: int | None = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """خروجی جریانی تسک‌ها (اختیاری: فقط یک پروژه)."""
+    where = Task.project_id == project_id if project_id is not None else None
+    rows = _iter_rows(db, TASK_EXPORT_COLUMNS, Task.id, where, batch_size)
+    return _encode(rows, fmt, [c.key for c in TASK_EXPORT_COLUMNS], batch_size)
+
+
+def export_projects(db: Session, fmt: str = "ndjson", batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """خروجی جریانی پروژه‌ها."""
+    rows = _iter_rows(db, PROJECT_EXPORT_COLUMNS, Project.id, batch_size=batch_size)
+    return _encode(rows, fmt, [c.key for c in PROJECT_EXPORT_COLUMNS], batch_size)
+
+
+# --- ورودی ---
+
+def _read_records(stream: IO[str], fmt: str) -> Iterator[tuple[int, dict | None, str | None]]:
+    """ردیف‌ها را یکی یکی از جریان متنی می‌خواند: (شماره ردیف، داده، خطا)."""
+    if fmt == "csv":
+        for line, record in enumerate(csv.DictReader(stream), start=2):
+            yield line, {k: (v if v != "" else None) for k, v in record.items()}, None
+        return
+
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            yield line, None, f"invalid JSON ({e})"
+            continue
+        if not isinstance(record, dict):
+            yield line, None, "expected a JSON object"
+            continue
+        yield line, record, None
+
+
+def _batches(records: Iterator, batch_size: int) -> Iterator[list]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _record_id(record: dict) -> int | None:
+    """ستون id ردیف (از خروجی)؛ None یعنی شناسه جدید."""
+    value = record.get("id")
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"id: invalid value {value!r}")
+
+
+def _insert_new(items: list[tuple], existing: dict, key, create, label: str) -> list[BulkItemResult | None]:
+    """
+    items به شکل (id, ...) هستند و existing شناسه‌های موجود دسته را به key ذخیره‌شده نگاشت می‌کند.
+    شناسه‌ای که با همان key وجود دارد قبلاً وارد شده است (None = skipped)؛ با key دیگر خطاست.
+    بقیه با create(items) درج می‌شوند؛ نتیجه هم‌ترتیب با items است.
+    """
+    results: list[BulkItemResult | None] = [None] * len(items)
+    pending, seen = [], set()
+    for index, item in enumerate(items):
+        item_id = item[0]
+        if item_id is not None:
+            if item_id in existing:
+                if existing[item_id] != key(item):
+                    results[index] = BulkItemResult(index=index, error=f"{label} ID {item_id} already exists with different data.")
+                continue
+            if item_id in seen:
+                results[index] = BulkItemResult(index=index, error=f"Duplicate {label.lower()} ID {item_id} in batch.")
+                continue
+            seen.add(item_id)
+        pending.append(index)
+
+    for index, item_result in zip(pending, create([items[i] for i in pending])):
+        results[index] = item_result
+    return results
+
+
+def _import(stream: IO[str], fmt: str, batch_size: int, parse, insert) -> ImportResult:
+    result = ImportResult()
+    for batch in _batches(_read_records(stream, fmt), batch_size):
+        lines, items = [], []
+        for line, record, error in batch:
+            result.rows += 1
+            if error is None:
+                try:
+                    items.append(parse(record))
+                    lines.append(line)
+                    continue
+                except ValidationError as e:
+                    first = e.errors()[0]
+                    error = f"{'.'.join(str(p) for p in first['loc'])}: {first['msg']}"
+                except ValueError as e:
+                    error = str(e)
+            result.add_error(line, error)
+
+        if not items:
+            continue
+        result.batches += 1
+        for line, item_result in zip(lines, insert(items)):
+            if item_result is None:
+                result.skipped += 1
+            elif item_result.error:
+                result.add_error(line, item_result.error)
+            else:
+                result.created += 1
+    return result
+
+
+def import_tasks(db: Session, stream: IO[str], fmt: str = "ndjson", batch_size: int = DEFAULT_BATCH_SIZE) -> ImportResult:
+    """
+    تسک‌ها را از جریان NDJSON/CSV (ستون‌های همان خروجی) دسته به دسته درج می‌کند.
+    هر دسته از مسیر create_tasks_bulk عبور می‌کند، پس قوانین و سهمیه‌ها رعایت می‌شوند.
+    شناسه خروجی حفظ می‌شود؛ تسکی که با همان پروژه و عنوان وجود دارد رد می‌شود.
+    """
+    def parse(record: dict):
+        request = TaskCreateRequest(
+            title=record.get("title"),
+            description=record.get("description"),
+            due_date=record.get("deadline") or record.get("due_date"),
+            project_id=record.get("project_id"),
+        )
+        return _record_id(record), request, TaskStatus(record.get("status") or TaskStatus.TODO)
+
+    def insert(items):
+        rows = TaskRepository(db).get_task_rows_by_ids({item[0] for item in items if item[0] is not None})
+        existing = {row.id: (row.project_id, row.title) for row in rows}
+        return _insert_new(items, existing, lambda item: (item[1].project_id, item[1].title), create, "Task")
+
+    def create(items):
+        return task_service.create_tasks_bulk(db, [request for _, request, _ in items], atomic=False,
+                                              statuses=[status for _, _, status in items],
+                                              ids=[task_id for task_id, _, _ in items])
+
+    return _import(stream, fmt, batch_size, parse, insert)
+
+
+def import_projects(db: Session, stream: IO[str], fmt: str = "ndjson", batch_size: int = DEFAULT_BATCH_SIZE) -> ImportResult:
+    """
+    پروژه‌ها را از جریان NDJSON/CSV دسته به دسته درج می‌کند.
+    شناسه خروجی حفظ می‌شود تا تسک‌های واردشده بعدی به همان پروژه وصل شوند؛ پروژه‌ای که
+    با همان نام وجود دارد رد می‌شود.
+    """
+    def parse(record: dict):
+        return _record_id(record), ProjectCreateRequest(name=record.get("name"), description=record.get("description"))
+
+    def insert(items):
+        rows = ProjectRepository(db).get_project_rows_by_ids({item[0] for item in items if item[0] is not None})
+        existing = {row.id: row.name for row in rows}
+        return _insert_new(items, existing, lambda item: item[1].name, create, "Project")
+
+    def create(items):
+        return project_service.create_projects_bulk(db, [request for _, request in items], atomic=False,
+                                                    ids=[project_id for project_id, _ in items])
+
+    return _import(stream, fmt, batch_size, parse, insert)
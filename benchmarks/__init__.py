@@ -0,0 +1,6 @@
+"""
+مجموعه بنچمارک قابل تکرار برای API، سرویس‌ها و jobها.
+
+اجرا:
+    python -m benchmarks.run --scale 10k --seed --output results.json
+"""
@@ -0,0 +1,106 @@
+"""
+ابزارهای اندازه‌گیری بنچمارک: تأخیر، تعداد دستورات SQL و اوج حافظه.
+"""
+import math
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def percentile(sorted_values: list[float], pct: float) -> float | None:
+    """صدک به روش nearest-rank روی یک لیست مرتب‌شده."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure_peak_memory(fn: Callable[[], object]) -> int:
+    """
+    اوج حافظه تخصیص‌یافته پایتون (tracemalloc) در طول یک فراخوانی را برمی‌گرداند.
+    tracemalloc خودش کند است، پس این اندازه‌گیری جدا از اجراهای زمان‌دار انجام می‌شود.
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+class QueryCounter:
+    """دستورات SQL اجراشده روی موتورهای متصل‌شده را می‌شمارد (برای چند thread امن است)."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+        self._engines: list[Engine] = []
+
+    def attach(self, *engines: Engine) -> None:
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+            self._engines.append(engine)
+
+    def detach(self) -> None:
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._on_execute)
+        self._engines.clear()
+
+    def take(self) -> int:
+        """شمارش فعلی را برمی‌گرداند و صفر می‌کند."""
+        with self._lock:
+            count, self.count = self.count, 0
+            return count
+
+    def _on_execute(self, *args) -> None:
+        with self._lock:
+            self.count += 1
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+@dataclass
+class ScenarioResult:
+    """نتیجه یک سناریو؛ to_dict خروجی JSON پایدار برای مقایسه اجراها می‌سازد."""
+    name: str
+    group: str
+    mode: str = "inprocess"
+    requests: int = 0
+    errors: int = 0
+    wall_seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list, repr=False)
+    sql_statements: int | None = None
+    peak_memory_bytes: int | None = None
+    extra: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "name": self.name,
+            "group": self.group,
+            "mode": self.mode,
+            "requests": self.requests,
+            "errors": self.errors,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "throughput_per_sec": round(self.requests / self.wall_seconds, 2) if self.wall_seconds else None,
+            "latency_ms": {
+                "p50": _ms(percentile(latencies, 50)),
+                "p95": _ms(percentile(latencies, 95)),
+                "p99": _ms(percentile(latencies, 99)),
+                "mean": _ms(sum(latencies) / len(latencies)) if latencies else None,
+                "max": _ms(latencies[-1]) if latencies else None,
+            },
+            "sql_per_request": (
+                round(self.sql_statements / self.requests, 2)
+                if self.sql_statements is not None and self.requests else None
+            ),
+            "peak_memory_bytes": self.peak_memory_bytes,
+            **({"extra": self.extra} if self.extra else {}),
+        }
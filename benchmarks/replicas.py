@@ -0,0 +1,122 @@
+"""
+اجرای همزمان چند پردازه scheduler روی یک دیتابیس محلی PostgreSQL و مقایسه حالت‌های هماهنگی.
+
+برای هر حالت (none، lease، skip_locked) تسک‌های تاریخ‌گذشته دوباره باز می‌شوند، سپس
+--replicas پردازه جداگانه با هم یک دور catch-up اجرا می‌کنند. گزارش هر حالت:
+- rows_reported: مجموع تسک‌هایی که replicaها گزارش کرده‌اند بسته‌اند؛
+- duplicates: اختلاف آن با تعداد واقعی (کار تکراری روی ردیف‌های مشترک)؛
+- active_replicas: چند replica واقعاً ردیفی بسته‌اند؛
+- remaining: تسک تاریخ‌گذشته باز بعد از اجرا (باید 0 باشد).
+
+دیتابیس همان DB_* فایل .env است و باید با benchmarks.run --seed پر شده باشد؛ تسک‌هایی
+که در اجرا بسته می‌شوند در پایان دوباره باز می‌شوند.
+
+مثال:
+    python -m benchmarks.replicas --replicas 4 --modes none,lease,skip_locked
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from datetime import date
+
+from sqlalchemy import func, select, update
+
+from app import config
+from app.db.base import utcnow
+from app.db.session import SessionLocal, get_engine
+from app.models.task import Task, TaskStatus
+from app.repositories.task_repository import overdue_clauses
+from app.services.autoclose_scheduler import COORDINATION_MODES, DeadlineScheduler
+
+
+def _replica(mode: str, chunk_size: int, barrier, results) -> None:
+    """یک پردازه scheduler: بعد از رسیدن همه به barrier یک دور catch-up اجرا می‌کند."""
+    config.AUTOCLOSE_CHUNK_SIZE = chunk_size
+    scheduler = DeadlineScheduler(SessionLocal, get_engine(), coordination=mode, log=lambda message: None)
+    barrier.wait()
+    started = time.perf_counter()
+    try:
+        rows = scheduler.tick(changed=False)
+    finally:
+        scheduler.close()
+    results.put({"rows": rows, "seconds": time.perf_counter() - started})
+
+
+def _overdue_count() -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(Task).where(*overdue_clauses(date.today())))
+
+
+def _reopen_closed_since(started) -> None:
+    """تسک‌هایی که این اجرا بسته است (همه در seed با وضعیت TODO) را دوباره باز می‌کند."""
+    with SessionLocal() as db:
+        db.execute(update(Task).where(Task.status == TaskStatus.DONE, Task.updated_at >= started)
+                   .values(status=TaskStatus.TODO), execution_options={"synchronize_session": False})
+        db.commit()
+
+
+def run_mode(mode: str, replicas: int, chunk_size: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(replicas)
+    results = ctx.Queue()
+    overdue = _overdue_count()
+    started_at = utcnow()
+
+    processes = [ctx.Process(target=_replica, args=(mode, chunk_size, barrier, results)) for _ in range(replicas)]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    wall = time.perf_counter() - started
+
+    remaining = _overdue_count()
+    _reopen_closed_since(started_at)
+    reported = sum(r["rows"] for r in reports)
+    return {
+        "mode": mode,
+        "replicas": replicas,
+        "overdue_before": overdue,
+        "rows_reported": reported,
+        "duplicates": reported - (overdue - remaining),
+        "active_replicas": sum(1 for r in reports if r["rows"]),
+        "remaining": remaining,
+        "slowest_replica_seconds": round(max(r["seconds"] for r in reports), 3),
+        "wall_seconds": round(wall, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several scheduler processes at once and compare coordination modes.")
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--modes", default=",".join(COORDINATION_MODES),
+                        help=f"Comma-separated modes (default: {','.join(COORDINATION_MODES)}).")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--output", default=None, help="Write JSON results to this file (default: stdout).")
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes.split(","):
+        result = run_mode(mode.strip(), args.replicas, args.chunk_size)
+        results.append(result)
+        print(f"  {mode}: {result['rows_reported']} rows by {result['active_replicas']} replica(s), "
+              f"{result['duplicates']} duplicate(s), {result['remaining']} left, {result['wall_seconds']}s",
+              file=sys.stderr)
+        if result["remaining"]:
+            print(f"❌ {mode}: {result['remaining']} overdue task(s) were not closed.", file=sys.stderr)
+
+    text = json.dumps({"results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if any(r["remaining"] or (r["mode"] != "none" and r["duplicates"]) for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+اجرای بنچمارک و نوشتن نتایج به صورت JSON.
+
+مثال‌ها:
+    # پر کردن دیتابیس با 100 هزار تسک و اجرای همه گروه‌ها
+    python -m benchmarks.run --scale 100k --seed --output bench/100k.json
+
+    # فقط endpointهای تسک، 500 تکرار
+    python -m benchmarks.run --groups api --only /api/tasks --iterations 500
+
+    # بار همزمان روی سرور در حال اجرا (uvicorn app.main:app)
+    python -m benchmarks.run --groups http --http-url http://localhost:8000 --concurrency 32
+
+دیتابیس همان DB_* فایل .env است؛ برای بنچمارک یک DB_NAME جداگانه بدهید چون --seed
+جدول‌ها را خالی می‌کند.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import update
+
+from app import config
+from app.cache import configure_cache, entity_cache
+from app.db.session import SessionLocal, get_engine
+from app.models.task import Task, TaskStatus
+from app.services import autoclose_service
+from benchmarks import seed as seeding
+from benchmarks.metrics import QueryCounter, ScenarioResult, measure_peak_memory
+from benchmarks.scenarios import API_SCENARIOS, BenchContext, Call, build_context
+
+GROUPS = ("api", "http", "jobs", "cli")
+DEFAULT_GROUPS = ("api", "jobs", "cli")
+
+# سقف‌های سهمیه در طول بنچمارک عملاً برداشته می‌شوند تا سناریوهای نوشتن با 409 متوقف نشوند
+BENCH_QUOTA = 1_000_000_000
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _send(client, call: Call):
+    return client.request(call.method, call.url, params=call.params, json=call.json,
+                          content=call.content, headers=call.headers)
+
+
+def _is_error(response) -> bool:
+    return response.status_code >= 400
+
+
+# --- API درون‌پردازه‌ای ---
+
+def run_api(ctx: BenchContext, counter: QueryCounter, iterations: int, warmup: int, only: str | None) -> list[ScenarioResult]:
+    """هر سناریو را پشت سر هم از طریق TestClient (بدون شبکه) اجرا می‌کند."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    results = []
+    with TestClient(app) as client:
+        for scenario in API_SCENARIOS:
+            if only and only not in scenario.name:
+                continue
+            count = min(iterations, scenario.max_iterations or iterations)
+            result = ScenarioResult(name=scenario.name, group="api", sql_statements=0)
+            for _ in range(min(warmup, count)):
+                _send(client, scenario.build(ctx, client))
+
+            for _ in range(count):
+                call = scenario.build(ctx, client)
+                counter.take()
+                started = time.perf_counter()
+                response = _send(client, call)
+                elapsed = time.perf_counter() - started
+                result.sql_statements += counter.take()
+                result.latencies.append(elapsed)
+                result.wall_seconds += elapsed
+                result.requests += 1
+                result.errors += _is_error(response)
+
+            call = scenario.build(ctx, client)
+            result.peak_memory_bytes = measure_peak_memory(lambda: _send(client, call))
+            results.append(result)
+            _log(f"  {scenario.name}: p50 {result.to_dict()['latency_ms']['p50']} ms")
+    return results
+
+
+# --- بار HTTP همزمان ---
+
+def run_http(ctx: BenchContext, base_url: str, iterations: int, concurrency: int, only: str | None) -> list[ScenarioResult]:
+    """
+    سناریوهای فقط‌خواندنی را با concurrency درخواست همزمان روی یک سرور واقعی اجرا می‌کند.
+    شمارش SQL و حافظه در این حالت در دسترس نیست (سرور پردازه دیگری است).
+    """
+    import httpx
+
+    results = []
+    with httpx.Client(base_url=base_url, timeout=60.0, limits=httpx.Limits(max_connections=concurrency)) as client:
+        for scenario in API_SCENARIOS:
+            if not scenario.read_only or (only and only not in scenario.name):
+                continue
+            count = min(iterations, scenario.max_iterations or iterations)
+            result = ScenarioResult(name=scenario.name, group="http", mode="http")
+            lock = threading.Lock()
+
+            def one(_):
+                call = scenario.build(ctx, client)
+                started = time.perf_counter()
+                try:
+                    failed = _is_error(_send(client, call))
+                except httpx.HTTPError:
+                    failed = True
+                elapsed = time.perf_counter() - started
+                with lock:
+                    result.latencies.append(elapsed)
+                    result.requests += 1
+                    result.errors += failed
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(one, range(count)))
+            result.wall_seconds = time.perf_counter() - started
+            result.extra["concurrency"] = concurrency
+            results.append(result)
+            _log(f"  {scenario.name}: {result.to_dict()['throughput_per_sec']} req/s")
+    return results
+
+
+# --- jobها ---
+
+def _restore_closed(ids: list[int]) -> None:
+    """تسک‌هایی که autoclose بسته است را به حالت قبل (همه در seed با وضعیت TODO) برمی‌گرداند."""
+    with SessionLocal() as db:
+        for start in range(0, len(ids), seeding.INSERT_BATCH_SIZE):
+            chunk = ids[start:start + seeding.INSERT_BATCH_SIZE]
+            db.execute(update(Task).where(Task.id.in_(chunk)).values(status=TaskStatus.TODO),
+                       execution_options={"synchronize_session": False})
+        db.commit()
+    entity_cache.clear()
+
+
+def run_jobs(counter: QueryCounter, iterations: int) -> list[ScenarioResult]:
+    """
+    job autoclose در حالت dry-run و حالت واقعی. بعد از هر اجرای واقعی تسک‌های بسته‌شده
+    (خارج از زمان‌سنجی) دوباره باز می‌شوند تا اجراهای بعدی روی همان داده باشند.
+    """
+    results = []
+    for dry_run in (True, False):
+        result = ScenarioResult(name="autoclose" + (" (dry run)" if dry_run else ""), group="jobs", sql_statements=0)
+        for _ in range(iterations):
+            closed: list[int] = []
+            with SessionLocal() as db:
+                counter.take()
+                started = time.perf_counter()
+                report = autoclose_service.run_autoclose(db, dry_run=dry_run, on_chunk=closed.extend)
+                elapsed = time.perf_counter() - started
+                result.sql_statements += counter.take()
+            if not dry_run:
+                _restore_closed(closed)
+            result.latencies.append(elapsed)
+            result.wall_seconds += elapsed
+            result.requests += 1
+            result.extra = {"rows": report.rows, "chunks": report.chunks, "chunk_size": config.AUTOCLOSE_CHUNK_SIZE,
+                            "rows_per_sec": round(report.rows / elapsed, 1) if elapsed else None}
+
+        closed = []
+
+        def once():
+            with SessionLocal() as db:
+                autoclose_service.run_autoclose(db, dry_run=dry_run, on_chunk=closed.extend)
+
+        result.peak_memory_bytes = measure_peak_memory(once)
+        if not dry_run:
+            _restore_closed(closed)
+        results.append(result)
+        _log(f"  {result.name}: {result.extra['rows']} rows, p50 {result.to_dict()['latency_ms']['p50']} ms")
+    return results
+
+
+# --- CLI ---
+
+def _run_cli_command(cli, command: str, stdin_text: str) -> None:
+    """یک دستور CLI را با ورودی آماده و خروجی دور ریخته اجرا می‌کند."""
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(stdin_text)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli.commands[command]()
+    finally:
+        sys.stdin = stdin
+
+
+def run_cli(ctx: BenchContext, counter: QueryCounter, iterations: int) -> list[ScenarioResult]:
+    """مسیرهای لیست CLI قدیمی (list-projects، list-tasks با و بدون فیلتر پروژه)."""
+    from app.cli.main import CLI
+
+    cli = CLI()
+    cases = [
+        ("cli list-projects", "list-projects", ""),
+        ("cli list-tasks", "list-tasks", "\n"),
+        ("cli list-tasks <project>", "list-tasks", f"{ctx.middle_project_id}\n"),
+    ]
+    results = []
+    for name, command, stdin_text in cases:
+        result = ScenarioResult(name=name, group="cli", sql_statements=0)
+        for _ in range(iterations):
+            counter.take()
+            started = time.perf_counter()
+            _run_cli_command(cli, command, stdin_text)
+            elapsed = time.perf_counter() - started
+            result.sql_statements += counter.take()
+            result.latencies.append(elapsed)
+            result.wall_seconds += elapsed
+            result.requests += 1
+        result.peak_memory_bytes = measure_peak_memory(lambda: _run_cli_command(cli, command, stdin_text))
+        results.append(result)
+        _log(f"  {name}: p50 {result.to_dict()['latency_ms']['p50']} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the reproducible performance benchmark suite.")
+    parser.add_argument("--scale", default="10k", help="Task count to seed: 10k, 100k, 1m or a number (default: 10k).")
+    parser.add_argument("--seed", action="store_true", help="Wipe and re-seed the database at --scale before running.")
+    parser.add_argument("--random-seed", type=int, default=42, help="Seed for the data generator (default: 42).")
+    parser.add_argument("--groups", default=",".join(DEFAULT_GROUPS),
+                        help=f"Comma-separated groups to run from {', '.join(GROUPS)} (default: {','.join(DEFAULT_GROUPS)}).")
+    parser.add_argument("--only", default=None, help="Only run API scenarios whose name contains this text.")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed requests per API/CLI scenario (default: 200).")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed requests before each API scenario (default: 10).")
+    parser.add_argument("--job-iterations", type=int, default=3, help="Timed runs of each autoclose mode (default: 3).")
+    parser.add_argument("--http-url", default=None, help="Base URL of a running server for the 'http' group.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients in the 'http' group (default: 16).")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the read-through cache during the run.")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file (default: stdout).")
+    args = parser.parse_args()
+
+    groups = [g.strip() for g in args.groups.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(sorted(unknown))}")
+    if "http" in groups and not args.http_url:
+        parser.error("the 'http' group needs --http-url")
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    config.MAX_NUMBER_OF_PROJECT = BENCH_QUOTA
+    config.MAX_NUMBER_OF_TASK_PER_PROJECT = BENCH_QUOTA
+    configure_cache(enabled=not args.no_cache)
+
+    seed_info = None
+    with SessionLocal() as db:
+        if args.seed:
+            tasks = seeding.parse_scale(args.scale)
+            _log(f"🌱 Seeding {tasks} task(s)...")
+            seed_info = seeding.seed(db, tasks, args.random_seed).to_dict()
+            _log(f"   done in {seed_info['seconds']}s")
+        task_count, project_count = seeding.current_size(db)
+
+    counter = QueryCounter()
+    engines = [get_engine()]
+    if config.DB_MODE == "async":
+        from app.db.async_session import async_engine
+        engines.append(async_engine.sync_engine)
+    counter.attach(*engines)
+
+    ctx = build_context(uuid.uuid4().hex[:8])
+    results: list[ScenarioResult] = []
+    try:
+        if "api" in groups:
+            _log("▶ api (in-process)")
+            results += run_api(ctx, counter, args.iterations, args.warmup, args.only)
+        if "http" in groups:
+            _log(f"▶ http ({args.http_url}, concurrency {args.concurrency})")
+            results += run_http(ctx, args.http_url, args.iterations, args.concurrency, args.only)
+        if "cli" in groups:
+            _log("▶ cli")
+            results += run_cli(ctx, counter, args.iterations)
+        if "jobs" in groups:
+            _log("▶ jobs")
+            results += run_jobs(counter, args.job_iterations)
+    finally:
+        counter.detach()
+        with SessionLocal() as db:
+            seeding.cleanup_run_data(db)
+        entity_cache.clear()
+
+    report = {
+        "meta": {
+            "started_at": started_at,
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "db_dialect": get_engine().dialect.name,
+            "db_mode": config.DB_MODE,
+            "cache_enabled": entity_cache.enabled,
+            "scale": {"tasks": task_count, "projects": project_count},
+            "seed": seed_info,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "job_iterations": args.job_iterations,
+            "groups": groups,
+        },
+        "results": [r.to_dict() for r in results],
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        _log(f"✅ Results written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
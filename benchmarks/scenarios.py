@@ -0,0 +1,206 @@
+"""
+سناریوهای بنچمارک: هر endpoint درخواست/پاسخ در app/main.py، job autoclose و مسیرهای لیست CLI.
+جریان‌های /api/events (SSE و WebSocket) تا قطع اتصال باز می‌مانند و اینجا سنجیده نمی‌شوند.
+
+هر سناریوی API یک تابع build دارد که قبل از شروع زمان‌سنجی اجرا می‌شود و یک Call
+(درخواست HTTP) برمی‌گرداند؛ کار آماده‌سازی (مثلاً ساختن پروژه‌ای که قرار است حذف شود)
+همان‌جا انجام می‌شود تا در تأخیر و شمارش SQL درخواست حساب نشود.
+"""
+import itertools
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from sqlalchemy import func, select
+
+from app.api.pagination import encode_cursor
+from app.db.session import SessionLocal
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.services import project_service, task_service
+from app.api.controller_schemas.requests.project_request_schema import ProjectCreateRequest
+from app.api.controller_schemas.requests.task_request_schema import TaskCreateRequest
+from benchmarks.seed import RUN_PREFIX
+
+BULK_SIZE = 100
+IMPORT_SIZE = 100
+STATS_BATCH_SIZE = 100
+
+
+@dataclass
+class Call:
+    method: str
+    url: str
+    params: dict | None = None
+    json: Any = None
+    content: bytes | None = None
+    headers: dict | None = None
+
+
+@dataclass
+class BenchContext:
+    """شناسه‌های نمونه از داده پرشده و یک پروژه موقت برای نوشتن تسک‌ها."""
+    first_project_id: int
+    middle_project_id: int
+    first_task_id: int
+    middle_task_id: int
+    scratch_project_id: int
+    run_id: str
+    _counter: itertools.count = field(default_factory=itertools.count, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def unique(self, label: str) -> str:
+        """نام یکتا برای ساخته‌های این اجرا (با پیشوند RUN_PREFIX تا در پایان پاک شوند)."""
+        with self._lock:
+            return f"{RUN_PREFIX}{self.run_id}-{label}-{next(self._counter)}"
+
+
+def build_context(run_id: str) -> BenchContext:
+    """شناسه‌های نمونه را از دیتابیس پرشده می‌خواند و پروژه موقت را می‌سازد."""
+    with SessionLocal() as db:
+        project_min, project_max = db.execute(select(func.min(Project.id), func.max(Project.id))).one()
+        task_min, task_max = db.execute(select(func.min(Task.id), func.max(Task.id))).one()
+        if project_min is None or task_min is None:
+            raise RuntimeError("The database is empty; run with --seed first.")
+        ctx = BenchContext(
+            first_project_id=project_min,
+            middle_project_id=db.scalar(select(Project.id).where(Project.id >= (project_min + project_max) // 2).limit(1)),
+            first_task_id=task_min,
+            middle_task_id=db.scalar(select(Task.id).where(Task.id >= (task_min + task_max) // 2).limit(1)),
+            scratch_project_id=0,
+            run_id=run_id,
+        )
+        scratch = project_service.create_project(db, ProjectCreateRequest(name=ctx.unique("scratch")))
+        ctx.scratch_project_id = scratch.id
+        return ctx
+
+
+def _new_project(ctx: BenchContext) -> int:
+    with SessionLocal() as db:
+        return project_service.create_project(db, ProjectCreateRequest(name=ctx.unique("p"))).id
+
+
+def _new_task(ctx: BenchContext) -> int:
+    with SessionLocal() as db:
+        request = TaskCreateRequest(title=ctx.unique("t"), project_id=ctx.scratch_project_id)
+        return task_service.create_task(db, request).id
+
+
+def _etag(client, url: str) -> str:
+    return client.get(url).headers.get("etag", "")
+
+
+def _change_cursor(client) -> str:
+    """cursor سر فعلی فید تغییرات؛ درخواست سنجیده‌شده تغییرات بعد از آن را می‌خواند."""
+    return client.get("/api/changes/").json()["cursor"]
+
+
+def _ndjson(rows: list[dict]) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+@dataclass
+class ApiScenario:
+    name: str
+    build: Callable[[BenchContext, Any], Call]
+    read_only: bool = True
+    # سقف تکرار برای سناریوهای سنگین (مثل خروجی کامل جدول)
+    max_iterations: int | None = None
+
+
+API_SCENARIOS = [
+    ApiScenario("GET /", lambda ctx, c: Call("GET", "/")),
+
+    # --- پروژه‌ها ---
+    ApiScenario("GET /api/projects", lambda ctx, c: Call("GET", "/api/projects/", params={"limit": 100})),
+    ApiScenario("GET /api/projects?skip=deep", lambda ctx, c: Call(
+        "GET", "/api/projects/", params={"skip": ctx.middle_project_id - ctx.first_project_id, "limit": 100})),
+    ApiScenario("GET /api/projects?cursor=deep", lambda ctx, c: Call(
+        "GET", "/api/projects/", params={"cursor": encode_cursor({"id": ctx.middle_project_id}), "limit": 100})),
+    ApiScenario("GET /api/projects (304)", lambda ctx, c: Call(
+        "GET", "/api/projects/", params={"limit": 100},
+        headers={"If-None-Match": _etag(c, "/api/projects/?limit=100")})),
+    ApiScenario("GET /api/projects?include=tasks", lambda ctx, c: Call(
+        "GET", "/api/projects/", params={"include": "tasks", "limit": 100})),
+    ApiScenario("GET /api/projects?fields", lambda ctx, c: Call(
+        "GET", "/api/projects/", params={"fields": "id,name", "limit": 100})),
+    ApiScenario("GET /api/projects/{id}", lambda ctx, c: Call("GET", f"/api/projects/{ctx.middle_project_id}")),
+    ApiScenario("GET /api/projects/{id} (304)", lambda ctx, c: Call(
+        "GET", f"/api/projects/{ctx.middle_project_id}",
+        headers={"If-None-Match": _etag(c, f"/api/projects/{ctx.middle_project_id}")})),
+    ApiScenario("GET /api/projects/{id}?include=tasks", lambda ctx, c: Call(
+        "GET", f"/api/projects/{ctx.middle_project_id}", params={"include": "tasks"})),
+    ApiScenario("GET /api/projects/{id}/stats", lambda ctx, c: Call("GET", f"/api/projects/{ctx.middle_project_id}/stats")),
+    ApiScenario("GET /api/projects/stats", lambda ctx, c: Call(
+        "GET", "/api/projects/stats",
+        params={"ids": ",".join(str(ctx.first_project_id + i) for i in range(STATS_BATCH_SIZE))})),
+    ApiScenario("GET /api/projects/export", lambda ctx, c: Call(
+        "GET", "/api/projects/export", params={"format": "ndjson"}), max_iterations=5),
+    ApiScenario("POST /api/projects", lambda ctx, c: Call(
+        "POST", "/api/projects/", json={"name": ctx.unique("p")}), read_only=False),
+    ApiScenario("POST /api/projects/bulk", lambda ctx, c: Call(
+        "POST", "/api/projects/bulk", json={"items": [{"name": ctx.unique("b")} for _ in range(BULK_SIZE)]}),
+        read_only=False),
+    ApiScenario("POST /api/projects/import", lambda ctx, c: Call(
+        "POST", "/api/projects/import", params={"format": "ndjson"},
+        content=_ndjson([{"name": ctx.unique("i")} for _ in range(IMPORT_SIZE)])), read_only=False),
+    ApiScenario("PUT /api/projects/{id}", lambda ctx, c: Call(
+        "PUT", f"/api/projects/{ctx.scratch_project_id}", json={"description": ctx.unique("d")}), read_only=False),
+    ApiScenario("DELETE /api/projects/{id}", lambda ctx, c: Call(
+        "DELETE", f"/api/projects/{_new_project(ctx)}"), read_only=False),
+
+    # --- تسک‌ها ---
+    ApiScenario("GET /api/tasks", lambda ctx, c: Call("GET", "/api/tasks/", params={"limit": 100})),
+    ApiScenario("GET /api/tasks?skip=deep", lambda ctx, c: Call(
+        "GET", "/api/tasks/", params={"skip": ctx.middle_task_id - ctx.first_task_id, "limit": 100})),
+    ApiScenario("GET /api/tasks?cursor=deep", lambda ctx, c: Call(
+        "GET", "/api/tasks/", params={"cursor": encode_cursor({"id": ctx.middle_task_id}), "limit": 100})),
+    ApiScenario("GET /api/tasks?project_id&status", lambda ctx, c: Call(
+        "GET", "/api/tasks/", params={"project_id": ctx.middle_project_id, "status": TaskStatus.TODO.value})),
+    ApiScenario("GET /api/tasks?status&deadline_before&sort=-deadline", lambda ctx, c: Call(
+        "GET", "/api/tasks/", params={"status": TaskStatus.TODO.value, "deadline_before": "2100-01-01",
+                                      "sort": "-deadline", "limit": 100})),
+    ApiScenario("GET /api/tasks (304)", lambda ctx, c: Call(
+        "GET", "/api/tasks/", params={"limit": 100},
+        headers={"If-None-Match": _etag(c, "/api/tasks/?limit=100")})),
+    ApiScenario("GET /api/tasks?fields", lambda ctx, c: Call(
+        "GET", "/api/tasks/", params={"fields": "id,title,status,deadline", "limit": 100})),
+    ApiScenario("GET /api/tasks/search", lambda ctx, c: Call("GET", "/api/tasks/search", params={"q": "invoice"})),
+    ApiScenario("GET /api/tasks/search?project_id", lambda ctx, c: Call(
+        "GET", "/api/tasks/search", params={"q": "invoice", "project_id": ctx.middle_project_id})),
+    ApiScenario("GET /api/tasks/{id}", lambda ctx, c: Call("GET", f"/api/tasks/{ctx.middle_task_id}")),
+    ApiScenario("GET /api/tasks/{id} (304)", lambda ctx, c: Call(
+        "GET", f"/api/tasks/{ctx.middle_task_id}",
+        headers={"If-None-Match": _etag(c, f"/api/tasks/{ctx.middle_task_id}")})),
+    ApiScenario("GET /api/tasks/export?project_id", lambda ctx, c: Call(
+        "GET", "/api/tasks/export", params={"format": "ndjson", "project_id": ctx.middle_project_id})),
+    ApiScenario("GET /api/tasks/export", lambda ctx, c: Call(
+        "GET", "/api/tasks/export", params={"format": "csv"}), max_iterations=3),
+    ApiScenario("POST /api/tasks", lambda ctx, c: Call(
+        "POST", "/api/tasks/", json={"title": ctx.unique("t"), "project_id": ctx.scratch_project_id}),
+        read_only=False),
+    ApiScenario("POST /api/tasks/bulk", lambda ctx, c: Call(
+        "POST", "/api/tasks/bulk",
+        json={"items": [{"title": ctx.unique("b"), "project_id": ctx.scratch_project_id} for _ in range(BULK_SIZE)]}),
+        read_only=False),
+    ApiScenario("POST /api/tasks/import", lambda ctx, c: Call(
+        "POST", "/api/tasks/import", params={"format": "ndjson"},
+        content=_ndjson([{"title": ctx.unique("i"), "project_id": ctx.scratch_project_id} for _ in range(IMPORT_SIZE)])),
+        read_only=False),
+    ApiScenario("PATCH /api/tasks/{id}", lambda ctx, c: Call(
+        "PATCH", f"/api/tasks/{_new_task(ctx)}", json={"title": ctx.unique("u"), "status": "Doing"}),
+        read_only=False),
+    ApiScenario("DELETE /api/tasks/{id}", lambda ctx, c: Call(
+        "DELETE", f"/api/tasks/{_new_task(ctx)}"), read_only=False),
+
+    # --- فید تغییرات ---
+    ApiScenario("GET /api/changes", lambda ctx, c: Call("GET", "/api/changes/", params={"since": _change_cursor(c)})),
+
+    # --- مدیریت ---
+    ApiScenario("GET /metrics", lambda ctx, c: Call("GET", "/metrics")),
+    ApiScenario("GET /api/admin/pool", lambda ctx, c: Call("GET", "/api/admin/pool")),
+    ApiScenario("GET /api/admin/events", lambda ctx, c: Call("GET", "/api/admin/events")),
+    ApiScenario("GET /api/admin/cache", lambda ctx, c: Call("GET", "/api/admin/cache")),
+    ApiScenario("DELETE /api/admin/cache", lambda ctx, c: Call("DELETE", "/api/admin/cache"), read_only=False),
+]
@@ -0,0 +1,147 @@
+"""
+پر کردن دیتابیس محلی با داده قطعی (با seed ثابت) در مقیاس‌های 10k، 100k و 1M تسک.
+
+ردیف‌ها مستقیماً با INSERT چندردیفی درج می‌شوند (نه از مسیر سرویس‌ها) تا ساخت
+یک میلیون تسک چند ثانیه طول بکشد؛ شمارنده task_count پروژه‌ها هم همزمان پر می‌شود.
+جدول‌ها باید از قبل با `alembic upgrade head` ساخته شده باشند.
+"""
+import math
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+TASKS_PER_PROJECT = 100
+OVERDUE_RATIO = 0.1
+INSERT_BATCH_SIZE = 10_000
+
+# پروژه‌هایی که خود بنچمارک در حین اجرا می‌سازد؛ در پایان اجرا پاک می‌شوند
+RUN_PREFIX = "bench-run-"
+
+WORDS = (
+    "report", "review", "deploy", "meeting", "invoice", "design", "bug", "release",
+    "database", "backup", "client", "budget", "draft", "test", "refactor", "docs",
+)
+
+
+@dataclass
+class SeedInfo:
+    """گزارش داده پرشده (در بخش meta خروجی JSON قرار می‌گیرد)."""
+    tasks: int
+    projects: int
+    overdue: int
+    seed: int
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def parse_scale(value: str) -> int:
+    """"10k"، "100k"، "1m" یا یک عدد صریح."""
+    return SCALES.get(value.lower()) or int(value)
+
+
+def reset(db: Session) -> None:
+    """تمام تسک‌ها و پروژه‌ها را پاک می‌کند (در PostgreSQL با TRUNCATE و شروع دوباره شناسه‌ها)."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("TRUNCATE tasks, projects RESTART IDENTITY"))
+    else:
+        db.execute(delete(Task))
+        db.execute(delete(Project))
+    db.commit()
+
+
+def _task_row(rng: random.Random, index: int, project_id: int, today: date, now: datetime) -> tuple[dict, bool]:
+    """یک ردیف تسک تصادفی ولی قطعی؛ مقدار دوم یعنی تسک تاریخ‌گذشته و باز است."""
+    words = rng.sample(WORDS, 4)
+    row = {
+        "title": f"Task {index} {words[0]}",
+        "description": " ".join(words),
+        "project_id": project_id,
+        "created_at": now - timedelta(days=rng.randint(0, 365), seconds=rng.randint(0, 86_399)),
+    }
+    roll = rng.random()
+    if roll < OVERDUE_RATIO:
+        row["status"] = TaskStatus.TODO
+        row["deadline"] = today - timedelta(days=rng.randint(1, 365))
+        return row, True
+    row["status"] = rng.choice((TaskStatus.TODO, TaskStatus.DOING, TaskStatus.DONE))
+    if row["status"] == TaskStatus.DONE:
+        row["deadline"] = today - timedelta(days=rng.randint(0, 365))
+    else:
+        row["deadline"] = today + timedelta(days=rng.randint(0, 365)) if roll < 0.8 else None
+    return row, False
+
+
+def seed(db: Session, tasks: int, seed_value: int = 42, tasks_per_project: int = TASKS_PER_PROJECT) -> SeedInfo:
+    """
+    دیتابیس را خالی و با tasks تسک پر می‌کند. با seed یکسان داده یکسان ساخته می‌شود.
+    حدود OVERDUE_RATIO تسک‌ها تاریخ‌گذشته و باز هستند تا autoclose کار واقعی داشته باشد.
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed_value)
+    today = date.today()
+    now = datetime.now(timezone.utc)
+    reset(db)
+
+    project_count = max(1, math.ceil(tasks / tasks_per_project))
+    project_rows = [
+        {
+            "name": f"bench-project-{i:07d}",
+            "description": f"Benchmark project {i}",
+            "task_count": min(tasks_per_project, tasks - i * tasks_per_project),
+        }
+        for i in range(project_count)
+    ]
+    project_ids = []
+    for start in range(0, project_count, INSERT_BATCH_SIZE):
+        batch = project_rows[start:start + INSERT_BATCH_SIZE]
+        project_ids.extend(db.scalars(insert(Project).returning(Project.id, sort_by_parameter_order=True), batch))
+        db.commit()
+
+    overdue = 0
+    batch = []
+    for index in range(tasks):
+        row, is_overdue = _task_row(rng, index, project_ids[index // tasks_per_project], today, now)
+        overdue += is_overdue
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            db.execute(insert(Task), batch)
+            db.commit()
+            batch = []
+    if batch:
+        db.execute(insert(Task), batch)
+        db.commit()
+
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("ANALYZE tasks"))
+        db.execute(text("ANALYZE projects"))
+        db.commit()
+
+    return SeedInfo(tasks=tasks, projects=project_count, overdue=overdue, seed=seed_value,
+                    seconds=round(time.perf_counter() - started, 3))
+
+
+def current_size(db: Session) -> tuple[int, int]:
+    """(تعداد تسک‌ها، تعداد پروژه‌ها) فعلی دیتابیس."""
+    return (
+        db.scalar(select(func.count()).select_from(Task)),
+        db.scalar(select(func.count()).select_from(Project)),
+    )
+
+
+def cleanup_run_data(db: Session) -> None:
+    """پروژه‌ها و تسک‌هایی که در حین اجرای بنچمارک ساخته شده‌اند را پاک می‌کند."""
+    run_projects = select(Project.id).where(Project.name.like(f"{RUN_PREFIX}%")).scalar_subquery()
+    db.execute(delete(Task).where(Task.project_id.in_(run_projects)))
+    db.execute(delete(Project).where(Project.name.like(f"{RUN_PREFIX}%")))
+    db.commit()
@@ -0,0 +1,90 @@
+"""
+مقایسه مسیر عادی و مسیر سریع سریال‌سازی لیست تسک‌ها، بدون نیاز به PostgreSQL.
+
+داده در یک SQLite درون‌حافظه‌ای ساخته می‌شود و هر دو مسیر از ریپازیتوری واقعی می‌خوانند:
+- current: get_all_tasks (آبجکت ORM) + اعتبارسنجی List[TaskResponse] + jsonable_encoder + json
+- fast: get_all_task_rows (ردیف Core) + rows_to_dicts + orjson/json
+
+مثال:
+    python -m benchmarks.serialization --limit 1000 --iterations 50
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api import serialization
+from app.api.controller_schemas.responses.task_response_schema import TaskResponse
+from app.db.base import Base
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.repositories.task_repository import TaskRepository
+from benchmarks.metrics import ScenarioResult, measure_peak_memory
+
+
+def _current_path(repo: TaskRepository, limit: int) -> bytes:
+    tasks = repo.get_all_tasks(limit=limit)
+    models = TypeAdapter(List[TaskResponse]).validate_python(tasks, from_attributes=True)
+    return json.dumps(jsonable_encoder(models), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _fast_path(repo: TaskRepository, limit: int) -> bytes:
+    rows = repo.get_all_task_rows(limit=limit)
+    return serialization.dumps(serialization.rows_to_dicts(rows, TaskResponse))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the ORM/Pydantic and Core/orjson list serialization paths.")
+    parser.add_argument("--limit", type=int, default=1000, help="Rows per list response (default: 1000).")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", default=None, help="Write JSON results to this file (default: stdout).")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        project_id = db.scalar(insert(Project).values(name="serialization").returning(Project.id))
+        db.execute(insert(Task), [
+            {"title": f"Task {i}", "description": "word " * 20, "project_id": project_id,
+             "status": TaskStatus.TODO, "deadline": date.today() + timedelta(days=i % 30)}
+            for i in range(args.limit)
+        ])
+        db.commit()
+
+    results = []
+    for name, fn in (("current", _current_path), ("fast", _fast_path)):
+        result = ScenarioResult(name=f"GET /api/tasks?limit={args.limit} ({name})", group="serialization")
+        for _ in range(args.iterations):
+            with Session() as db:
+                repo = TaskRepository(db)
+                started = time.perf_counter()
+                body = fn(repo, args.limit)
+                elapsed = time.perf_counter() - started
+            result.latencies.append(elapsed)
+            result.wall_seconds += elapsed
+            result.requests += 1
+        with Session() as db:
+            repo = TaskRepository(db)
+            result.peak_memory_bytes = measure_peak_memory(lambda: fn(repo, args.limit))
+        result.extra = {"body_bytes": len(body), "encoder": "orjson" if serialization.orjson else "json"}
+        results.append(result)
+        print(f"  {result.name}: p50 {result.to_dict()['latency_ms']['p50']} ms", file=sys.stderr)
+
+    text = json.dumps({"results": [r.to_dict() for r in results]}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
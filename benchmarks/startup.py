@@ -0,0 +1,137 @@
+"""
+بودجه زمان شروع (cold start) دستورهای خط فرمان و API.
+
+هر هدف در یک پردازه تازه پایتون ایمپورت می‌شود (بدون کش ماژول‌های پردازه فعلی) و میانه
+چند اجرا با بودجه آن مقایسه می‌شود. برای دستورها --help هم اجرا می‌شود که نباید
+SQLAlchemy یا درایور دیتابیس را بارگذاری کند. ماژول‌های ممنوع هر هدف (مثلاً FastAPI
+برای CLI) هم بررسی می‌شوند. اگر هدفی از بودجه‌اش بیشتر باشد یا ماژول ممنوعی بارگذاری
+کند، خروجی با کد 1 تمام می‌شود (مناسب CI).
+
+مثال:
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --scale 2 --output bench/startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+
+from app.config import PROJECT_ROOT
+
+# ماژول‌هایی که دستورهای خط فرمان نباید بارگذاری کنند
+WEB_MODULES = ("fastapi", "starlette", "uvicorn")
+# ماژول‌هایی که --help نباید بارگذاری کند (دیتابیس فقط بعد از پارس آرگومان‌ها)
+DB_MODULES = ("sqlalchemy", "psycopg2", "dotenv")
+
+
+@dataclass(frozen=True)
+class Target:
+    name: str
+    # ماژولی که ایمپورت می‌شود یا (با argv) با python -m اجرا می‌شود
+    module: str
+    budget_ms: float
+    forbidden: tuple[str, ...] = ()
+    argv: tuple[str, ...] | None = None
+
+
+# بودجه‌های اهداف سنگین (که SQLAlchemy و مدل‌ها را بارگذاری می‌کنند) حدود دو برابر زمان اندازه‌گیری‌شده‌اند
+# تا نوسان ماشین CI تست را نشکند؛ برگشت بارگذاری تنبل را بودجه تنگ autoclose و ماژول‌های ممنوع می‌گیرند
+TARGETS = (
+    Target("cli import", "app.cli.main", 1000, WEB_MODULES),
+    Target("autoclose import", "app.commands.autoclose_overdue", 60, WEB_MODULES + DB_MODULES),
+    Target("autoclose --help", "app.commands.autoclose_overdue", 150, WEB_MODULES + DB_MODULES, ("--help",)),
+    Target("scheduler import", "app.commands.scheduler", 1000, WEB_MODULES),
+    Target("import_data import", "app.commands.import_data", 1000, WEB_MODULES),
+    Target("api import", "app.main", 2000),
+)
+
+# ایمپورت در پردازه تازه؛ زمان ایمپورت و ماژول‌های بارگذاری‌شده را JSON چاپ می‌کند
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+__import__({module!r})
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(sys.modules)}}))
+"""
+
+# اجرای python -m ماژول با argv؛ ماژول‌های بارگذاری‌شده در پایان (حتی با SystemExit) چاپ می‌شوند
+_RUN_PROBE = """
+import atexit, json, runpy, sys
+atexit.register(lambda: sys.__stderr__.write("\\n" + json.dumps(sorted(sys.modules)) + "\\n"))
+sys.argv = [{module!r}, *{argv!r}]
+runpy.run_module({module!r}, run_name="__main__")
+"""
+
+
+def _probe(target: Target) -> tuple[float, set[str]]:
+    """یک اجرای سرد هدف؛ (میلی‌ثانیه، ماژول‌های بارگذاری‌شده)."""
+    if target.argv is None:
+        out = subprocess.run([sys.executable, "-c", _IMPORT_PROBE.format(module=target.module)],
+                             cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        return result["ms"], set(result["modules"])
+
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", _RUN_PROBE.format(module=target.module, argv=target.argv)],
+                         cwd=PROJECT_ROOT, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, set(json.loads(out.stderr.strip().splitlines()[-1]))
+
+
+def measure(target: Target, runs: int, scale: float) -> dict:
+    samples, loaded = [], set()
+    for _ in range(runs):
+        ms, modules = _probe(target)
+        samples.append(ms)
+        loaded |= modules
+    median = statistics.median(samples)
+    budget = target.budget_ms * scale
+    leaked = sorted(name for name in target.forbidden
+                    if any(m == name or m.startswith(name + ".") for m in loaded))
+    return {
+        "target": target.name,
+        "module": target.module,
+        "argv": list(target.argv or ()),
+        "median_ms": round(median, 1),
+        "min_ms": round(min(samples), 1),
+        "budget_ms": round(budget, 1),
+        "forbidden_loaded": leaked,
+        "ok": median <= budget and not leaked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cold-start import time of the CLI, commands and API against a budget.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreter runs per target (median is compared).")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply every budget, e.g. 2 on a slow CI machine.")
+    parser.add_argument("--only", default=None, help="Only run targets whose name contains this text.")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file (default: stdout).")
+    args = parser.parse_args()
+
+    results = []
+    for target in TARGETS:
+        if args.only and args.only not in target.name:
+            continue
+        result = measure(target, args.runs, args.scale)
+        results.append(result)
+        status = "✅" if result["ok"] else "❌"
+        print(f"  {status} {target.name}: {result['median_ms']} ms (budget {result['budget_ms']} ms)"
+              + (f", loads {', '.join(result['forbidden_loaded'])}" if result["forbidden_loaded"] else ""),
+              file=sys.stderr)
+
+    text = json.dumps({"python": sys.version.split()[0], "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if not all(r["ok"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
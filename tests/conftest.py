@@ -0,0 +1,89 @@
+"""
+فیکسچرهای مشترک تست‌ها.
+
+هر تست یک دیتابیس تازه می‌گیرد: SQLite فایلی (همیشه) یا PostgreSQL وقتی TEST_DATABASE_URL
+تنظیم شده باشد. TEST_DATABASE_URL باید به یک دیتابیس دورریختنی اشاره کند، چون جدول‌ها
+قبل و بعد از هر تست drop می‌شوند. SessionLocal با configure(bind=...) به همان موتور وصل
+می‌شود، پس سرویس‌ها و API بدون تغییر روی دیتابیس تست اجرا می‌شوند.
+"""
+import os
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine
+
+import app.main  # noqa: F401  (ثبت همه مدل‌ها روی Base.metadata قبل از create_all)
+from app.cache import entity_cache
+from app.db.base import Base
+from app.db.session import SessionLocal
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+requires_postgres = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+DIALECTS = ("sqlite", pytest.param("postgresql", marks=requires_postgres))
+
+
+def make_engine(dialect: str, tmp_path):
+    if dialect == "postgresql":
+        engine = create_engine(TEST_DATABASE_URL, pool_size=20, max_overflow=20)
+        Base.metadata.drop_all(engine)
+    else:
+        # فایل (نه :memory:) تا هر نخ اتصال خودش را داشته باشد و قفل نوشتن SQLite واقعی باشد
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}",
+                               connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@contextmanager
+def bound_engine(dialect: str, tmp_path):
+    """موتور تست را به SessionLocal وصل می‌کند و در پایان جدول‌ها و bind قبلی را برمی‌گرداند."""
+    engine = make_engine(dialect, tmp_path)
+    previous_bind = SessionLocal.kw.get("bind")
+    SessionLocal.configure(bind=engine)
+    entity_cache.clear()
+    try:
+        yield engine
+    finally:
+        entity_cache.clear()
+        SessionLocal.configure(bind=previous_bind)
+        if dialect == "postgresql":
+            Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+@pytest.fixture(params=DIALECTS)
+def engine(request, tmp_path):
+    """موتور تست روی هر دیالکت؛ سرویس‌ها از طریق SessionLocal به آن وصل می‌شوند."""
+    with bound_engine(request.param, tmp_path) as engine:
+        yield engine
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    """فقط SQLite، برای تست‌هایی که به دیالکت بستگی ندارند."""
+    with bound_engine("sqlite", tmp_path) as engine:
+        yield engine
+
+
+@pytest.fixture
+def pg_engine(tmp_path):
+    """فقط PostgreSQL (مثلاً قفل advisory و SKIP LOCKED)؛ بدون TEST_DATABASE_URL رد می‌شود."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    with bound_engine("postgresql", tmp_path) as engine:
+        yield engine
+
+
+@pytest.fixture
+def db(engine):
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client(engine):
+    from fastapi.testclient import TestClient
+
+    return TestClient(app.main.app)
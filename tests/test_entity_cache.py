@@ -0,0 +1,43 @@
+from app.cache import entity_cache, project_key
+from app.db.session import SessionLocal
+from app.models.project import Project
+
+
+def _project(db, name: str) -> Project:
+    project = Project(name=name)
+    db.add(project)
+    db.commit()
+    return project
+
+
+def test_lookup_racing_an_invalidation_is_not_cached(db):
+    project = _project(db, "raced")
+    key = project_key(project.id)
+
+    def load_then_invalidate():
+        loaded = db.get(Project, project.id)
+        # نوشتن در درخواست دیگر بعد از خواندن ردیف و قبل از ذخیره snapshot
+        entity_cache.invalidate(key)
+        return loaded
+
+    assert entity_cache.get_or_load(key, load_then_invalidate).name == "raced"
+    assert entity_cache.backend.get(key) is None
+
+    entity_cache.get_or_load(key, lambda: db.get(Project, project.id))
+    assert entity_cache.backend.get(key)["name"] == "raced"
+
+
+def test_lookup_racing_a_put_keeps_the_fresh_snapshot(db):
+    project = _project(db, "before")
+    key = project_key(project.id)
+
+    def load_then_put():
+        with SessionLocal() as reader:
+            loaded = reader.get(Project, project.id)
+            project.name = "after"
+            db.commit()
+            entity_cache.put(key, project)
+            return loaded
+
+    assert entity_cache.get_or_load(key, load_then_put).name == "before"
+    assert entity_cache.backend.get(key)["name"] == "after"
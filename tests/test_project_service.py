@@ -0,0 +1,32 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, insert, select
+
+from app.db.session import SessionLocal
+from app.models.task import Task
+from app.services import project_service, quota_service
+from app.api.controller_schemas.requests.project_request_schema import ProjectCreateRequest
+
+
+def _delete(project_id: int) -> bool:
+    with SessionLocal() as db:
+        return project_service.delete_project(db, project_id)
+
+
+def test_delete_project_waits_for_a_concurrent_task_create(db):
+    project_id = project_service.create_project(db, ProjectCreateRequest(name="busy project")).id
+
+    # ساخت تسک در تراکنش دیگر: سهمیه رزرو و تسک درج شده ولی هنوز commit نشده
+    with SessionLocal() as writer, ThreadPoolExecutor(max_workers=1) as pool:
+        quota_service.reserve_task_slots(writer, project_id)
+        writer.execute(insert(Task).values(title="late task", project_id=project_id))
+
+        deleting = pool.submit(_delete, project_id)
+        time.sleep(0.5)
+        assert not deleting.done()
+
+        writer.commit()
+        assert deleting.result(timeout=30) is True
+
+    assert db.scalar(select(func.count()).select_from(Task).where(Task.project_id == project_id)) == 0
@@ -0,0 +1,57 @@
+"""
+سقف کوئری endpointهای اصلی با query_budget.
+
+هر endpoint با داده کم و داده بیشتر زیر همان سقف اجرا می‌شود؛ تعداد کوئری نباید با تعداد
+ردیف‌ها رشد کند. برگشت حلقه کوئری‌به‌ازای‌ردیف (include=tasks بدون بارگذاری دسته‌ای، یا
+refresh بعد از INSERT به جای RETURNING) هم از سقف عبور می‌کند و هم الگوی N+1 را نشان می‌دهد.
+کش قبل از هر اندازه‌گیری خالی می‌شود تا مسیر دیتابیس سنجیده شود.
+"""
+import pytest
+
+from app.cache import entity_cache
+from app.db.query_budget import query_budget
+
+SIZES = [(2, 2), (10, 5)]
+
+# ETag (count و max(updated_at)) + صفحه پروژه‌ها + تسک‌های همه پروژه‌ها با یک IN
+PROJECTS_WITH_TASKS_BUDGET = 4
+# ETag + صفحه تسک‌ها
+TASKS_LIST_BUDGET = 2
+# بررسی پروژه + رزرو سهمیه (UPDATE) + INSERT ... RETURNING + لاگ تغییرات؛
+# در PostgreSQL قفل advisory ترتیب لاگ تغییرات هم یک دستور است
+CREATE_TASK_BUDGET = {"sqlite": 4, "postgresql": 5}
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size[0]}x{size[1]}")
+def project_ids(request, client) -> list[int]:
+    projects, tasks_per_project = request.param
+    ids = []
+    for p in range(projects):
+        project_id = client.post("/api/projects/", json={"name": f"budget project {p}"}).json()["id"]
+        items = [{"title": f"task {p}-{t}", "project_id": project_id} for t in range(tasks_per_project)]
+        assert client.post("/api/tasks/bulk", json={"items": items}).status_code == 201
+        ids.append(project_id)
+    entity_cache.clear()
+    return ids
+
+
+def test_list_projects_with_tasks(client, project_ids):
+    with query_budget(PROJECTS_WITH_TASKS_BUDGET, name="GET /api/projects?include=tasks"):
+        response = client.get("/api/projects/?include=tasks")
+
+    assert response.status_code == 200
+    assert len(response.json()) == len(project_ids)
+
+
+def test_list_tasks(client, project_ids):
+    with query_budget(TASKS_LIST_BUDGET, name="GET /api/tasks"):
+        response = client.get("/api/tasks/")
+
+    assert response.status_code == 200
+
+
+def test_create_task(client, engine, project_ids):
+    with query_budget(CREATE_TASK_BUDGET[engine.dialect.name], name="POST /api/tasks"):
+        response = client.post("/api/tasks/", json={"title": "budget task", "project_id": project_ids[-1]})
+
+    assert response.status_code == 201
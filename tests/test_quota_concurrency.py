@@ -0,0 +1,52 @@
+"""
+ساخت همزمان تسک و پروژه نباید از سقف سهمیه عبور کند.
+
+درخواست‌ها از چند نخ به API فرستاده می‌شوند؛ برنده‌ها 201 و بازنده‌ها 409 می‌گیرند
+و شمارنده projects.task_count باید با تعداد واقعی تسک‌ها برابر بماند.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import func, select
+
+from app import config
+from app.models.project import Project
+from app.models.task import Task
+
+PARALLEL_REQUESTS = 20
+
+
+def _fire(client, path: str, bodies: list[dict]) -> list[int]:
+    with ThreadPoolExecutor(max_workers=len(bodies)) as pool:
+        return list(pool.map(lambda body: client.post(path, json=body).status_code, bodies))
+
+
+@pytest.mark.parametrize("limit", [1, 5])
+def test_parallel_task_creates_respect_quota(client, db, monkeypatch, limit):
+    monkeypatch.setattr(config, "MAX_NUMBER_OF_TASK_PER_PROJECT", limit)
+    project_id = client.post("/api/projects/", json={"name": "quota project"}).json()["id"]
+
+    bodies = [{"title": f"task {i}", "project_id": project_id} for i in range(PARALLEL_REQUESTS)]
+    codes = _fire(client, "/api/tasks/", bodies)
+
+    assert set(codes) <= {201, 409}
+    created = codes.count(201)
+    assert created == limit
+    assert codes.count(409) == PARALLEL_REQUESTS - limit
+
+    task_rows = db.scalar(select(func.count()).select_from(Task).where(Task.project_id == project_id))
+    task_count = db.scalar(select(Project.task_count).where(Project.id == project_id))
+    assert task_rows == created
+    assert task_count == task_rows
+
+
+def test_parallel_project_creates_respect_quota(client, db, monkeypatch):
+    limit = 3
+    monkeypatch.setattr(config, "MAX_NUMBER_OF_PROJECT", limit)
+
+    bodies = [{"name": f"project {i}"} for i in range(PARALLEL_REQUESTS)]
+    codes = _fire(client, "/api/projects/", bodies)
+
+    assert set(codes) <= {201, 409}
+    assert codes.count(201) == limit
+    assert db.scalar(select(func.count()).select_from(Project)) == limit
@@ -0,0 +1,18 @@
+import asyncio
+
+import pytest
+
+from app.db.runner import SessionRunner, ThreadpoolSessionRunner
+
+
+def test_incomplete_runner_fails_at_construction():
+    class IncompleteRunner(SessionRunner):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteRunner()
+
+
+def test_threadpool_runner_passes_session_first():
+    runner = ThreadpoolSessionRunner(db="session")
+    assert asyncio.run(runner.run(lambda db, x, y=0: (db, x, y), 1, y=2)) == ("session", 1, 2)
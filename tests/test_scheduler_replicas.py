@@ -0,0 +1,75 @@
+"""
+چند پردازه DeadlineScheduler همزمان روی یک دیتابیس PostgreSQL.
+
+هر پردازه موتور خودش را از TEST_DATABASE_URL می‌سازد و بعد از رسیدن همه به barrier یک
+دور catch-up اجرا می‌کند. در حالت‌های lease و skip_locked هیچ تسک تاریخ‌گذشته‌ای نباید
+باز بماند و هیچ ردیفی دو بار بسته نشود؛ در lease فقط یک replica کار می‌کند.
+"""
+import multiprocessing
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app import config
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.repositories.task_repository import overdue_clauses
+
+REPLICAS = 4
+PROJECTS = 20
+OVERDUE_PER_PROJECT = 100
+# دسته کوچک تا هر replica چند دسته بردارد و رقابت روی ردیف‌ها واقعی باشد
+CHUNK_SIZE = 50
+
+
+def _replica(mode: str, barrier, results) -> None:
+    from app.services.autoclose_scheduler import DeadlineScheduler
+
+    config.AUTOCLOSE_CHUNK_SIZE = CHUNK_SIZE
+    engine = create_engine(os.environ["TEST_DATABASE_URL"])
+    scheduler = DeadlineScheduler(sessionmaker(bind=engine), engine, coordination=mode, log=lambda message: None)
+    try:
+        barrier.wait(timeout=60)
+        results.put(scheduler.tick(changed=False))
+    finally:
+        scheduler.close()
+        engine.dispose()
+
+
+def _overdue_count(db) -> int:
+    return db.scalar(select(func.count()).select_from(Task).where(*overdue_clauses(date.today())))
+
+
+@pytest.mark.parametrize("mode", ["lease", "skip_locked"])
+def test_replicas_close_every_overdue_task_exactly_once(pg_engine, mode):
+    with sessionmaker(bind=pg_engine)() as db:
+        db.execute(insert(Project), [{"id": p, "name": f"replica project {p}"} for p in range(1, PROJECTS + 1)])
+        db.execute(insert(Task), [
+            {"title": f"overdue {p}-{n}", "project_id": p, "status": TaskStatus.TODO,
+             "deadline": date.today() - timedelta(days=n % 10 + 1)}
+            for p in range(1, PROJECTS + 1) for n in range(OVERDUE_PER_PROJECT)
+        ])
+        db.commit()
+        overdue = _overdue_count(db)
+
+        ctx = multiprocessing.get_context("spawn")
+        barrier = ctx.Barrier(REPLICAS)
+        results = ctx.Queue()
+        processes = [ctx.Process(target=_replica, args=(mode, barrier, results)) for _ in range(REPLICAS)]
+        for process in processes:
+            process.start()
+        rows = [results.get(timeout=120) for _ in processes]
+        for process in processes:
+            process.join(timeout=30)
+            assert process.exitcode == 0
+
+        remaining = _overdue_count(db)
+
+    assert overdue == PROJECTS * OVERDUE_PER_PROJECT
+    assert remaining == 0
+    assert sum(rows) - (overdue - remaining) == 0, f"duplicate closes: {rows}"
+    if mode == "lease":
+        assert sum(1 for r in rows if r) == 1, f"more than one active replica: {rows}"
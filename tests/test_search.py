@@ -0,0 +1,57 @@
+import pytest
+
+
+@pytest.fixture
+def project_id(client) -> int:
+    return client.post("/api/projects/", json={"name": "search project"}).json()["id"]
+
+
+def _create(client, project_id: int, title: str, description: str = "") -> int:
+    response = client.post("/api/tasks/", json={"title": title, "description": description, "project_id": project_id})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _search(client, **params) -> list[dict]:
+    response = client.get("/api/tasks/search", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_title_matches_rank_above_description_matches(client, project_id):
+    in_title = _create(client, project_id, "deploy the backend")
+    in_description = _create(client, project_id, "weekly chores", "remember to deploy")
+    _create(client, project_id, "unrelated work")
+    other_project = client.post("/api/projects/", json={"name": "other project"}).json()["id"]
+    _create(client, other_project, "deploy elsewhere")
+
+    results = _search(client, q="deploy", project_id=project_id)
+
+    assert [r["id"] for r in results] == [in_title, in_description]
+    assert results[0]["rank"] > results[1]["rank"]
+
+
+def test_best_match_is_found_among_many_newer_matches(client, project_id):
+    best = _create(client, project_id, "invoice invoice", "invoice")
+    for i in range(30):
+        _create(client, project_id, f"task {i}", "mentions the invoice once among many other words")
+
+    assert _search(client, q="invoice", limit=1)[0]["id"] == best
+
+
+def test_cursor_pages_cover_every_match_once(client, project_id):
+    matching = {_create(client, project_id, f"backup {i}", "backup " * (i % 3)) for i in range(7)}
+    _create(client, project_id, "no match here")
+
+    seen, params = [], {"q": "backup", "limit": 3}
+    while True:
+        response = client.get("/api/tasks/search", params=params)
+        assert response.status_code == 200
+        seen.extend(r["id"] for r in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == matching
@@ -0,0 +1,26 @@
+"""
+بودجه زمان شروع سرد CLI، دستورها و API (benchmarks/startup.py).
+
+هر هدف در پردازه‌های تازه پایتون اندازه‌گیری می‌شود؛ میانه باید زیر بودجه بماند و ماژول‌های
+ممنوع (FastAPI برای دستورها، پشته دیتابیس برای --help) نباید بارگذاری شوند.
+STARTUP_BUDGET_SCALE همه بودجه‌ها را ضرب می‌کند (مثلاً 2 روی CI کند) و STARTUP_BUDGET_RUNS
+تعداد اجراهای هر هدف است.
+"""
+import os
+
+import pytest
+
+from benchmarks.startup import TARGETS, measure
+
+SCALE = float(os.getenv("STARTUP_BUDGET_SCALE", "1"))
+RUNS = int(os.getenv("STARTUP_BUDGET_RUNS", "3"))
+
+
+@pytest.mark.parametrize("target", TARGETS, ids=[target.name for target in TARGETS])
+def test_cold_start_within_budget(target):
+    result = measure(target, RUNS, SCALE)
+
+    assert not result["forbidden_loaded"], f"{target.name} loads {', '.join(result['forbidden_loaded'])}"
+    assert result["median_ms"] <= result["budget_ms"], (
+        f"{target.name}: {result['median_ms']} ms > budget {result['budget_ms']} ms (STARTUP_BUDGET_SCALE={SCALE})"
+    )
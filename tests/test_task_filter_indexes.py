@@ -0,0 +1,79 @@
+"""
+فیلترهای GET /api/tasks باید از ایندکس‌های ترکیبی مایگریشن 523a86e0532c استفاده کنند.
+
+کوئری واقعی ریپازیتوری (get_all_task_rows) گرفته و با EXPLAIN (PostgreSQL) یا
+EXPLAIN QUERY PLAN (SQLite) روی داده‌ای با توزیع نامتوازن و آمار به‌روز (ANALYZE) بررسی می‌شود.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, insert, text
+
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.repositories.task_repository import TaskFilter, TaskRepository
+
+PROJECTS = 50
+TASKS_PER_PROJECT = 100
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+TODAY = date(2026, 1, 1)
+
+
+@pytest.fixture
+def seeded(db):
+    """
+    بیشتر تسک‌ها ددلاین آینده دارند؛ تسک‌های DOING تاریخ‌گذشته زیادند و TODOهای تاریخ‌گذشته
+    کم، تا ایندکس (status, deadline) از ایندکس جزئی overdue انتخابی‌تر باشد.
+    فقط چند تسک در روز آخر ساخته شده‌اند.
+    """
+    db.execute(insert(Project), [{"id": i, "name": f"project {i}"} for i in range(1, PROJECTS + 1)])
+    rows = []
+    for n in range(PROJECTS * TASKS_PER_PROJECT):
+        overdue_doing = n % 4 == 0
+        overdue_todo = n % 200 == 1
+        rows.append({
+            "title": f"task {n}",
+            "project_id": n % PROJECTS + 1,
+            "status": TaskStatus.DOING if overdue_doing else TaskStatus.TODO if n % 3 else TaskStatus.DONE,
+            "deadline": TODAY - timedelta(days=n % 30 + 1) if overdue_doing or overdue_todo else TODAY + timedelta(days=n % 90 + 1),
+            "created_at": NOW - timedelta(minutes=n),
+        })
+    db.execute(insert(Task), rows)
+    db.commit()
+    db.execute(text("ANALYZE"))
+    db.commit()
+    return db
+
+
+def _explain(db, filters: TaskFilter, sort: str) -> str:
+    """طرح اجرای کوئری لیست با همین فیلترها، به صورت یک متن."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        TaskRepository(db).get_all_task_rows(limit=100, filters=filters, sort=sort)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = captured[-1]
+    connection = db.connection()
+    if engine.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql("EXPLAIN " + statement, parameters).scalars().all()
+    else:
+        plan = [row[-1] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+    return "\n".join(plan)
+
+
+# هر فیلتر با sort طبیعی خودش (همان شکل درخواست‌های واقعی)؛ ایندکس هم شرط و هم ترتیب را پوشش می‌دهد
+@pytest.mark.parametrize("filters, sort, index", [
+    (TaskFilter(project_id=7, status=TaskStatus.TODO), "id", "ix_tasks_project_id_status"),
+    (TaskFilter(status=TaskStatus.TODO, deadline_before=TODAY), "deadline", "ix_tasks_status_deadline"),
+    (TaskFilter(created_after=NOW - timedelta(minutes=30)), "-created_at", "ix_tasks_created_at"),
+], ids=["project_id+status", "status+deadline", "created_after"])
+def test_task_filters_use_composite_indexes(seeded, filters, sort, index):
+    plan = _explain(seeded, filters, sort)
+    assert index in plan, plan
@@ -0,0 +1,47 @@
+from sqlalchemy import delete
+
+from app import config
+from app.cache import entity_cache, project_key
+from app.models.project import Project
+from app.services import quota_service
+
+
+def test_bulk_create_reserves_quota_in_project_id_order(client, monkeypatch):
+    first, second = (client.post("/api/projects/", json={"name": name}).json()["id"] for name in ("first", "second"))
+    reserved = []
+    reserve = quota_service.reserve_task_slots
+
+    def record(db, project_id, count, **kwargs):
+        reserved.append(project_id)
+        return reserve(db, project_id, count, **kwargs)
+
+    monkeypatch.setattr(quota_service, "reserve_task_slots", record)
+    items = [{"title": "later project", "project_id": second}, {"title": "earlier project", "project_id": first}]
+
+    assert client.post("/api/tasks/bulk", json={"items": items}).status_code == 201
+    assert reserved == [first, second]
+
+
+def test_create_task_in_project_deleted_behind_cache_is_404(client, db):
+    project_id = client.post("/api/projects/", json={"name": "doomed"}).json()["id"]
+    assert client.get(f"/api/projects/{project_id}").status_code == 200
+
+    # حذف از worker دیگر: ردیف حذف می‌شود ولی کش این worker هنوز snapshot پروژه را دارد
+    db.execute(delete(Project).where(Project.id == project_id))
+    db.commit()
+
+    response = client.post("/api/tasks/", json={"title": "orphan task", "project_id": project_id})
+
+    assert response.status_code == 404
+    assert "not found" in response.json()["detail"]
+    assert entity_cache.backend.get(project_key(project_id)) is None
+
+
+def test_create_task_over_limit_is_still_409(client, monkeypatch):
+    monkeypatch.setattr(config, "MAX_NUMBER_OF_TASK_PER_PROJECT", 1)
+    project_id = client.post("/api/projects/", json={"name": "tiny"}).json()["id"]
+    assert client.post("/api/tasks/", json={"title": "only task", "project_id": project_id}).status_code == 201
+
+    response = client.post("/api/tasks/", json={"title": "one more", "project_id": project_id})
+
+    assert response.status_code == 409
@@ -0,0 +1,68 @@
+"""بازگردانی خروجی: شناسه‌ها حفظ می‌شوند و ورود دوباره تکرار نمی‌سازد."""
+import io
+
+from sqlalchemy import delete, func, select
+
+from app.api.controller_schemas.requests.project_request_schema import ProjectCreateRequest
+from app.api.controller_schemas.requests.task_request_schema import TaskCreateRequest
+from app.models.project import Project
+from app.models.task import Task
+from app.services import project_service, task_service, transfer_service
+
+
+def _export(db, exporter) -> str:
+    return "".join(exporter(db, "ndjson"))
+
+
+def _import(db, importer, text: str):
+    return importer(db, io.StringIO(text), "ndjson", 2)
+
+
+def test_restore_keeps_ids_across_gaps_and_is_idempotent(db):
+    for name in ("alpha", "beta", "gamma"):
+        project_service.create_project(db, ProjectCreateRequest(name=name))
+    beta = db.scalar(select(Project.id).where(Project.name == "beta"))
+    gamma = db.scalar(select(Project.id).where(Project.name == "gamma"))
+    project_service.delete_project(db, beta)
+    for title in ("first task", "second task", "third task"):
+        task_service.create_task(db, TaskCreateRequest(title=title, project_id=gamma))
+
+    projects_file = _export(db, transfer_service.export_projects)
+    tasks_file = _export(db, transfer_service.export_tasks)
+    exported = {(t.id, t.project_id, t.title) for t in db.scalars(select(Task))}
+
+    db.execute(delete(Task))
+    db.execute(delete(Project))
+    db.commit()
+
+    for _ in range(2):
+        _import(db, transfer_service.import_projects, projects_file)
+        _import(db, transfer_service.import_tasks, tasks_file)
+
+    assert {(t.id, t.project_id, t.title) for t in db.scalars(select(Task))} == exported
+    assert db.scalar(select(Project.name).where(Project.id == gamma)) == "gamma"
+    assert db.scalar(select(Project.task_count).where(Project.id == gamma)) == 3
+
+    # شناسه‌های جدید بعد از بازگردانی با شناسه‌های بازگردانده‌شده برخورد نمی‌کنند
+    project = project_service.create_project(db, ProjectCreateRequest(name="delta"))
+    assert project.id > gamma
+
+
+def test_reimport_reports_skipped_rows(db):
+    project_service.create_project(db, ProjectCreateRequest(name="alpha"))
+    projects_file = _export(db, transfer_service.export_projects)
+
+    result = _import(db, transfer_service.import_projects, projects_file)
+
+    assert (result.created, result.skipped, result.failed) == (0, 1, 0)
+    assert db.scalar(select(func.count()).select_from(Project)) == 1
+
+
+def test_same_id_with_different_data_is_an_error(db):
+    project_service.create_project(db, ProjectCreateRequest(name="alpha"))
+    project_id = db.scalar(select(Project.id))
+
+    result = _import(db, transfer_service.import_projects, f'{{"id": {project_id}, "name": "other"}}\n')
+
+    assert result.failed == 1
+    assert "already exists" in result.errors[0]